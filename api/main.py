@@ -1,12 +1,26 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from api.routes import law_explanation, letter_generation, bias_detection, pdf_processing, supabase_auth, bias_detection_hitl, chat_history
 from api.core.config import settings
+from module_a.llm_cache import get_llm_cache
+from module_a.llm_scheduler import get_llm_scheduler
+from module_a.llm_hedging import get_hedging_stats
+from module_a.retrieval_cache import conversation_retrieval_cache
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # The classifier pool forks its workers here, before any request is served
+    bias_detection.start_classifier()
+    yield
+    bias_detection.stop_classifier()
+
 
 app = FastAPI(
     title="Nepal Justice Weaver API",
     description="API for Law Explanation and Letter Generation modules with Supabase Auth.",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # CORS Configuration
@@ -35,3 +49,13 @@ async def root():
 async def health_check():
     return {"status": "healthy"}
 
+@app.get("/llm-stats")
+async def llm_stats():
+    """Expose LLM cache hit rates, scheduler queue wait times, hedging and retrieval reuse counters."""
+    cache = get_llm_cache()
+    return {
+        "cache": cache.get_stats() if cache else {"enabled": False},
+        "scheduler": get_llm_scheduler().get_stats(),
+        "hedging": get_hedging_stats(),
+        "retrieval_reuse": conversation_retrieval_cache.get_stats(),
+    }
@@ -1,4 +1,5 @@
 from fastapi import APIRouter, HTTPException, Depends
+from fastapi.concurrency import run_in_threadpool
 from api.core.deps import get_current_user
 from api.schemas import (
     BiasDetectionRequest,
@@ -13,29 +14,63 @@ from api.schemas import (
     DebiasBatchResponse,
     DebiasBatchItem,
 )
-from typing import List
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+import asyncio
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+import json
+import logging
+import os
 import re
-from transformers import pipeline
-import torch
+from module_a.config import LLM_MAX_CONCURRENCY, LLM_CACHE_DIR
+from module_a.llm_cache import hash_text
 from module_a.llm_client import MistralClient
+from module_a.model_routing import get_route
+from module_a.single_flight import SingleFlight, normalize_key
+from utility.bias_classifier import MODEL_NAME, BIAS_CLASSIFIER_BACKEND, CATEGORY_LABELS, create_classifier, id_to_label
+from utility.classification_cache import classify_with_cache, classify_with_cache_async, get_classification_cache
+from utility.lexicon_prefilter import get_prefilter
+from utility.micro_batcher import MicroBatcher
+from utility.suggestion_store import SuggestionStore
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
+
+# Requests from concurrent callers are merged into shared classifier batches:
+# the queue waits up to BIAS_MICRO_BATCH_MAX_WAIT_MS for more sentences once
+# the first request arrives, or until BIAS_MICRO_BATCH_MAX_SIZE are queued.
+MICRO_BATCH_MAX_SIZE = int(os.getenv("BIAS_MICRO_BATCH_MAX_SIZE", "64"))
+MICRO_BATCH_MAX_WAIT_MS = float(os.getenv("BIAS_MICRO_BATCH_MAX_WAIT_MS", "5"))
+
+# /detect-bias/batch classifies the sentences of all texts as one flat list,
+# BIAS_BATCH_CHUNK_SENTENCES at a time, and rejects requests above the cap.
+BIAS_BATCH_MAX_SENTENCES = int(os.getenv("BIAS_BATCH_MAX_SENTENCES", "5000"))
+BIAS_BATCH_CHUNK_SENTENCES = int(os.getenv("BIAS_BATCH_CHUNK_SENTENCES", "512"))
+
+# The model (in-process, worker pool or remote; see utility.bias_classifier) is
+# loaded by start_classifier() from the API lifespan hook rather than at import,
+# so the pool backend forks its workers before the server starts serving.
+classifier = None
+
+
+def start_classifier() -> None:
+    """Load the bias classifier; on failure the endpoints answer 503."""
+    global classifier
+    if classifier is not None:
+        return
+    try:
+        print(f"Loading bias detection model ({BIAS_CLASSIFIER_BACKEND} backend)...")
+        classifier = create_classifier()
+        print("Bias detection model loaded successfully!")
+    except Exception as e:
+        print(f"Error loading model: {e}")
+        classifier = None
 
-# Initialize the model
-try:
-    print("Loading bias detection model...")
-    model_name = "sangy1212/distilbert-base-nepali-fine-tuned"
-    
-    classifier = pipeline(
-        "text-classification",
-        model=model_name,
-        tokenizer=model_name,
-        device=0 if torch.cuda.is_available() else -1,
-        batch_size=16
-    )
-    print("Bias detection model loaded successfully!")
-except Exception as e:
-    print(f"Error loading model: {e}")
+
+def stop_classifier() -> None:
+    """Stop the classifier's worker processes, if it has any."""
+    global classifier
+    if hasattr(classifier, "close"):
+        classifier.close()
     classifier = None
 
 # Initialize Mistral client for debiasing suggestions
@@ -45,20 +80,57 @@ except Exception as e:
     print(f"Error initializing Mistral client: {e}")
     mistral_client = None
 
-# Label mapping
-id_to_label = {
-    "LABEL_0":  "neutral",
-    "LABEL_1":  "gender",
-    "LABEL_2":  "religional",
-    "LABEL_3":  "caste",
-    "LABEL_4":  "religion",
-    "LABEL_5":  "appearence",
-    "LABEL_6":  "socialstatus",
-    "LABEL_7":  "amiguity",
-    "LABEL_8":  "political",
-    "LABEL_9":  "Age",
-    "LABEL_10": "Disablity"
-}
+# Coalesces identical concurrent debias requests into one Mistral call
+debias_flight = SingleFlight("debias")
+
+# Parallel suggestion generation. The LLM scheduler still enforces the Mistral
+# rate limit and each call is bounded by the debias route's latency budget;
+# DEBIAS_BATCH_TIMEOUT_SECONDS caps how long a caller waits for a whole batch.
+DEBIAS_MAX_CONCURRENCY = int(os.getenv("DEBIAS_MAX_CONCURRENCY", str(LLM_MAX_CONCURRENCY)))
+DEBIAS_BATCH_TIMEOUT_SECONDS = float(os.getenv("DEBIAS_BATCH_TIMEOUT_SECONDS", "120"))
+debias_executor = ThreadPoolExecutor(max_workers=DEBIAS_MAX_CONCURRENCY, thread_name_prefix="debias")
+
+# Sentences packed into one debias prompt (1 = one Mistral call per sentence)
+DEBIAS_PACK_SIZE = int(os.getenv("DEBIAS_PACK_SIZE", "8"))
+
+DEBIAS_SYSTEM_PROMPT = (
+    "You are a Nepali editor. Rewrite the given sentence to remove bias while keeping the original meaning, tone, and formality. "
+    "Return only ONE rewritten sentence in Nepali, no explanations, no English, no context echoes."
+)
+DEBIAS_PACK_SYSTEM_PROMPT = (
+    "You are a Nepali editor. Rewrite each numbered sentence to remove bias while keeping its original meaning, tone, and formality. "
+    'Return ONLY a JSON array with one object per sentence: [{"index": 1, "rewrite": "..."}, ...]. '
+    "Each rewrite is ONE sentence in Nepali, no explanations, no English, no context echoes."
+)
+
+DEBIAS_ALTERNATIVES_SYSTEM_PROMPT = (
+    "You are a Nepali editor. Write several different rewrites of the given sentence that remove bias while keeping its original meaning, tone, and formality. "
+    "Vary wording and sentence structure between rewrites. "
+    'Return ONLY a JSON array of strings: ["...", "..."]. Each rewrite is ONE sentence in Nepali, no explanations, no English.'
+)
+
+# Alternatives pre-generated per biased sentence in a HITL session, so "regenerate"
+# can serve one instantly (0 disables). They run at bulk priority on their own pool.
+DEBIAS_ALTERNATIVES_COUNT = int(os.getenv("DEBIAS_ALTERNATIVES_COUNT", "3"))
+DEBIAS_ALTERNATIVES_CONCURRENCY = int(os.getenv("DEBIAS_ALTERNATIVES_CONCURRENCY", "2"))
+alternatives_executor = ThreadPoolExecutor(max_workers=DEBIAS_ALTERNATIVES_CONCURRENCY, thread_name_prefix="debias-alternatives")
+
+# Rewrites are stored per (sentence, category, model, prompt version) and shared by all workers.
+# Editing any debias prompt changes the version, so old rewrites stop being served.
+DEBIAS_STORE_ENABLED = os.getenv("DEBIAS_STORE_ENABLED", "true").lower() == "true"
+DEBIAS_STORE_DB_FILE = os.getenv("DEBIAS_STORE_DB_FILE", str(LLM_CACHE_DIR / "debias_suggestions.sqlite3"))
+DEBIAS_STORE_MAX_CANDIDATES = int(os.getenv("DEBIAS_STORE_MAX_CANDIDATES", "5"))  # Rewrites kept per sentence
+DEBIAS_PROMPT_VERSION = hash_text(DEBIAS_SYSTEM_PROMPT + DEBIAS_PACK_SYSTEM_PROMPT + DEBIAS_ALTERNATIVES_SYSTEM_PROMPT)[:12]
+suggestion_store = SuggestionStore(DEBIAS_STORE_DB_FILE, DEBIAS_STORE_MAX_CANDIDATES) if DEBIAS_STORE_ENABLED else None
+
+# Rewrites are run back through the classifier, in one batch per chunk, before a
+# reviewer sees them. A rewrite still biased with at least DEBIAS_VERIFY_THRESHOLD
+# confidence is regenerated up to DEBIAS_VERIFY_RETRIES times; if every attempt
+# fails, the least biased one is kept and its score is shown to the reviewer.
+DEBIAS_VERIFY_ENABLED = os.getenv("DEBIAS_VERIFY_ENABLED", "true").lower() == "true"
+DEBIAS_VERIFY_THRESHOLD = float(os.getenv("DEBIAS_VERIFY_THRESHOLD", "0.7"))
+DEBIAS_VERIFY_RETRIES = int(os.getenv("DEBIAS_VERIFY_RETRIES", "1"))
+
 
 def split_into_sentences(text: str) -> List[str]:
     """
@@ -79,62 +151,325 @@ def split_into_sentences(text: str) -> List[str]:
     return cleaned
 
 
-def run_bias_detection(text: str, confidence_threshold: float) -> BiasDetectionResponse:
-    """Core bias detection logic reused by single and batch endpoints."""
+def _require_classifier() -> None:
     if classifier is None:
         raise HTTPException(
             status_code=503,
             detail="Bias detection model is not available. Please check server logs."
         )
 
-    sentences = split_into_sentences(text)
 
-    if not sentences:
-        return BiasDetectionResponse(
-            success=True,
-            total_sentences=0,
-            biased_count=0,
-            neutral_count=0,
-            results=[],
-            error="No valid sentences found in the provided text."
-        )
+def _predict_batch(sentences: List[str]) -> List[dict]:
+    """Classify one micro-batch; length bucketing is left to the classifier (BIAS_CLASSIFIER_BUCKETING)."""
+    return classifier(sentences)
 
-    predictions = classifier(sentences)
 
-    results: List[BiasResult] = []
-    biased_count = 0
-    neutral_count = 0
+# Shared inference queue in front of the global pipeline
+classifier_batcher = MicroBatcher(
+    _predict_batch,
+    max_batch_size=MICRO_BATCH_MAX_SIZE,
+    max_wait_ms=MICRO_BATCH_MAX_WAIT_MS,
+    name="bias-classifier"
+)
+
 
+def _to_bias_results(sentences: List[str], predictions: List[dict], confidence_threshold: float) -> List[BiasResult]:
+    results: List[BiasResult] = []
     for sentence, prediction in zip(sentences, predictions):
-        label_id = prediction['label']
-        category = id_to_label.get(label_id, "unknown")
+        category = id_to_label.get(prediction['label'], "unknown")
         confidence = prediction['score']
-
-        is_biased = category != "neutral" and confidence >= confidence_threshold
-
-        if is_biased:
-            biased_count += 1
-        else:
-            neutral_count += 1
-
         results.append(BiasResult(
             sentence=sentence,
             category=category,
             confidence=confidence,
-            is_biased=is_biased
+            is_biased=category != "neutral" and confidence >= confidence_threshold,
+            probabilities=prediction.get('probabilities')
         ))
+    return results
+
+
+# Prediction used for sentences the lexicon pre-filter skips (see utility.lexicon_prefilter).
+# Its one-hot neutral vector means re-thresholding can never flag a skipped sentence.
+_SKIPPED_PREDICTION = {
+    "label": "LABEL_0",
+    "score": 1.0,
+    "probabilities": [1.0 if label == "neutral" else 0.0 for label in CATEGORY_LABELS],
+}
 
+
+def _select_for_model(sentences: List[str]) -> Tuple[List[int], Set[int]]:
+    """Indices of the sentences the classifier must see, and the audited subset."""
+    prefilter = get_prefilter()
+    if prefilter is None:
+        return list(range(len(sentences))), set()
+    return prefilter.select(sentences)
+
+
+def _prefiltered_results(
+    sentences: List[str],
+    selected: Sequence[int],
+    audited: Set[int],
+    predictions: List[dict],
+    confidence_threshold: float,
+) -> List[BiasResult]:
+    """Place model predictions back among the skipped sentences and record the audit."""
+    merged = [_SKIPPED_PREDICTION] * len(sentences)
+    for i, prediction in zip(selected, predictions):
+        merged[i] = prediction
+    results = _to_bias_results(sentences, merged, confidence_threshold)
+
+    prefilter = get_prefilter()
+    if prefilter is not None and audited:
+        prefilter.record_audit((results[i].sentence, results[i].category, results[i].is_biased) for i in sorted(audited))
+    return results
+
+
+def classify_sentences(sentences: List[str], confidence_threshold: float) -> List[BiasResult]:
+    """Classify pre-segmented sentences through the shared inference queue.
+
+    Repeated sentences are classified once and cached predictions are reused;
+    the remaining sentences are batched with other callers' requests, and
+    the classifier groups each batch by token length before padding. With the lexicon
+    pre-filter enabled, sentences without a bias trigger term (other than the
+    audit sample) are returned as neutral without inference. Results keep
+    the input order.
+    """
+    _require_classifier()
+    selected, audited = _select_for_model(sentences)
+    to_classify = [sentences[i] for i in selected]
+    predictions = classify_with_cache(to_classify, classifier_batcher, get_classification_cache())
+    return _prefiltered_results(sentences, selected, audited, predictions, confidence_threshold)
+
+
+async def _submit_async(sentences: List[str]) -> List[dict]:
+    return await asyncio.wrap_future(classifier_batcher.submit(sentences))
+
+
+async def classify_sentences_async(sentences: List[str], confidence_threshold: float) -> List[BiasResult]:
+    """Like classify_sentences, but awaits the queue without blocking the event loop."""
+    _require_classifier()
+    selected, audited = _select_for_model(sentences)
+    to_classify = [sentences[i] for i in selected]
+    predictions = await classify_with_cache_async(to_classify, _submit_async, get_classification_cache())
+    return _prefiltered_results(sentences, selected, audited, predictions, confidence_threshold)
+
+
+def _no_sentences_response() -> BiasDetectionResponse:
     return BiasDetectionResponse(
         success=True,
-        total_sentences=len(sentences),
+        total_sentences=0,
+        biased_count=0,
+        neutral_count=0,
+        results=[],
+        error="No valid sentences found in the provided text."
+    )
+
+
+def _detection_response(results: List[BiasResult]) -> BiasDetectionResponse:
+    biased_count = sum(1 for result in results if result.is_biased)
+    return BiasDetectionResponse(
+        success=True,
+        total_sentences=len(results),
         biased_count=biased_count,
-        neutral_count=neutral_count,
+        neutral_count=len(results) - biased_count,
         results=results
     )
 
 
-def generate_debiased_sentence(payload: DebiasSentenceRequest) -> DebiasSentenceResponse:
-    """Use Mistral to suggest a bias-free rewrite for a sentence."""
+def run_bias_detection(text: str, confidence_threshold: float) -> BiasDetectionResponse:
+    """Core bias detection logic reused by single and batch endpoints."""
+    _require_classifier()
+
+    sentences = split_into_sentences(text)
+    if not sentences:
+        return _no_sentences_response()
+
+    return _detection_response(classify_sentences(sentences, confidence_threshold))
+
+
+async def run_bias_detection_async(text: str, confidence_threshold: float) -> BiasDetectionResponse:
+    """Async variant of run_bias_detection for request handlers."""
+    _require_classifier()
+
+    sentences = split_into_sentences(text)
+    if not sentences:
+        return _no_sentences_response()
+
+    return _detection_response(await classify_sentences_async(sentences, confidence_threshold))
+
+
+def _suggestion_key(sentence: str, category: str) -> str:
+    return SuggestionStore.make_key(sentence, category, get_route("debias").model, DEBIAS_PROMPT_VERSION)
+
+
+def _stored_suggestion(payload: DebiasSentenceRequest, exclude: Iterable[str] = ()) -> Optional[DebiasSentenceResponse]:
+    """Serve the best stored rewrite the caller has not seen yet, if any.
+
+    `payload.context` is deliberately not part of the key: it holds the
+    neighbouring sentences, which differ between documents, so keying on it
+    would stop approved rewrites from being reused. A rewrite only changes
+    the sentence itself, and reviewers still see it in place.
+    """
+    if suggestion_store is None:
+        return None
+    suggestion = suggestion_store.best(_suggestion_key(payload.sentence, payload.category), exclude)
+    if suggestion is None:
+        return None
+    return DebiasSentenceResponse(
+        success=True,
+        original_sentence=payload.sentence,
+        category=payload.category,
+        suggestion=suggestion,
+        rationale=None,
+        error=None,
+    )
+
+
+def _remember_suggestion(payload: DebiasSentenceRequest, suggestion: str) -> None:
+    if suggestion_store is not None:
+        suggestion_store.add(_suggestion_key(payload.sentence, payload.category), suggestion)
+
+
+def record_suggestion_feedback(
+    sentence: str,
+    category: str,
+    suggestion: Optional[str],
+    approved: bool,
+    approved_text: Optional[str] = None,
+) -> None:
+    """Count a reviewer decision so the most approved rewrite is served first.
+
+    If the reviewer approved an edited text, the served rewrite counts as
+    rejected and the edit is stored as an approved candidate.
+    """
+    if suggestion_store is None:
+        return
+    key = _suggestion_key(sentence, category)
+    edited = approved and approved_text and approved_text.strip() != (suggestion or "").strip()
+    if suggestion:
+        suggestion_store.record_feedback(key, suggestion, approved and not edited)
+    if edited:
+        suggestion_store.add(key, approved_text, approvals=1)
+
+
+def bias_score(prediction: dict) -> float:
+    """Probability that a classified sentence is biased in any category."""
+    probabilities = prediction.get('probabilities')
+    if probabilities:
+        return float(max(p for label, p in zip(CATEGORY_LABELS, probabilities) if label != "neutral"))
+    confidence = float(prediction['score'])
+    return 1.0 - confidence if id_to_label.get(prediction['label']) == "neutral" else confidence
+
+
+def verify_rewrites(rewrites: List[str]) -> List[Optional[float]]:
+    """Score rewrites with one batched classifier pass.
+
+    Returns each rewrite's bias score (see bias_score), or None when
+    verification is disabled or the classifier is unavailable.
+    """
+    if not DEBIAS_VERIFY_ENABLED or classifier is None or not rewrites:
+        return [None] * len(rewrites)
+    try:
+        predictions = classify_with_cache(rewrites, classifier_batcher, get_classification_cache())
+    except Exception:
+        logger.exception("Rewrite verification failed")
+        return [None] * len(rewrites)
+    return [round(bias_score(prediction), 4) for prediction in predictions]
+
+
+def _still_biased(score: Optional[float]) -> bool:
+    return score is not None and score >= DEBIAS_VERIFY_THRESHOLD
+
+
+def _reject_suggestion(payload: DebiasSentenceRequest, suggestion: str) -> None:
+    """Count a rewrite that failed verification as a rejection in the store."""
+    if suggestion_store is not None:
+        suggestion_store.record_feedback(_suggestion_key(payload.sentence, payload.category), suggestion, False)
+
+
+def verify_debias_responses(
+    payloads: List[DebiasSentenceRequest],
+    responses: List[DebiasSentenceResponse],
+    priority: str,
+) -> List[DebiasSentenceResponse]:
+    """Verify rewrites in one classifier pass and regenerate the ones still biased.
+
+    Each round scores every pending rewrite in a single batch. A rewrite still
+    classified as biased is counted as rejected in the store and regenerated
+    (avoiding it), up to DEBIAS_VERIFY_RETRIES times. The least biased rewrite
+    is returned with its verification_score.
+    """
+    responses = list(responses)
+    best: Dict[int, DebiasSentenceResponse] = {}
+    tried: Dict[int, List[str]] = {}
+    checking = [i for i, response in enumerate(responses) if response.success and response.suggestion]
+
+    for attempt in range(DEBIAS_VERIFY_RETRIES + 1):
+        if not checking:
+            break
+        scores = verify_rewrites([responses[i].suggestion for i in checking])
+
+        failing = []
+        for i, score in zip(checking, scores):
+            best_score = best[i].verification_score if i in best else None
+            if i not in best or (score is not None and (best_score is None or score < best_score)):
+                best[i] = responses[i].model_copy(update={"verification_score": score})
+            if _still_biased(score):
+                failing.append(i)
+                tried.setdefault(i, []).append(responses[i].suggestion)
+                _reject_suggestion(payloads[i], responses[i].suggestion)
+
+        if attempt == DEBIAS_VERIFY_RETRIES:
+            break
+        for i in failing:
+            responses[i] = _rewrite_sentence(payloads[i], priority, tried[i])
+        checking = [i for i in failing if responses[i].success and responses[i].suggestion]
+
+    for i, response in best.items():
+        responses[i] = response
+    return responses
+
+
+def generate_debiased_sentence(
+    payload: DebiasSentenceRequest,
+    priority: str = "interactive",
+    exclude: Iterable[str] = (),
+) -> DebiasSentenceResponse:
+    """Use Mistral to suggest a bias-free rewrite for a sentence.
+
+    A stored rewrite not in `exclude` is served first; otherwise a fresh
+    one is generated (avoiding the excluded ones) and added to the store.
+    The rewrite is verified by the classifier (see verify_debias_responses).
+    `priority` is the LLM scheduler class; HITL review work passes "review".
+    """
+    response = _rewrite_sentence(payload, priority, exclude)
+    return verify_debias_responses([payload], [response], priority)[0]
+
+
+def _rewrite_sentence(
+    payload: DebiasSentenceRequest,
+    priority: str,
+    exclude: Iterable[str] = (),
+    check_store: bool = True,
+) -> DebiasSentenceResponse:
+    """Serve a stored rewrite or generate one, without verification."""
+    exclude = tuple(s for s in exclude if s)
+    if check_store:
+        stored = _stored_suggestion(payload, exclude)
+        if stored is not None:
+            return stored
+
+    key = normalize_key(payload.sentence, payload.category, payload.context, *exclude)
+    response = debias_flight.do(key, _generate_debiased_sentence, payload, priority, exclude)
+    return response.model_copy(update={"original_sentence": payload.sentence})
+
+
+def _generate_debiased_sentence(
+    payload: DebiasSentenceRequest,
+    priority: str,
+    exclude: Iterable[str] = (),
+) -> DebiasSentenceResponse:
+    """Call Mistral for a single rewrite (see generate_debiased_sentence)."""
     if mistral_client is None or mistral_client.client is None:
         return DebiasSentenceResponse(
             success=False,
@@ -145,28 +480,31 @@ def generate_debiased_sentence(payload: DebiasSentenceRequest) -> DebiasSentence
             error="LLM unavailable",
         )
 
-    system_prompt = (
-        "You are a Nepali editor. Rewrite the given sentence to remove bias while keeping the original meaning, tone, and formality. "
-        "Return only ONE rewritten sentence in Nepali, no explanations, no English, no context echoes."
-    )
+    avoid = ""
+    if exclude:
+        avoid = "Rejected rewrites (write a different one):\n" + "\n".join(f"- {s}" for s in exclude) + "\n\n"
 
     user_prompt = (
         f"Category: {payload.category}\n"
         f"Sentence: {payload.sentence}\n"
         f"Context: {payload.context or 'N/A'}\n\n"
+        f"{avoid}"
         "Rewrite this single sentence in Nepali so it is neutral and inclusive. Output only the rewritten sentence."
     )
 
     try:
-        raw = mistral_client.generate_response(
+        raw = mistral_client.generate_for_task(
+            "debias",
             prompt=user_prompt,
-            system_prompt=system_prompt,
-            temperature=0.3,
+            system_prompt=DEBIAS_SYSTEM_PROMPT,
+            validate=lambda r: 1.0 if r.strip() else None,
+            call_site="bias.debias",
+            priority=priority,
         )
-        # Post-process: keep first line, strip extras
-        suggestion = raw.splitlines()[0].strip()
-        if payload.sentence.rstrip().endswith('।') and not suggestion.endswith('।'):
-            suggestion += '।'
+        suggestion = _finish_rewrite(payload.sentence, raw)
+        if not suggestion:
+            raise ValueError("Empty rewrite returned")
+        _remember_suggestion(payload, suggestion)
         return DebiasSentenceResponse(
             success=True,
             original_sentence=payload.sentence,
@@ -186,11 +524,349 @@ def generate_debiased_sentence(payload: DebiasSentenceRequest) -> DebiasSentence
         )
 
 
+def _finish_rewrite(original: str, raw: str) -> str:
+    """Keep the first line of a rewrite and restore the Nepali full stop."""
+    lines = [line.strip() for line in raw.strip().splitlines() if line.strip()]
+    if not lines:
+        return ""
+    suggestion = lines[0]
+    if original.rstrip().endswith('।') and not suggestion.endswith('।'):
+        suggestion += '।'
+    return suggestion.strip()
+
+
+_PACKED_ENTRY_PATTERN = re.compile(r'"index"\s*:\s*"?(\d+)"?\s*,\s*"rewrite"\s*:\s*"((?:[^"\\]|\\.)*)"')
+
+
+def _repair_json(text: str) -> str:
+    """Fix the JSON damage LLMs commonly produce (smart quotes, trailing commas)."""
+    text = text.replace('“', '"').replace('”', '"')
+    return re.sub(r',\s*([\]}])', r'\1', text)
+
+
+def parse_packed_rewrites(raw: str, count: int) -> Dict[int, str]:
+    """Parse a packed debias response into {item number: rewrite}.
+
+    Accepts a JSON array of {"index", "rewrite"} objects (numbered from 1),
+    a plain array of strings, or an {"1": "..."} object. If the JSON cannot
+    be repaired, complete entries are salvaged from the raw text.
+    """
+    text = re.sub(r'^```(?:json)?\s*|\s*```$', '', raw.strip())
+    start, end = text.find('['), text.rfind(']')
+    candidate = text[start:end + 1] if start != -1 and end > start else text
+
+    parsed = None
+    for attempt in (candidate, _repair_json(candidate)):
+        try:
+            parsed = json.loads(attempt)
+            break
+        except ValueError:
+            continue
+
+    entries = []
+    if isinstance(parsed, dict):
+        entries = list(parsed.items())
+    elif isinstance(parsed, list):
+        for position, entry in enumerate(parsed, 1):
+            if isinstance(entry, dict):
+                entries.append((entry.get("index"), entry.get("rewrite")))
+            else:
+                entries.append((position, entry))
+    else:
+        entries = [(m.group(1), json.loads(f'"{m.group(2)}"')) for m in _PACKED_ENTRY_PATTERN.finditer(text)]
+
+    rewrites: Dict[int, str] = {}
+    for number, rewrite in entries:
+        try:
+            number = int(number)
+        except (TypeError, ValueError):
+            continue
+        if 1 <= number <= count and isinstance(rewrite, str) and rewrite.strip():
+            rewrites[number] = rewrite
+    return rewrites
+
+
+def _format_pack_prompt(payloads: List[DebiasSentenceRequest]) -> str:
+    """Numbered sentences after the surrounding text of the pack.
+
+    Each item's context (its neighbouring sentences) differs, so every
+    distinct context is listed; only identical contexts are merged, and a
+    neighbour shared by adjacent items can still appear more than once.
+    """
+    contexts = list(dict.fromkeys(p.context for p in payloads if p.context))
+    numbered = "\n".join(f"{i}. [{p.category}] {p.sentence}" for i, p in enumerate(payloads, 1))
+
+    context_block = ""
+    if contexts:
+        context_block = "Surrounding text from the document:\n" + "\n".join(contexts) + "\n\n"
+
+    return (
+        f"{context_block}"
+        f"Sentences to rewrite (bias category in brackets):\n{numbered}\n\n"
+        f"Rewrite each of the {len(payloads)} sentences in Nepali so it is neutral and inclusive. "
+        "Output only the JSON array."
+    )
+
+
+def _generate_debiased_pack(payloads: List[DebiasSentenceRequest], priority: str) -> List[DebiasSentenceResponse]:
+    """Rewrite several sentences with one Mistral call (unverified).
+
+    Items missing from the parsed output are retried once in a smaller pack;
+    anything still missing falls back to a single-sentence call.
+    """
+    if mistral_client is None or mistral_client.client is None:
+        return [_rewrite_sentence(payload, priority, check_store=False) for payload in payloads]
+
+    rewrites: Dict[int, str] = {}
+    pending = list(range(len(payloads)))
+
+    for _ in range(2):  # First pass, then one retry for the items that failed
+        if not pending:
+            break
+        batch = [payloads[i] for i in pending]
+        try:
+            raw = mistral_client.generate_for_task(
+                "debias_batch",
+                prompt=_format_pack_prompt(batch),
+                system_prompt=DEBIAS_PACK_SYSTEM_PROMPT,
+                validate=lambda r, n=len(batch): len(parse_packed_rewrites(r, n)) / n or None,
+                call_site="bias.debias_batch",
+                priority=priority,
+            )
+            found = parse_packed_rewrites(raw, len(batch))
+        except Exception:
+            logger.exception("Packed debias call failed")
+            found = {}
+
+        for number, rewrite in found.items():
+            suggestion = _finish_rewrite(batch[number - 1].sentence, rewrite)
+            if suggestion:
+                rewrites[pending[number - 1]] = suggestion
+                _remember_suggestion(batch[number - 1], suggestion)
+        pending = [i for i in pending if i not in rewrites]
+
+    responses = []
+    for i, payload in enumerate(payloads):
+        if i not in rewrites:
+            responses.append(_rewrite_sentence(payload, priority, check_store=False))
+            continue
+        responses.append(DebiasSentenceResponse(
+            success=True,
+            original_sentence=payload.sentence,
+            category=payload.category,
+            suggestion=rewrites[i],
+            rationale=None,
+            error=None,
+        ))
+    return responses
+
+
+def generate_alternatives(
+    payload: DebiasSentenceRequest,
+    count: int = DEBIAS_ALTERNATIVES_COUNT,
+    exclude: Iterable[str] = (),
+    priority: str = "bulk",
+) -> List[str]:
+    """Return up to `count` distinct rewrites that are not in `exclude`.
+
+    Stored candidates are used first; the rest come from one Mistral call
+    asking for several different rewrites, which are added to the store.
+    All of them are verified in one classifier pass and those still biased
+    are dropped, so the result may hold fewer than `count`.
+    """
+    seen = {s.strip() for s in exclude if s}
+    alternatives: List[str] = []
+    if suggestion_store is not None:
+        alternatives = suggestion_store.candidates(_suggestion_key(payload.sentence, payload.category), seen)[:count]
+    seen.update(alternatives)
+
+    missing = count - len(alternatives)
+    if missing <= 0 or mistral_client is None or mistral_client.client is None:
+        return _drop_biased(payload, alternatives)
+
+    avoid = "\n".join(f"- {s}" for s in sorted(seen))
+    prompt = (
+        f"Category: {payload.category}\n"
+        f"Sentence: {payload.sentence}\n"
+        f"Context: {payload.context or 'N/A'}\n\n"
+        + (f"Rewrites already used (do not repeat):\n{avoid}\n\n" if avoid else "")
+        + f"Write {missing} different neutral, inclusive rewrites in Nepali. Output only the JSON array."
+    )
+
+    try:
+        raw = mistral_client.generate_for_task(
+            "debias_alternatives",
+            prompt=prompt,
+            system_prompt=DEBIAS_ALTERNATIVES_SYSTEM_PROMPT,
+            validate=lambda r: 1.0 if parse_packed_rewrites(r, missing) else None,
+            call_site="bias.debias_alternatives",
+            priority=priority,
+        )
+    except Exception:
+        logger.exception("Debias alternatives call failed")
+        return _drop_biased(payload, alternatives)
+
+    for _, rewrite in sorted(parse_packed_rewrites(raw, missing).items()):
+        suggestion = _finish_rewrite(payload.sentence, rewrite)
+        if suggestion and suggestion not in seen:
+            seen.add(suggestion)
+            alternatives.append(suggestion)
+            _remember_suggestion(payload, suggestion)
+    return _drop_biased(payload, alternatives)
+
+
+def _drop_biased(payload: DebiasSentenceRequest, rewrites: List[str]) -> List[str]:
+    """Keep the rewrites that pass verification; the rest count as rejected in the store."""
+    kept = []
+    for rewrite, score in zip(rewrites, verify_rewrites(rewrites)):
+        if _still_biased(score):
+            _reject_suggestion(payload, rewrite)
+        else:
+            kept.append(rewrite)
+    return kept
+
+
+def submit_alternatives(
+    payload: DebiasSentenceRequest,
+    count: int,
+    exclude: Iterable[str],
+    on_done: Callable[[List[str]], None],
+) -> Future:
+    """Generate alternatives in the background and pass them to `on_done`."""
+    exclude = list(exclude)
+
+    def job() -> None:
+        alternatives: List[str] = []
+        try:
+            alternatives = generate_alternatives(payload, count, exclude)
+        finally:
+            on_done(alternatives)
+
+    return alternatives_executor.submit(job)
+
+
+def _failed_debias_response(payload: DebiasSentenceRequest, error: str) -> DebiasSentenceResponse:
+    return DebiasSentenceResponse(
+        success=False,
+        original_sentence=payload.sentence,
+        category=payload.category,
+        suggestion=None,
+        rationale=None,
+        error=error,
+    )
+
+
+def submit_debias_jobs(
+    payloads: List[DebiasSentenceRequest],
+    priority: str = "review",
+    on_result: Optional[Callable[[int, DebiasSentenceResponse], None]] = None,
+    pack_size: int = DEBIAS_PACK_SIZE,
+) -> List[Future]:
+    """Queue rewrites on the shared debias pool, `pack_size` sentences per call.
+
+    Returns one future per payload. `on_result(index, response)` is called
+    from the worker as each rewrite finishes, or with success=False when its
+    job fails or is cancelled, so callers can fill in results without waiting for the batch. Sentences with a stored rewrite skip
+    Mistral; every chunk, stored or fresh, is verified in one classifier pass.
+    Cancelling a future before its job starts drops that sentence from the job.
+    """
+    futures: List[Future] = [Future() for _ in payloads]
+    pack_size = max(1, pack_size)
+
+    def notify(index: int, response: DebiasSentenceResponse) -> None:
+        if on_result is not None:
+            try:
+                on_result(index, response)
+            except Exception:
+                logger.exception(f"Error delivering debias result {index}")
+
+    def job(indices: List[int], produce: Callable[[List[int]], List[DebiasSentenceResponse]]) -> None:
+        started = []
+        for index in indices:
+            if futures[index].set_running_or_notify_cancel():
+                started.append(index)
+            else:
+                # Callers tracking pending suggestions must hear about cancellations too
+                notify(index, _failed_debias_response(payloads[index], "Cancelled"))
+        if not started:
+            return
+
+        try:
+            responses = verify_debias_responses([payloads[i] for i in started], produce(started), priority)
+        except Exception as e:
+            for index in started:
+                futures[index].set_exception(e)
+                notify(index, _failed_debias_response(payloads[index], str(e)))
+            return
+
+        for index, response in zip(started, responses):
+            futures[index].set_result(response)
+            notify(index, response)
+
+    def generate(indices: List[int]) -> List[DebiasSentenceResponse]:
+        batch = [payloads[i] for i in indices]
+        if len(batch) == 1:
+            return [_rewrite_sentence(batch[0], priority, check_store=False)]
+        return _generate_debiased_pack(batch, priority)
+
+    # Sentences with a stored rewrite only need verifying; only the rest reach Mistral
+    stored: Dict[int, DebiasSentenceResponse] = {}
+    for index, payload in enumerate(payloads):
+        response = _stored_suggestion(payload)
+        if response is not None:
+            stored[index] = response
+    pending = [index for index in range(len(payloads)) if index not in stored]
+
+    if stored:
+        debias_executor.submit(job, list(stored), lambda indices: [stored[i] for i in indices])
+    for start in range(0, len(pending), pack_size):
+        debias_executor.submit(job, pending[start:start + pack_size], generate)
+    return futures
+
+
+def collect_debias_results(
+    payloads: List[DebiasSentenceRequest],
+    futures: List[Future],
+    timeout: Optional[float] = DEBIAS_BATCH_TIMEOUT_SECONDS,
+    cancel: bool = True,
+) -> List[DebiasSentenceResponse]:
+    """Wait up to `timeout` seconds and return whatever has finished.
+
+    Unfinished items come back with success=False so callers get partial results.
+    With `cancel`, items whose job has not started yet are cancelled so they
+    do not reach Mistral; pass cancel=False when the jobs' on_result callback
+    still wants the late results.
+    """
+    done, not_done = wait(futures, timeout=timeout)
+    if cancel:
+        for future in not_done:
+            future.cancel()
+
+    results: List[DebiasSentenceResponse] = []
+    for payload, future in zip(payloads, futures):
+        if future in done and future.exception() is None:
+            results.append(future.result())
+            continue
+        error = str(future.exception()) if future in done else "Timed out waiting for suggestion"
+        results.append(_failed_debias_response(payload, error))
+
+    return results
+
+
+def generate_debiased_sentences(
+    payloads: List[DebiasSentenceRequest],
+    priority: str = "review",
+    timeout: Optional[float] = DEBIAS_BATCH_TIMEOUT_SECONDS,
+) -> List[DebiasSentenceResponse]:
+    """Generate rewrites for many sentences in parallel, in input order."""
+    return collect_debias_results(payloads, submit_debias_jobs(payloads, priority), timeout)
+
+
 @router.post("/detect-bias", response_model=BiasDetectionResponse)
 async def detect_bias(request: BiasDetectionRequest, user: dict = Depends(get_current_user)):
     """Detect bias in Nepali text using a fine-tuned model."""
     try:
-        return run_bias_detection(request.text, request.confidence_threshold)
+        return await run_bias_detection_async(request.text, request.confidence_threshold)
     except HTTPException:
         raise
     except Exception as e:
@@ -210,10 +886,35 @@ async def detect_bias_batch(request: BatchBiasDetectionRequest, user: dict = Dep
         if not request.texts:
             return BatchBiasDetectionResponse(success=False, items=[], error="No texts provided.")
 
-        items: List[BatchBiasItem] = []
-        for idx, text in enumerate(request.texts):
-            result = run_bias_detection(text or "", request.confidence_threshold)
-            items.append(BatchBiasItem(index=idx, input_text=text, result=result))
+        # Flatten every text's sentences with (text index, sentence index) back-pointers
+        per_text = [split_into_sentences(text or "") for text in request.texts]
+        pointers = [(t, s) for t, sentences in enumerate(per_text) for s in range(len(sentences))]
+        flat = [per_text[t][s] for t, s in pointers]
+
+        if len(flat) > BIAS_BATCH_MAX_SENTENCES:
+            raise HTTPException(
+                status_code=413,
+                detail=f"Request has {len(flat)} sentences; the limit is {BIAS_BATCH_MAX_SENTENCES}. Split it into smaller batches."
+            )
+
+        # One classification pass over the flat list, in bounded chunks
+        flat_results: List[BiasResult] = []
+        for start in range(0, len(flat), BIAS_BATCH_CHUNK_SENTENCES):
+            chunk = flat[start:start + BIAS_BATCH_CHUNK_SENTENCES]
+            flat_results.extend(await classify_sentences_async(chunk, request.confidence_threshold))
+
+        grouped: List[List[Optional[BiasResult]]] = [[None] * len(sentences) for sentences in per_text]
+        for (t, s), result in zip(pointers, flat_results):
+            grouped[t][s] = result
+
+        items: List[BatchBiasItem] = [
+            BatchBiasItem(
+                index=idx,
+                input_text=text,
+                result=_detection_response(grouped[idx]) if grouped[idx] else _no_sentences_response()
+            )
+            for idx, text in enumerate(request.texts)
+        ]
 
         return BatchBiasDetectionResponse(success=True, items=items)
     except HTTPException:
@@ -229,14 +930,21 @@ async def health_check():
     return {
         "status": "healthy" if classifier is not None else "unhealthy",
         "model_loaded": classifier is not None,
-        "model_name": "sangy1212/distilbert-base-nepali-fine-tuned"
+        "model_name": MODEL_NAME,
+        "backend": BIAS_CLASSIFIER_BACKEND,
+        "batching": classifier_batcher.get_stats(),
+        "padding": classifier.get_stats() if hasattr(classifier, "get_stats") else None,
+        "workers": classifier.get_worker_stats() if hasattr(classifier, "get_worker_stats") else None,
+        "classification_cache": cache.get_stats() if (cache := get_classification_cache()) else None,
+        "suggestion_store": suggestion_store.get_stats() if suggestion_store else None,
+        "prefilter": prefilter.get_stats() if (prefilter := get_prefilter()) else None
     }
 
 
 @router.post("/debias-sentence", response_model=DebiasSentenceResponse)
 async def debias_sentence(request: DebiasSentenceRequest, user: dict = Depends(get_current_user)):
     """Suggest a bias-free alternative for a single sentence using Mistral."""
-    return generate_debiased_sentence(request)
+    return await run_in_threadpool(generate_debiased_sentence, request)
 
 
 @router.post("/debias-sentence/batch", response_model=DebiasBatchResponse)
@@ -245,9 +953,10 @@ async def debias_sentence_batch(request: DebiasBatchRequest, user: dict = Depend
     if not request.items:
         return DebiasBatchResponse(success=False, items=[], error="No items provided")
 
-    results: List[DebiasBatchItem] = []
-    for idx, item in enumerate(request.items):
-        result = generate_debiased_sentence(item)
-        results.append(DebiasBatchItem(index=idx, input=item, result=result))
+    responses = await run_in_threadpool(generate_debiased_sentences, request.items, "review")
+    results = [
+        DebiasBatchItem(index=idx, input=item, result=result)
+        for idx, (item, result) in enumerate(zip(request.items, responses))
+    ]
 
     return DebiasBatchResponse(success=True, items=results)
@@ -3,8 +3,9 @@ Human-in-the-Loop Bias Detection API
 Handles the interactive workflow for bias detection with human approval
 """
 
-from fastapi import APIRouter, HTTPException, Depends, UploadFile, File, Form
-from fastapi.responses import Response
+from fastapi import APIRouter, HTTPException, Depends, UploadFile, File, Form, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import Response, StreamingResponse
 from api.core.deps import get_current_user
 import fitz  # PyMuPDF
 from api.schemas import (
@@ -17,12 +18,34 @@ from api.schemas import (
     SessionStatusResponse,
     BiasReviewItem,
     DebiasSentenceRequest,
+    RethresholdRequest,
+    RethresholdResponse,
+    ReviewProgress,
 )
-from api.routes.bias_detection import run_bias_detection, generate_debiased_sentence
+from api.routes.bias_detection import (
+    split_into_sentences,
+    classify_sentences,
+    classify_sentences_async,
+    generate_debiased_sentence,
+    record_suggestion_feedback,
+    submit_alternatives,
+    submit_debias_jobs,
+    collect_debias_results,
+    verify_rewrites,
+    BIAS_BATCH_CHUNK_SENTENCES,
+    DEBIAS_ALTERNATIVES_COUNT,
+)
+from utility.bias_classifier import CATEGORY_LABELS
+from utility.lexicon_prefilter import get_prefilter
 from utility.pdf_processor import PDFProcessor
 from utility.hitl_session_manager import HITLSessionManager
 from utility.pdf_regenerator import PDFRegenerator
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
+import asyncio
+import os
+import threading
+import time
 import uuid
 import logging
 
@@ -33,6 +56,48 @@ router = APIRouter()
 # Initialize global session manager
 session_manager = HITLSessionManager()
 
+
+# start-review with background_job=True returns at once and runs the pipeline on this
+# pool, so at most HITL_REVIEW_JOB_CONCURRENCY documents are processed at a time.
+# Progress is streamed from /session/{session_id}/events every HITL_PROGRESS_POLL_SECONDS.
+HITL_REVIEW_JOB_CONCURRENCY = int(os.getenv("HITL_REVIEW_JOB_CONCURRENCY", "2"))
+HITL_PROGRESS_POLL_SECONDS = float(os.getenv("HITL_PROGRESS_POLL_SECONDS", "0.5"))
+HITL_PROGRESS_STREAM_MAX_SECONDS = float(os.getenv("HITL_PROGRESS_STREAM_MAX_SECONDS", "1800"))  # Clients reconnect after this
+review_job_executor = ThreadPoolExecutor(max_workers=HITL_REVIEW_JOB_CONCURRENCY, thread_name_prefix="hitl-review")
+
+# Top up a sentence's alternative pool in the background once this few are left
+DEBIAS_ALTERNATIVES_LOW_WATER = int(os.getenv("DEBIAS_ALTERNATIVES_LOW_WATER", "1"))
+_alternatives_inflight = set()
+_alternatives_lock = threading.Lock()
+
+
+def _find_sentence(session, sentence_id: str) -> Optional[BiasReviewItem]:
+    return next((s for s in session.sentences if s.sentence_id == sentence_id), None)
+
+
+def _schedule_alternatives(session_id: str, item: BiasReviewItem) -> None:
+    """Fill the sentence's alternative pool in the background (one job per sentence at a time)."""
+    needed = DEBIAS_ALTERNATIVES_COUNT - len(item.alternatives)
+    if not item.is_biased or needed <= 0 or len(item.alternatives) > DEBIAS_ALTERNATIVES_LOW_WATER:
+        return
+
+    key = (session_id, item.sentence_id)
+    with _alternatives_lock:
+        if key in _alternatives_inflight:
+            return
+        _alternatives_inflight.add(key)
+
+    def store_alternatives(alternatives):
+        try:
+            session_manager.add_alternatives(session_id, item.sentence_id, alternatives)
+        finally:
+            with _alternatives_lock:
+                _alternatives_inflight.discard(key)
+
+    payload = DebiasSentenceRequest(sentence=item.original_sentence, category=item.category, context=None)
+    exclude = item.rejected_suggestions + item.alternatives + [item.suggestion]
+    submit_alternatives(payload, needed, exclude, store_alternatives)
+
 # Initialize PDF processor
 pdf_processor = PDFProcessor()
 
@@ -40,11 +105,125 @@ pdf_processor = PDFProcessor()
 pdf_regenerator = PDFRegenerator()
 
 
+def _segment(sentences: List[str]) -> List[str]:
+    """Clean each extracted sentence into the segments that get classified."""
+    segments = []
+    for sentence in sentences:
+        cleaned = split_into_sentences(sentence)
+        if cleaned:
+            segments.extend(cleaned)
+        else:
+            logger.warning(f"No valid sentence found in: {sentence[:50]}...")
+    return segments
+
+
+def _review_items(bias_results) -> List[BiasReviewItem]:
+    """Review items for classified sentences; neutral ones are auto-approved."""
+    return [
+        BiasReviewItem(
+            sentence_id=str(uuid.uuid4()),
+            original_sentence=bias_result.sentence,
+            is_biased=bias_result.is_biased,
+            category=bias_result.category,
+            confidence=bias_result.confidence,
+            suggestion=None,
+            approved_suggestion=None,
+            status="pending" if bias_result.is_biased else "approved",  # Auto-approve neutral
+            suggestion_pending=bias_result.is_biased
+        )
+        for bias_result in bias_results
+    ]
+
+
+def _submit_suggestions(session, items: List[BiasReviewItem], document: Optional[List[str]] = None):
+    """Generate suggestions for `items` in parallel; each is written to the session as it arrives.
+
+    Neighbouring sentences are passed as context (identical contexts are listed once per packed prompt);
+    `document` supplies them when the session is still being filled.
+    Returns the debias requests and their futures.
+    """
+    document = document or [item.original_sentence for item in session.sentences]
+    positions = {item.sentence_id: i for i, item in enumerate(session.sentences)}
+    debias_requests = []
+    for item in items:
+        i = positions[item.sentence_id]
+        item.suggestion_pending = True
+        debias_requests.append(DebiasSentenceRequest(
+            sentence=item.original_sentence,
+            category=item.category,
+            context=" ".join(document[max(0, i - 1):i] + document[i + 1:i + 2]) or None
+        ))
+
+    def store_suggestion(index, debias_response):
+        session_manager.fill_suggestion(
+            session_id=session.session_id,
+            sentence_id=items[index].sentence_id,
+            suggestion=debias_response.suggestion if debias_response.success else None,
+            verification_score=debias_response.verification_score
+        )
+        # Prepare alternatives for "regenerate" while the reviewer reads the first suggestion
+        if debias_response.success:
+            _schedule_alternatives(session.session_id, items[index])
+
+    futures = submit_debias_jobs(debias_requests, priority="review", on_result=store_suggestion)
+    return debias_requests, futures
+
+
+def _run_review_job(session_id: str, pdf_content: bytes, refine_with_llm: bool, confidence_threshold: float) -> None:
+    """Background pipeline for start-review jobs: extract, classify in chunks, queue suggestions.
+
+    Each classified chunk is added to the session right away and its
+    suggestions are queued, so reviewers can start on the first sentences
+    while the rest of the document is processed.
+    """
+    try:
+        def on_progress(stage: str, done: int, total: int) -> None:
+            if stage == "extracting":
+                session_manager.update_progress(session_id, stage=stage, pages_extracted=done, pages_total=total)
+            else:
+                session_manager.update_progress(session_id, stage=stage)
+
+        session_manager.update_progress(session_id, stage="extracting")
+        result = pdf_processor.process_pdf_from_bytes(
+            pdf_bytes=pdf_content,
+            refine_with_llm=refine_with_llm,
+            on_progress=on_progress
+        )
+        if not result["success"]:
+            raise ValueError(f"PDF processing failed: {result.get('error', 'Unknown error')}")
+
+        segments = _segment(result["sentences"])
+        if not segments:
+            raise ValueError("No sentences could be extracted from the PDF")
+
+        session = session_manager.get_session(session_id)
+        session.raw_text = result["raw_text"]
+        session_manager.update_progress(session_id, stage="classifying", sentences_total=len(segments))
+
+        for start in range(0, len(segments), BIAS_BATCH_CHUNK_SENTENCES):
+            bias_results = classify_sentences(segments[start:start + BIAS_BATCH_CHUNK_SENTENCES], confidence_threshold)
+            items = _review_items(bias_results)
+            session_manager.append_sentences(session_id, items, [r.probabilities for r in bias_results])
+
+            biased_items = [item for item in items if item.is_biased]
+            if biased_items:
+                _submit_suggestions(session, biased_items, segments)
+
+        session_manager.finish_processing(session_id)
+        logger.info(f"Background review job {session_id} classified {len(segments)} sentences")
+
+    except Exception as e:
+        logger.error(f"Background review job {session_id} failed: {e}")
+        session_manager.finish_processing(session_id, error=str(e))
+
+
 @router.post("/start-review", response_model=StartReviewResponse)
 async def start_bias_review(
     file: UploadFile = File(...),
     refine_with_llm: bool = Form(True),
     confidence_threshold: float = Form(0.7),
+    wait_for_suggestions: bool = Form(True),
+    background_job: bool = Form(False),
     user: dict = Depends(get_current_user)
 ):
     """
@@ -54,8 +233,17 @@ async def start_bias_review(
     1. Upload PDF
     2. Extract and segment sentences
     3. Run bias detection
-    4. Generate suggestions for biased sentences
+    4. Generate suggestions for biased sentences in parallel
     5. Return session ID with all results for review
+
+    With wait_for_suggestions=False the session is returned right after
+    classification; suggestions fill in as they are generated and can be
+    polled via /session/{session_id} (see suggestion_pending).
+
+    With background_job=True the session ID is returned immediately and the
+    whole pipeline runs in a background worker. Sentences appear in the
+    session as they are classified; follow progress on
+    /session/{session_id}/events (SSE) or by polling /session/{session_id}.
     """
     try:
         logger.info(f"Starting HITL review for file: {file.filename}")
@@ -63,8 +251,34 @@ async def start_bias_review(
         # Read PDF bytes
         pdf_content = await file.read()
 
+        if background_job:
+            session = session_manager.create_session(
+                filename=file.filename,
+                sentences=[],
+                raw_text="",
+                original_pdf_bytes=pdf_content,
+                confidence_threshold=confidence_threshold,
+                processing=True
+            )
+            review_job_executor.submit(
+                _run_review_job, session.session_id, pdf_content, refine_with_llm, confidence_threshold
+            )
+            logger.info(f"Queued background review job {session.session_id}")
+
+            return StartReviewResponse(
+                success=True,
+                session_id=session.session_id,
+                total_sentences=0,
+                biased_count=0,
+                neutral_count=0,
+                sentences=[],
+                filename=file.filename,
+                progress=session_manager.get_progress(session.session_id)
+            )
+
         # Process PDF to extract sentences
-        result = pdf_processor.process_pdf_from_bytes(
+        result = await run_in_threadpool(
+            pdf_processor.process_pdf_from_bytes,
             pdf_bytes=pdf_content,
             refine_with_llm=refine_with_llm
         )
@@ -84,17 +298,9 @@ async def start_bias_review(
                 detail="No sentences could be extracted from the PDF"
             )
 
-        # Run bias detection on each sentence individually
+        # Clean each extracted sentence, then classify the whole document in batches
         logger.info(f"Running bias detection on {len(sentences)} sentences")
-        all_bias_results = []
-
-        for sentence in sentences:
-            bias_detection_result = run_bias_detection(sentence, confidence_threshold)
-            if bias_detection_result.success and bias_detection_result.results:
-                # Each sentence gets analyzed separately
-                all_bias_results.extend(bias_detection_result.results)
-            else:
-                logger.warning(f"Bias detection failed for sentence: {sentence[:50]}...")
+        all_bias_results = await classify_sentences_async(_segment(sentences), confidence_threshold)
 
         if not all_bias_results:
             raise HTTPException(
@@ -104,51 +310,38 @@ async def start_bias_review(
 
         logger.info(f"Bias detection completed. Found {len(all_bias_results)} results")
 
-        # Create review items with suggestions for biased sentences
-        review_items = []
-        biased_count = 0
-        neutral_count = 0
-
-        for bias_result in all_bias_results:
-            sentence_id = str(uuid.uuid4())
-
-            # Generate suggestion for biased sentences
-            suggestion = None
-            if bias_result.is_biased:
-                biased_count += 1
-                # Generate debiased suggestion
-                debias_request = DebiasSentenceRequest(
-                    sentence=bias_result.sentence,
-                    category=bias_result.category,
-                    context=None
-                )
-                debias_response = generate_debiased_sentence(debias_request)
-                if debias_response.success:
-                    suggestion = debias_response.suggestion
-            else:
-                neutral_count += 1
-
-            review_item = BiasReviewItem(
-                sentence_id=sentence_id,
-                original_sentence=bias_result.sentence,
-                is_biased=bias_result.is_biased,
-                category=bias_result.category,
-                confidence=bias_result.confidence,
-                suggestion=suggestion,
-                approved_suggestion=None,
-                status="pending" if bias_result.is_biased else "approved"  # Auto-approve neutral
-            )
+        # Create review items; suggestions for biased sentences are generated below
+        review_items = _review_items(all_bias_results)
+        biased_count = sum(1 for item in review_items if item.is_biased)
+        neutral_count = len(review_items) - biased_count
 
-            review_items.append(review_item)
+        # Keep the softmax vectors so the session can be re-thresholded without re-running the model
+        probabilities = [r.probabilities for r in all_bias_results]
+        if any(p is None for p in probabilities):
+            probabilities = None
 
         # Create session with PDF bytes for regeneration
         session = session_manager.create_session(
             filename=file.filename,
             sentences=review_items,
             raw_text=raw_text,
-            original_pdf_bytes=pdf_content
+            original_pdf_bytes=pdf_content,
+            probabilities=probabilities,
+            confidence_threshold=confidence_threshold
         )
 
+        biased_items = [item for item in session.sentences if item.is_biased]
+        debias_requests, futures = _submit_suggestions(session, biased_items)
+
+        if wait_for_suggestions:
+            # Suggestions still running after the timeout fill in the session later
+            debias_responses = await run_in_threadpool(
+                collect_debias_results, debias_requests, futures, cancel=False
+            )
+            failed = sum(1 for r in debias_responses if not r.success)
+            if failed:
+                logger.warning(f"{failed} of {len(debias_responses)} suggestions failed or are still pending")
+
         logger.info(f"Created HITL session {session.session_id} with {len(review_items)} sentences")
 
         return StartReviewResponse(
@@ -157,8 +350,9 @@ async def start_bias_review(
             total_sentences=len(review_items),
             biased_count=biased_count,
             neutral_count=neutral_count,
-            sentences=review_items,
-            filename=file.filename
+            sentences=session.sentences,
+            filename=file.filename,
+            progress=session_manager.get_progress(session.session_id)
         )
 
     except HTTPException:
@@ -185,44 +379,56 @@ async def approve_suggestion(
         if not session:
             raise HTTPException(status_code=404, detail="Session not found")
 
-        if request.action == "approve":
-            # Approve the suggestion
-            success = session_manager.update_sentence_status(
-                session_id=request.session_id,
-                sentence_id=request.sentence_id,
-                status="approved",
-                approved_suggestion=request.approved_suggestion
-            )
+        if request.action not in ("approve", "reject"):
+            raise HTTPException(status_code=400, detail="Invalid action. Use 'approve' or 'reject'")
 
-            if not success:
-                raise HTTPException(status_code=404, detail="Sentence not found in session")
+        target_sentence = _find_sentence(session, request.sentence_id)
+        previous_status = target_sentence.status if target_sentence is not None else None
+        served_suggestion = target_sentence.suggestion if target_sentence is not None else None
+        new_status = "approved" if request.action == "approve" else "needs_regeneration"
 
-            return ApprovalResponse(
-                success=True,
-                sentence_id=request.sentence_id,
-                message="Suggestion approved successfully"
-            )
+        success = session_manager.update_sentence_status(
+            session_id=request.session_id,
+            sentence_id=request.sentence_id,
+            status=new_status,
+            approved_suggestion=request.approved_suggestion if request.action == "approve" else None
+        )
+        if not success:
+            raise HTTPException(status_code=404, detail="Sentence not found in session")
 
-        elif request.action == "reject":
-            # Mark for regeneration
-            success = session_manager.update_sentence_status(
-                session_id=request.session_id,
-                sentence_id=request.sentence_id,
-                status="needs_regeneration",
-                approved_suggestion=None
+        # Count a reviewer decision once: repeating it (approving twice, rejecting
+        # an already rejected suggestion) must not vote again
+        if target_sentence.is_biased and previous_status != new_status:
+            # Approval stats decide which stored rewrite is served first next time
+            await run_in_threadpool(
+                record_suggestion_feedback,
+                target_sentence.original_sentence,
+                target_sentence.category,
+                served_suggestion,
+                request.action == "approve",
+                request.approved_suggestion,
             )
 
-            if not success:
-                raise HTTPException(status_code=404, detail="Sentence not found in session")
+            prefilter = get_prefilter()
+            approved_text = request.approved_suggestion or served_suggestion
+            if prefilter is not None and request.action == "approve" and approved_text:
+                # Words the reviewer removed become trigger terms, so similar sentences are not skipped
+                await run_in_threadpool(
+                    prefilter.learn, target_sentence.original_sentence, approved_text, target_sentence.category
+                )
 
+        if request.action == "approve":
             return ApprovalResponse(
                 success=True,
                 sentence_id=request.sentence_id,
-                message="Suggestion rejected. Please regenerate a new suggestion."
+                message="Suggestion approved successfully"
             )
 
-        else:
-            raise HTTPException(status_code=400, detail="Invalid action. Use 'approve' or 'reject'")
+        return ApprovalResponse(
+            success=True,
+            sentence_id=request.sentence_id,
+            message="Suggestion rejected. Please regenerate a new suggestion."
+        )
 
     except HTTPException:
         raise
@@ -237,54 +443,67 @@ async def regenerate_suggestion(
     user: dict = Depends(get_current_user)
 ):
     """
-    Regenerate a new suggestion for a rejected sentence using LLM.
+    Regenerate a new suggestion for a rejected sentence.
+
+    The next pre-generated alternative is served when one is ready; otherwise
+    a stored or fresh LLM rewrite is used. The pool is topped up in the
+    background when it runs low.
     """
     try:
         session = session_manager.get_session(request.session_id)
         if not session:
             raise HTTPException(status_code=404, detail="Session not found")
 
-        # Find the sentence
-        target_sentence = None
-        for sentence in session.sentences:
-            if sentence.sentence_id == request.sentence_id:
-                target_sentence = sentence
-                break
-
+        target_sentence = _find_sentence(session, request.sentence_id)
         if not target_sentence:
             raise HTTPException(status_code=404, detail="Sentence not found in session")
 
-        # Generate new suggestion using LLM
-        debias_request = DebiasSentenceRequest(
-            sentence=target_sentence.original_sentence,
-            category=target_sentence.category,
-            context=None
-        )
-
-        debias_response = generate_debiased_sentence(debias_request)
+        # Serve the next pre-generated alternative if one is ready. Alternatives were
+        # verified when pooled, so scoring it again is a classification cache hit.
+        new_suggestion = session_manager.pop_alternative(request.session_id, request.sentence_id)
+        if new_suggestion is not None:
+            verification_score = (await run_in_threadpool(verify_rewrites, [new_suggestion]))[0]
+        else:
+            debias_request = DebiasSentenceRequest(
+                sentence=target_sentence.original_sentence,
+                category=target_sentence.category,
+                context=None
+            )
 
-        if not debias_response.success:
-            raise HTTPException(
-                status_code=500,
-                detail=f"Failed to generate new suggestion: {debias_response.error}"
+            # Serve another stored rewrite if there is one; otherwise ask Mistral for a new one.
+            # A reviewer is waiting on this click, so it competes with chat traffic.
+            seen = target_sentence.rejected_suggestions + [target_sentence.suggestion]
+            debias_response = await run_in_threadpool(
+                generate_debiased_sentence, debias_request, "interactive", seen
             )
 
+            if not debias_response.success:
+                raise HTTPException(
+                    status_code=500,
+                    detail=f"Failed to generate new suggestion: {debias_response.error}"
+                )
+            new_suggestion = debias_response.suggestion
+            verification_score = debias_response.verification_score
+
         # Update the session with new suggestion
         success = session_manager.update_sentence_suggestion(
             session_id=request.session_id,
             sentence_id=request.sentence_id,
-            new_suggestion=debias_response.suggestion
+            new_suggestion=new_suggestion,
+            verification_score=verification_score
         )
 
         if not success:
             raise HTTPException(status_code=500, detail="Failed to update session")
 
+        _schedule_alternatives(request.session_id, target_sentence)
         logger.info(f"Regenerated suggestion for sentence {request.sentence_id}")
 
         return RegenerateSuggestionResponse(
             success=True,
             sentence_id=request.sentence_id,
-            new_suggestion=debias_response.suggestion
+            new_suggestion=new_suggestion,
+            verification_score=verification_score
         )
 
     except HTTPException:
@@ -311,6 +530,11 @@ async def generate_debiased_pdf(
         if not session:
             raise HTTPException(status_code=404, detail="Session not found")
 
+        if session.status == "processing":
+            raise HTTPException(status_code=409, detail="The document is still being processed")
+        if session.status == "failed":
+            raise HTTPException(status_code=400, detail=f"Document processing failed: {session.progress.error}")
+
         # Check if session is ready for final generation
         if not session_manager.is_session_ready_for_pdf(request.session_id):
             stats = session_manager.get_session_stats(request.session_id)
@@ -372,6 +596,74 @@ async def generate_debiased_pdf(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/session/{session_id}/rethreshold", response_model=RethresholdResponse)
+async def rethreshold_session(
+    session_id: str,
+    request: RethresholdRequest,
+    user: dict = Depends(get_current_user)
+):
+    """
+    Re-flag a session's sentences with a new confidence threshold.
+
+    Uses the probability vectors stored at classification time, so no
+    inference is re-run. Per-category thresholds override the default for
+    their category. Suggestions are generated only for sentences that are
+    newly flagged and have none yet; poll /session/{session_id} for them.
+
+    Sentences the lexicon pre-filter skipped were never classified; they
+    carry a one-hot neutral vector, so no threshold can flag them. Disable
+    the pre-filter (BIAS_PREFILTER_ENABLED) to re-threshold every sentence.
+    """
+    try:
+        session = session_manager.get_session(session_id)
+        if not session:
+            raise HTTPException(status_code=404, detail="Session not found")
+        if session.status == "processing":
+            raise HTTPException(status_code=409, detail="The document is still being processed")
+
+        thresholds = [request.confidence_threshold] + list((request.category_thresholds or {}).values())
+        if any(not 0.0 <= t <= 1.0 for t in thresholds):
+            raise HTTPException(status_code=400, detail="Thresholds must be between 0 and 1")
+
+        unknown = set(request.category_thresholds or {}) - set(CATEGORY_LABELS)
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown categories: {', '.join(sorted(unknown))}")
+
+        newly_flagged, unflagged = session_manager.rethreshold(
+            session_id,
+            CATEGORY_LABELS,
+            request.confidence_threshold,
+            request.category_thresholds
+        )
+
+        needs_suggestion = [item for item in newly_flagged if not item.suggestion and not item.suggestion_pending]
+        if request.generate_suggestions and needs_suggestion:
+            _submit_suggestions(session, needs_suggestion)
+
+        biased_count = sum(1 for item in session.sentences if item.is_biased)
+        logger.info(
+            f"Re-thresholded session {session_id} at {request.confidence_threshold}: "
+            f"{len(newly_flagged)} newly flagged, {len(unflagged)} unflagged"
+        )
+
+        return RethresholdResponse(
+            success=True,
+            session_id=session_id,
+            total_sentences=len(session.sentences),
+            biased_count=biased_count,
+            neutral_count=len(session.sentences) - biased_count,
+            newly_flagged_count=len(newly_flagged),
+            unflagged_count=len(unflagged),
+            sentences=session.sentences
+        )
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"Error re-thresholding session: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.get("/session/{session_id}", response_model=SessionStatusResponse)
 async def get_session_status(
     session_id: str,
@@ -400,7 +692,9 @@ async def get_session_status(
             pending_count=stats["pending_count"],
             approved_count=stats["approved_count"],
             needs_regeneration_count=stats["needs_regeneration_count"],
-            sentences=session.sentences
+            suggestions_pending_count=stats["suggestions_pending_count"],
+            sentences=session.sentences,
+            progress=session_manager.get_progress(session_id)
         )
 
     except HTTPException:
@@ -410,6 +704,46 @@ async def get_session_status(
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.get("/session/{session_id}/events")
+async def stream_session_progress(
+    session_id: str,
+    request: Request,
+    user: dict = Depends(get_current_user)
+):
+    """
+    Stream a session's progress as Server-Sent Events.
+
+    A "progress" event carrying a ReviewProgress is sent whenever pages are
+    extracted, sentences are classified or suggestions become ready. The
+    stream ends once the stage is "ready" or "failed", when the client
+    disconnects, or after HITL_PROGRESS_STREAM_MAX_SECONDS (reconnect to
+    keep following); fetch /session/{session_id} for the sentences themselves.
+    """
+    if not session_manager.get_session(session_id):
+        raise HTTPException(status_code=404, detail="Session not found")
+
+    async def events():
+        last = None
+        deadline = time.monotonic() + HITL_PROGRESS_STREAM_MAX_SECONDS
+        while time.monotonic() < deadline and not await request.is_disconnected():
+            progress: Optional[ReviewProgress] = session_manager.get_progress(session_id)
+            if progress is None:  # Session deleted
+                break
+            data = progress.model_dump_json()
+            if data != last:
+                yield f"event: progress\ndata: {data}\n\n"
+                last = data
+            if progress.stage in ("ready", "failed"):
+                break
+            await asyncio.sleep(HITL_PROGRESS_POLL_SECONDS)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @router.get("/health")
 async def hitl_health_check():
     """
@@ -424,6 +758,7 @@ async def hitl_health_check():
         "features": {
             "session_management": True,
             "pdf_regeneration": True,
-            "llm_suggestions": True
+            "llm_suggestions": True,
+            "background_jobs": True
         }
     }
@@ -9,10 +9,23 @@ from api.schemas import (
     MessageResponse
 )
 from api.routes.supabase_auth import get_supabase_admin
-from typing import List, Dict
+from collections import OrderedDict
+from threading import Lock
+from typing import List, Dict, Optional
 
 router = APIRouter()
 
+# Rolling summaries are mirrored in memory so chat keeps its context even
+# before migration 002 (chat_conversations.metadata) has been applied.
+_SUMMARY_CACHE_SIZE = 1000
+_summary_cache: "OrderedDict[str, str]" = OrderedDict()
+_summary_cache_lock = Lock()
+
+# The read-summarize-write of a rolling summary holds its conversation's lock, so
+# two quick turns cannot overwrite each other's update (striped, so memory stays bounded).
+_SUMMARY_LOCK_STRIPES = 64
+_summary_locks = [Lock() for _ in range(_SUMMARY_LOCK_STRIPES)]
+
 
 # ============================================================
 # Helper Functions
@@ -68,6 +81,96 @@ async def get_recent_context(
         print(f"Error fetching conversation context: {e}")
         return []
 
+
+def _cache_summary(conversation_id: str, summary: str) -> None:
+    with _summary_cache_lock:
+        _summary_cache[conversation_id] = summary
+        _summary_cache.move_to_end(conversation_id)
+        while len(_summary_cache) > _SUMMARY_CACHE_SIZE:
+            _summary_cache.popitem(last=False)
+
+
+def conversation_summary_lock(conversation_id: str) -> Lock:
+    """Lock serializing rolling summary updates of a conversation in this process"""
+    return _summary_locks[hash(conversation_id) % _SUMMARY_LOCK_STRIPES]
+
+
+async def get_conversation_summary(conversation_id: str) -> Optional[str]:
+    """
+    Fetch the rolling summary stored with a conversation.
+
+    Args:
+        conversation_id: The conversation ID (ownership checked by the caller)
+
+    Returns:
+        The summary text, or None if the conversation has none yet
+    """
+    return read_conversation_summary(conversation_id)
+
+
+def read_conversation_summary(conversation_id: str) -> Optional[str]:
+    """
+    Fetch the rolling summary stored with a conversation (blocking variant).
+
+    Args:
+        conversation_id: The conversation ID (ownership checked by the caller)
+
+    Returns:
+        The summary text, or None if the conversation has none yet
+    """
+    try:
+        supabase = get_supabase_admin()
+
+        result = supabase.table("chat_conversations")\
+            .select("metadata")\
+            .eq("id", conversation_id)\
+            .execute()
+
+        if result.data:
+            summary = (result.data[0].get("metadata") or {}).get("rolling_summary")
+            if summary:
+                return summary
+
+    except Exception as e:
+        # Metadata column missing or database unavailable - use the local copy
+        print(f"Error fetching conversation summary: {e}")
+
+    with _summary_cache_lock:
+        return _summary_cache.get(conversation_id)
+
+
+def save_conversation_summary(conversation_id: str, summary: str) -> None:
+    """
+    Store the rolling summary of a conversation.
+
+    The summary is merged into the conversation's existing metadata, so other
+    keys stored there are kept. Callers hold conversation_summary_lock().
+
+    Args:
+        conversation_id: The conversation ID (ownership checked by the caller)
+        summary: The updated summary text
+    """
+    _cache_summary(conversation_id, summary)
+
+    try:
+        supabase = get_supabase_admin()
+
+        result = supabase.table("chat_conversations")\
+            .select("metadata")\
+            .eq("id", conversation_id)\
+            .execute()
+
+        metadata = dict((result.data[0].get("metadata") or {}) if result.data else {})
+        metadata["rolling_summary"] = summary
+
+        supabase.table("chat_conversations")\
+            .update({"metadata": metadata})\
+            .eq("id", conversation_id)\
+            .execute()
+
+    except Exception as e:
+        print(f"Error saving conversation summary: {e}")
+
 # ============================================================
 # Conversation Endpoints
 # ============================================================
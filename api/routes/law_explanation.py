@@ -1,4 +1,5 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, BackgroundTasks
+from fastapi.concurrency import run_in_threadpool
 from api.core.deps import get_current_user
 from api.schemas import (
     ExplanationRequest,
@@ -8,7 +9,13 @@ from api.schemas import (
     MessageCreate
 )
 from module_a.interface import LawExplanationAPI
-from api.routes.chat_history import get_recent_context
+from api.routes.chat_history import (
+    get_recent_context,
+    get_conversation_summary,
+    read_conversation_summary,
+    save_conversation_summary,
+    conversation_summary_lock
+)
 from api.routes.supabase_auth import get_supabase_admin
 
 router = APIRouter()
@@ -17,7 +24,8 @@ law_api = LawExplanationAPI()
 @router.post("/explain", response_model=ExplanationResponse)
 async def explain_law(request: ExplanationRequest, user: dict = Depends(get_current_user)):
     try:
-        result = law_api.get_explanation(request.query)
+        # Run in the threadpool so identical concurrent questions can be coalesced
+        result = await run_in_threadpool(law_api.get_explanation, request.query)
 
         if "error" in result:
              # If it's a handled error from the module, we might still want to return 200 with error info
@@ -31,9 +39,24 @@ async def explain_law(request: ExplanationRequest, user: dict = Depends(get_curr
         raise HTTPException(status_code=500, detail=str(e))
 
 
+def update_rolling_summary(conversation_id: str, query: str, result: dict) -> None:
+    """
+    Fold a finished chat turn into the conversation's rolling summary (runs after the response)
+
+    The summary is re-read under the conversation's lock rather than taken from
+    the request, so back-to-back turns each build on the other's update.
+    """
+    with conversation_summary_lock(conversation_id):
+        summary = read_conversation_summary(conversation_id)
+        updated = law_api.update_conversation_summary(summary, query, result)
+        if updated:
+            save_conversation_summary(conversation_id, updated)
+
+
 @router.post("/chat", response_model=ChatResponse)
 async def chat_with_context(
     request: ChatRequest,
+    background_tasks: BackgroundTasks,
     user: dict = Depends(get_current_user)
 ):
     """
@@ -43,6 +66,7 @@ async def chat_with_context(
     3. Checks if the message is independent or dependent on context
     4. Sends appropriate query to RAG pipeline
     5. Saves both user message and assistant response to database
+    6. Folds the exchange into the conversation's rolling summary in the background
     """
     try:
         supabase = get_supabase_admin()
@@ -50,17 +74,23 @@ async def chat_with_context(
 
         # Step 1: Fetch conversation context if conversation_id is provided
         context = []
+        rolling_summary = None
         if conversation_id:
             context = await get_recent_context(
                 conversation_id=conversation_id,
                 user_id=user["id"],
                 limit=5
             )
+            if context:
+                rolling_summary = await get_conversation_summary(conversation_id)
 
         # Step 2: Get context-aware explanation
-        result = law_api.get_explanation_with_context(
+        result = await run_in_threadpool(
+            law_api.get_explanation_with_context,
             query=request.query,
-            conversation_history=context
+            conversation_history=context,
+            rolling_summary=rolling_summary,
+            conversation_id=conversation_id
         )
 
         # Debug: Log sources
@@ -110,6 +140,15 @@ async def chat_with_context(
                     .insert(assistant_message_data)\
                     .execute()
 
+                # Step 4: Update the rolling summary after the response is sent
+                if not result.get("is_non_legal") and not result.get("error"):
+                    background_tasks.add_task(
+                        update_rolling_summary,
+                        conversation_id,
+                        request.query,
+                        result
+                    )
+
         return result
 
     except HTTPException:
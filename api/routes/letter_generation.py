@@ -1,4 +1,5 @@
 from fastapi import APIRouter, HTTPException, Depends
+from fastapi.concurrency import run_in_threadpool
 from api.core.deps import get_current_user
 from api.schemas import (
     LetterGenerationRequest, LetterGenerationResponse,
@@ -16,7 +17,7 @@ letter_api = LetterGenerationAPI()
 @router.post("/search-template", response_model=TemplateSearchResponse)
 async def search_template(request: TemplateSearchRequest, user: dict = Depends(get_current_user)):
     try:
-        result = letter_api.search_template(request.query)
+        result = await run_in_threadpool(letter_api.search_template, request.query)
         return result
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
@@ -1,5 +1,5 @@
 from typing import List, Dict, Any, Optional
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 # Module A Schemas
 class ExplanationRequest(BaseModel):
@@ -86,6 +86,7 @@ class BiasResult(BaseModel):
     category: str
     confidence: float
     is_biased: bool
+    probabilities: Optional[List[float]] = Field(default=None, exclude=True)  # Softmax vector in label-id order (internal)
 
 class BiasDetectionResponse(BaseModel):
     success: bool
@@ -128,6 +129,7 @@ class DebiasSentenceResponse(BaseModel):
     suggestion: Optional[str] = None
     rationale: Optional[str] = None
     error: Optional[str] = None
+    verification_score: Optional[float] = None  # Classifier bias score of the suggestion (None if unverified)
 
 
 class DebiasBatchItem(BaseModel):
@@ -179,6 +181,20 @@ class BiasReviewItem(BaseModel):
     suggestion: Optional[str] = None
     approved_suggestion: Optional[str] = None
     status: str = "pending"  # "pending", "approved", "needs_regeneration"
+    suggestion_pending: bool = False  # True while the suggestion is still being generated
+    rejected_suggestions: List[str] = []  # Rewrites the reviewer rejected; never served again for this sentence
+    alternatives: List[str] = []  # Pre-generated rewrites served next by regenerate
+    verification_score: Optional[float] = None  # Classifier bias score of the suggestion; lower is more neutral
+
+class ReviewProgress(BaseModel):
+    stage: str = "queued"  # "queued", "extracting", "refining", "classifying", "suggesting", "ready", "failed"
+    pages_total: int = 0
+    pages_extracted: int = 0
+    sentences_total: int = 0
+    sentences_classified: int = 0
+    suggestions_total: int = 0
+    suggestions_ready: int = 0
+    error: Optional[str] = None
 
 class BiasReviewSession(BaseModel):
     session_id: str
@@ -187,7 +203,11 @@ class BiasReviewSession(BaseModel):
     raw_text: str
     original_pdf_bytes: Optional[bytes] = None
     created_at: str
-    status: str = "pending_review"  # "pending_review", "in_progress", "completed"
+    status: str = "pending_review"  # "processing", "failed", "pending_review", "in_progress", "completed"
+    progress: Optional[ReviewProgress] = None  # Pipeline progress of sessions started as background jobs
+    confidence_threshold: float = 0.7
+    category_thresholds: Dict[str, float] = {}
+    probabilities: Optional[Any] = Field(default=None, exclude=True)  # float16 array, one softmax row per sentence
 
 class StartReviewResponse(BaseModel):
     success: bool
@@ -197,6 +217,7 @@ class StartReviewResponse(BaseModel):
     neutral_count: int
     sentences: List[BiasReviewItem]
     filename: str
+    progress: Optional[ReviewProgress] = None
     error: Optional[str] = None
 
 class ApprovalRequest(BaseModel):
@@ -219,6 +240,7 @@ class RegenerateSuggestionResponse(BaseModel):
     success: bool
     sentence_id: str
     new_suggestion: Optional[str] = None
+    verification_score: Optional[float] = None
     error: Optional[str] = None
 
 class GeneratePDFRequest(BaseModel):
@@ -238,6 +260,22 @@ class GeneratePDFResponse(BaseModel):
     sentences: List[SentenceDetails]
     error: Optional[str] = None
 
+class RethresholdRequest(BaseModel):
+    confidence_threshold: float = 0.7
+    category_thresholds: Optional[Dict[str, float]] = None  # e.g. {"gender": 0.5}; others use confidence_threshold
+    generate_suggestions: bool = True  # Start suggestions for newly flagged sentences
+
+class RethresholdResponse(BaseModel):
+    success: bool
+    session_id: str
+    total_sentences: int
+    biased_count: int
+    neutral_count: int
+    newly_flagged_count: int
+    unflagged_count: int
+    sentences: List[BiasReviewItem]
+    error: Optional[str] = None
+
 class SessionStatusResponse(BaseModel):
     success: bool
     session_id: str
@@ -246,7 +284,9 @@ class SessionStatusResponse(BaseModel):
     pending_count: int
     approved_count: int
     needs_regeneration_count: int
+    suggestions_pending_count: int = 0
     sentences: List[BiasReviewItem]
+    progress: Optional[ReviewProgress] = None
     error: Optional[str] = None
 
 # Chat History Schemas
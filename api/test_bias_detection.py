@@ -0,0 +1,118 @@
+"""
+Test suite for classifier verification of debias rewrites
+"""
+
+import pytest
+
+from api.routes import bias_detection
+from api.schemas import DebiasSentenceRequest, DebiasSentenceResponse
+
+# Bias score the stub classifier gives each rewrite
+SCORES = {"biased": 0.95, "still biased": 0.8, "clean": 0.1}
+
+PAYLOAD = DebiasSentenceRequest(sentence="महिलाहरू कमजोर हुन्छन्।", category="gender")
+
+
+class _Store:
+    """Records the feedback verification sends to the suggestion store"""
+
+    def __init__(self):
+        self.rejected = []
+
+    def record_feedback(self, key, suggestion, approved):
+        if not approved:
+            self.rejected.append(suggestion)
+
+
+def _response(suggestion):
+    return DebiasSentenceResponse(success=True, original_sentence=PAYLOAD.sentence, category=PAYLOAD.category,
+                                  suggestion=suggestion, rationale=None, error=None)
+
+
+def _stub_rewrites(monkeypatch, *suggestions):
+    """Replace _rewrite_sentence; returns the exclude list of every call"""
+    queue = list(suggestions)
+    calls = []
+
+    def rewrite(payload, priority, exclude=(), check_store=True):
+        calls.append(list(exclude))
+        return _response(queue.pop(0))
+
+    monkeypatch.setattr(bias_detection, "_rewrite_sentence", rewrite)
+    return calls
+
+
+@pytest.fixture
+def store(monkeypatch):
+    """Stub classifier scoring rewrites from SCORES, one retry, and a recording store"""
+    store = _Store()
+    monkeypatch.setattr(bias_detection, "classifier", object())
+    monkeypatch.setattr(bias_detection, "DEBIAS_VERIFY_ENABLED", True)
+    monkeypatch.setattr(bias_detection, "DEBIAS_VERIFY_RETRIES", 1)
+    monkeypatch.setattr(bias_detection, "suggestion_store", store)
+    monkeypatch.setattr(
+        bias_detection, "classify_with_cache",
+        lambda texts, model, cache: [{"label": "LABEL_1", "score": SCORES[text]} for text in texts]
+    )
+    return store
+
+
+def test_biased_rewrite_is_rejected_and_regenerated(store, monkeypatch):
+    """A rewrite above the threshold is regenerated, avoiding it, and the clean one is kept"""
+    calls = _stub_rewrites(monkeypatch, "clean")
+
+    [result] = bias_detection.verify_debias_responses([PAYLOAD], [_response("biased")], "review")
+
+    assert result.suggestion == "clean" and result.verification_score == 0.1
+    assert calls == [["biased"]]
+    assert store.rejected == ["biased"]
+
+
+def test_least_biased_rewrite_is_kept_when_every_attempt_fails(store, monkeypatch):
+    """After the last retry the lowest scoring rewrite wins and every attempt counts as rejected"""
+    calls = _stub_rewrites(monkeypatch, "still biased")
+
+    [result] = bias_detection.verify_debias_responses([PAYLOAD], [_response("biased")], "review")
+
+    assert result.suggestion == "still biased" and result.verification_score == 0.8
+    assert len(calls) == 1
+    assert store.rejected == ["biased", "still biased"]
+
+
+def test_rewrites_pass_unscored_when_verification_is_unavailable(store, monkeypatch):
+    """Without a classifier the rewrite is returned as is, with no score, retry or rejection"""
+    calls = _stub_rewrites(monkeypatch)
+    monkeypatch.setattr(bias_detection, "classifier", None)
+
+    [result] = bias_detection.verify_debias_responses([PAYLOAD], [_response("biased")], "review")
+
+    assert result.suggestion == "biased" and result.verification_score is None
+    assert calls == [] and store.rejected == []
+
+
+class _HeldExecutor:
+    """Holds submitted jobs until the test runs them"""
+
+    def __init__(self):
+        self.jobs = []
+
+    def submit(self, fn, *args):
+        self.jobs.append((fn, args))
+
+
+def test_timed_out_jobs_that_have_not_started_are_cancelled(monkeypatch):
+    """Collecting after the timeout cancels queued jobs; they skip Mistral and report the failure"""
+    executor = _HeldExecutor()
+    calls = _stub_rewrites(monkeypatch)
+    monkeypatch.setattr(bias_detection, "debias_executor", executor)
+    monkeypatch.setattr(bias_detection, "suggestion_store", None)
+    delivered = []
+
+    futures = bias_detection.submit_debias_jobs([PAYLOAD], on_result=lambda i, r: delivered.append((i, r)))
+    [result] = bias_detection.collect_debias_results([PAYLOAD], futures, timeout=0)
+    for fn, args in executor.jobs:
+        fn(*args)
+
+    assert not result.success and futures[0].cancelled()
+    assert calls == []
+    assert [(i, r.success, r.error) for i, r in delivered] == [(0, False, "Cancelled")]
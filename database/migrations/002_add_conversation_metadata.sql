@@ -0,0 +1,15 @@
+-- ============================================================
+-- SETU - Conversation Metadata
+-- ============================================================
+-- Description: Adds a metadata column to chat_conversations for
+--              per-conversation state such as the rolling summary
+-- Author: Development Team
+-- Date: 2026-10-19
+-- Version: 1.0
+-- ============================================================
+
+ALTER TABLE public.chat_conversations
+    ADD COLUMN IF NOT EXISTS metadata JSONB NOT NULL DEFAULT '{}'::jsonb;
+
+COMMENT ON COLUMN public.chat_conversations.metadata IS
+    'Per-conversation state (e.g. rolling_summary: running summary of the chat, updated one exchange at a time)';
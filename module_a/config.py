@@ -129,7 +129,89 @@ PINECONE_TEXT_STORAGE_FILE = DATA_DIR / "pinecone_text_storage.json"
 # Retrieval settings
 DEFAULT_RETRIEVAL_K = 5  # Number of chunks to retrieve
 
+# Dependent follow-ups first reuse the chunks retrieved on the conversation's
+# previous turn; the index is queried only when too few of them still match.
+RETRIEVAL_REUSE_MIN_SCORE = float(os.getenv("RETRIEVAL_REUSE_MIN_SCORE", "0.45"))  # Cosine similarity
+RETRIEVAL_CACHE_MAX_CONVERSATIONS = 2000
+RETRIEVAL_CACHE_TTL_SECONDS = 2 * 3600
+
+# Prompt compression
+# Retrieved chunks are cut down to their article header and the sentences
+# closest to the query before being sent to the LLM (no extra LLM call).
+PROMPT_COMPRESSION_ENABLED = os.getenv("PROMPT_COMPRESSION_ENABLED", "true").lower() == "true"
+PROMPT_COMPRESSION_RATIO = float(os.getenv("PROMPT_COMPRESSION_RATIO", "0.4"))  # Share of context words kept
+PROMPT_COMPRESSION_MAX_WORDS = int(os.getenv("PROMPT_COMPRESSION_MAX_WORDS", "0")) or None  # Optional hard cap
+
 # LLM settings (Step 4)
-MISTRAL_MODEL = "mistral-tiny"  # Options: mistral-tiny, mistral-small, mistral-medium
+MISTRAL_MODEL = os.getenv("MISTRAL_MODEL", "mistral-tiny")  # Options: mistral-tiny, mistral-small, mistral-medium
 MISTRAL_API_KEY_ENV_VAR = "MISTRAL_API_KEY"
 
+# Per-task model routing
+# Cheap tasks run on the fast model and escalate to the strong model only on
+# parse failure or low confidence; the strong model is kept for explanations.
+# Any field can be overridden per task, e.g. LLM_ROUTE_DEBIAS_MODEL=mistral-small-latest
+LLM_FAST_MODEL = os.getenv("LLM_FAST_MODEL", MISTRAL_MODEL)
+LLM_STRONG_MODEL = os.getenv("LLM_STRONG_MODEL", "mistral-small-latest")
+MODEL_ROUTES = {
+    # task: model, temperature, max_tokens, latency budget (s), escalation model, min confidence
+    "classification": {"model": LLM_FAST_MODEL, "temperature": 0.1, "max_tokens": 16,
+                       "latency_budget": 8.0, "escalate_to": LLM_STRONG_MODEL, "min_confidence": 0.6},
+    "extraction": {"model": LLM_FAST_MODEL, "temperature": 0.0, "max_tokens": 200,
+                   "latency_budget": 15.0, "escalate_to": LLM_STRONG_MODEL, "min_confidence": 0.6},
+    "query_rewrite": {"model": LLM_FAST_MODEL, "temperature": 0.3, "max_tokens": 150,
+                      "latency_budget": 10.0, "escalate_to": LLM_STRONG_MODEL, "min_confidence": 0.6},
+    "conversation_summary": {"model": LLM_FAST_MODEL, "temperature": 0.2, "max_tokens": 250,
+                             "latency_budget": 20.0, "escalate_to": None, "min_confidence": 0.0},
+    "explanation": {"model": LLM_STRONG_MODEL, "temperature": 0.7, "max_tokens": 1024,
+                    "latency_budget": 25.0, "escalate_to": None, "min_confidence": 0.0, "hedge": True},
+    "debias": {"model": LLM_FAST_MODEL, "temperature": 0.3, "max_tokens": 200,
+               "latency_budget": 20.0, "escalate_to": LLM_STRONG_MODEL, "min_confidence": 0.6},
+    "debias_batch": {"model": LLM_FAST_MODEL, "temperature": 0.3, "max_tokens": 1600,
+                     "latency_budget": 45.0, "escalate_to": LLM_STRONG_MODEL, "min_confidence": 0.6},
+    "debias_alternatives": {"model": LLM_FAST_MODEL, "temperature": 0.9, "max_tokens": 800,
+                            "latency_budget": 45.0, "escalate_to": None, "min_confidence": 0.0},
+    "letter_fill": {"model": LLM_FAST_MODEL, "temperature": 0.3, "max_tokens": 1500,
+                    "latency_budget": 45.0, "escalate_to": None, "min_confidence": 0.0},
+    "sentence_refinement": {"model": LLM_FAST_MODEL, "temperature": 0.2, "max_tokens": None,
+                            "latency_budget": None, "escalate_to": LLM_STRONG_MODEL, "min_confidence": 0.6},
+}
+
+
+# LLM response cache settings
+# Calls at or below LLM_CACHE_MAX_TEMPERATURE are treated as deterministic and cached.
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true"
+LLM_CACHE_MAX_TEMPERATURE = float(os.getenv("LLM_CACHE_MAX_TEMPERATURE", "0.2"))
+LLM_CACHE_MEMORY_SIZE = int(os.getenv("LLM_CACHE_MEMORY_SIZE", "1024"))  # Entries in the in-memory LRU tier
+LLM_CACHE_TTL_SECONDS = int(os.getenv("LLM_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))  # 7 days
+LLM_CACHE_VERSION = os.getenv("LLM_CACHE_VERSION", "1")  # Bump to invalidate every cached response
+LLM_CACHE_DIR = DATA_DIR / "cache"
+LLM_CACHE_DB_FILE = Path(os.getenv("LLM_CACHE_DB_FILE", str(LLM_CACHE_DIR / "llm_cache.sqlite3")))
+
+# LLM scheduler settings (shared Mistral key)
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "4"))
+LLM_REQUESTS_PER_SECOND = float(os.getenv("LLM_REQUESTS_PER_SECOND", "5"))
+LLM_TOKENS_PER_MINUTE = int(os.getenv("LLM_TOKENS_PER_MINUTE", "500000"))
+LLM_QUEUE_TIMEOUT_SECONDS = float(os.getenv("LLM_QUEUE_TIMEOUT_SECONDS", "120"))
+LLM_ESTIMATED_COMPLETION_TOKENS = 300  # Reserved per call until actual usage is known
+# Priority classes, highest first, with fair-queuing weights
+LLM_PRIORITY_WEIGHTS = {
+    "interactive": 6,  # Chat and single-sentence requests
+    "review": 3,       # HITL debias suggestions
+    "bulk": 1,         # Whole-document sentence refinement, background summaries, HITL alternative pools
+}
+
+# Hedged request settings
+# A second request is fired once the primary has run longer than the given
+# latency percentile; past the hard deadline callers fall back to non-LLM answers.
+LLM_HEDGE_ENABLED = os.getenv("LLM_HEDGE_ENABLED", "true").lower() == "true"
+LLM_HEDGE_PERCENTILE = float(os.getenv("LLM_HEDGE_PERCENTILE", "0.95"))
+LLM_HEDGE_MIN_DELAY_SECONDS = float(os.getenv("LLM_HEDGE_MIN_DELAY_SECONDS", "2.0"))
+LLM_HEDGE_DEFAULT_DELAY_SECONDS = 6.0  # Used until enough latency samples are collected
+LLM_HEDGE_MODEL = os.getenv("LLM_HEDGE_MODEL", "mistral-tiny")  # Empty string = same model
+# Hard deadlines come from each task's latency_budget in MODEL_ROUTES
+
+# Conversation context settings
+# Each conversation keeps a rolling summary that is updated with only the
+# newest exchange, so follow-up rewriting costs the same on every turn.
+ROLLING_SUMMARY_MAX_WORDS = int(os.getenv("ROLLING_SUMMARY_MAX_WORDS", "150"))
+ROLLING_SUMMARY_MESSAGE_MAX_WORDS = 200  # Per-message cap when an exchange is sent to the LLM
@@ -5,28 +5,43 @@ Analyzes conversation context to determine message independence and relevance
 
 import logging
 from typing import List, Dict, Optional
+from .config import ROLLING_SUMMARY_MAX_WORDS, ROLLING_SUMMARY_MESSAGE_MAX_WORDS
 from .llm_client import MistralClient
+from .model_routing import label_confidence
 
 logger = logging.getLogger(__name__)
 
 
+def _truncate_words(text: str, max_words: int, keep_end: bool = False) -> str:
+    """Limit text to max_words words, keeping the start (or the end)"""
+    words = text.split()
+    if len(words) <= max_words:
+        return text.strip()
+    if keep_end:
+        return " ".join(words[-max_words:])
+    return " ".join(words[:max_words]) + " ..."
+
+
 class ConversationContextAnalyzer:
     """
     Analyzes conversation context to determine:
     1. Whether a message is legal-related or casual (greetings, thanks, etc.)
     2. Whether a message is independent or dependent on previous context
     3. Generates summaries for dependent conversations
+    4. Maintains a rolling summary of each conversation
     """
 
-    def __init__(self, model: str = "mistral-small-latest"):
+    def __init__(self, model: Optional[str] = None):
         """
         Initialize the context analyzer
 
         Args:
-            model: Mistral model to use for analysis
+            model: Optional Mistral model for every analysis call. By default
+                each call uses the model routed for its task (see MODEL_ROUTES).
         """
-        self.llm_client = MistralClient(model=model)
-        logger.info(f"ConversationContextAnalyzer initialized with model: {model}")
+        self.llm_client = MistralClient()
+        self.model_override = model
+        logger.info(f"ConversationContextAnalyzer initialized with model: {model or 'per-task routing'}")
 
     def is_non_legal_query(self, message: str) -> bool:
         """
@@ -59,10 +74,13 @@ Respond with ONLY one word: "LEGAL" or "NON_LEGAL"
 
             prompt = f'Message: "{message}"\n\nClassify this message:'
 
-            response = self.llm_client.generate_response(
+            response = self.llm_client.generate_for_task(
+                "classification",
                 prompt=prompt,
                 system_prompt=system_prompt,
-                temperature=0.1  # Low temperature for consistent classification
+                validate=lambda r: label_confidence(r, ("LEGAL", "NON_LEGAL")),
+                call_site="context.non_legal",
+                model=self.model_override
             )
 
             result = response.strip().upper()
@@ -118,10 +136,13 @@ Current message: "{current_msg}"
 
 Is the current message independent or dependent on the conversation?"""
 
-            response = self.llm_client.generate_response(
+            response = self.llm_client.generate_for_task(
+                "classification",
                 prompt=prompt,
                 system_prompt=system_prompt,
-                temperature=0.1  # Low temperature for consistent classification
+                validate=lambda r: label_confidence(r, ("INDEPENDENT", "DEPENDENT")),
+                call_site="context.independence",
+                model=self.model_override
             )
 
             result = response.strip().upper()
@@ -135,7 +156,12 @@ Is the current message independent or dependent on the conversation?"""
             # On error, assume independent to avoid incorrect context merging
             return True
 
-    def summarize_conversation(self, current_msg: str, context: List[Dict[str, str]]) -> str:
+    def summarize_conversation(
+        self,
+        current_msg: str,
+        context: List[Dict[str, str]],
+        rolling_summary: Optional[str] = None
+    ) -> str:
         """
         Create a concise summary combining conversation context and current message
         This summary will be sent to the RAG pipeline
@@ -143,12 +169,20 @@ Is the current message independent or dependent on the conversation?"""
         Args:
             current_msg: The current user message
             context: List of previous messages
+            rolling_summary: Rolling summary of the conversation, if one exists.
+                It replaces the message history, so only the latest exchange is sent.
 
         Returns:
             A concise query suitable for RAG retrieval
         """
         try:
-            conversation_text = self._format_context(context)
+            if rolling_summary:
+                recent = self._format_context(
+                    context, max_messages=2, max_words_per_message=ROLLING_SUMMARY_MESSAGE_MAX_WORDS
+                )
+                conversation_text = f"Summary of the conversation so far:\n{rolling_summary}\n\nMost recent exchange:\n{recent}"
+            else:
+                conversation_text = self._format_context(context)
 
             system_prompt = """You are a legal assistant that creates concise, clear queries for a legal information retrieval system.
 
@@ -177,10 +211,13 @@ Current message: "{current_msg}"
 
 Create a single, clear legal query:"""
 
-            response = self.llm_client.generate_response(
+            response = self.llm_client.generate_for_task(
+                "query_rewrite",
                 prompt=prompt,
                 system_prompt=system_prompt,
-                temperature=0.3  # Slightly higher for natural query generation
+                validate=lambda r: 1.0 if r.strip() else None,
+                call_site="context.summarize",
+                model=self.model_override
             )
 
             summarized_query = response.strip()
@@ -193,13 +230,79 @@ Create a single, clear legal query:"""
             # Fallback: return the current message as-is
             return current_msg
 
-    def _format_context(self, context: List[Dict[str, str]], max_messages: int = 10) -> str:
+    def update_rolling_summary(self, summary: Optional[str], user_msg: str, assistant_msg: str) -> str:
+        """
+        Fold the newest exchange into a conversation's rolling summary
+
+        Only the previous summary and the latest user/assistant pair are sent,
+        so the cost of an update does not grow with the conversation.
+
+        Args:
+            summary: Current rolling summary (None or empty for a new conversation)
+            user_msg: Latest user message
+            assistant_msg: Reply to that message
+
+        Returns:
+            Updated summary of at most ROLLING_SUMMARY_MAX_WORDS words
+        """
+        exchange = self._format_context(
+            [{"role": "user", "content": user_msg}, {"role": "assistant", "content": assistant_msg}],
+            max_words_per_message=ROLLING_SUMMARY_MESSAGE_MAX_WORDS
+        )
+
+        try:
+            system_prompt = f"""You maintain a running summary of a conversation between a user and a legal assistant.
+
+Update the summary with the new exchange.
+
+Requirements:
+- Keep the facts of the user's situation (people, places, dates, amounts)
+- Keep the legal topics discussed and any open questions
+- Drop greetings, thanks and repetition
+- Write plain prose of at most {ROLLING_SUMMARY_MAX_WORDS} words
+
+Respond with ONLY the updated summary.
+"""
+
+            prompt = f"""Current summary:
+{summary or "(empty - the conversation has just started)"}
+
+New exchange:
+{exchange}
+
+Updated summary:"""
+
+            response = self.llm_client.generate_for_task(
+                "conversation_summary",
+                prompt=prompt,
+                system_prompt=system_prompt,
+                call_site="context.rolling_summary",
+                priority="bulk",
+                model=self.model_override
+            )
+
+            updated = _truncate_words(response, ROLLING_SUMMARY_MAX_WORDS)
+            return updated or (summary or "")
+
+        except Exception as e:
+            logger.error(f"Error in update_rolling_summary: {e}")
+            # Fallback: append the raw exchange and keep the most recent words
+            combined = f"{summary}\n{exchange}" if summary else exchange
+            return _truncate_words(combined, ROLLING_SUMMARY_MAX_WORDS, keep_end=True)
+
+    def _format_context(
+        self,
+        context: List[Dict[str, str]],
+        max_messages: int = 10,
+        max_words_per_message: Optional[int] = None
+    ) -> str:
         """
         Format conversation context for LLM consumption
 
         Args:
             context: List of message dictionaries
             max_messages: Maximum number of messages to include
+            max_words_per_message: Optional cap on the words kept from each message
 
         Returns:
             Formatted conversation string
@@ -211,6 +314,8 @@ Create a single, clear legal query:"""
         for msg in recent_context:
             role = msg.get("role", "")
             content = msg.get("content", "")
+            if max_words_per_message:
+                content = _truncate_words(content, max_words_per_message)
 
             if role == "user":
                 formatted_lines.append(f"Human: {content}")
@@ -33,12 +33,20 @@ class LawExplanationAPI:
             logger.error(f"Failed to initialize LawExplanationAPI: {e}")
             raise
 
-    def get_explanation(self, query: str) -> Dict[str, Any]:
+    def get_explanation(
+        self,
+        query: str,
+        conversation_id: Optional[str] = None,
+        follow_up: bool = False
+    ) -> Dict[str, Any]:
         """
         Get a structured legal explanation for a user query.
         
         Args:
             query: The user's question (e.g., "How to get citizenship?")
+            conversation_id: Optional conversation the query belongs to
+            follow_up: Whether the query continues the conversation's previous
+                turn (its retrieved laws are reused when they still match)
             
         Returns:
             Dict containing:
@@ -51,7 +59,7 @@ class LawExplanationAPI:
         """
         try:
             # Run the RAG pipeline
-            result = self.rag_chain.run(query)
+            result = self.rag_chain.run(query, conversation_id=conversation_id, follow_up=follow_up)
             raw_text = result['explanation']
             
             # Parse the structured response
@@ -121,7 +129,9 @@ class LawExplanationAPI:
     def get_explanation_with_context(
         self,
         query: str,
-        conversation_history: Optional[List[Dict[str, str]]] = None
+        conversation_history: Optional[List[Dict[str, str]]] = None,
+        rolling_summary: Optional[str] = None,
+        conversation_id: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Get explanation with conversation context awareness.
@@ -134,6 +144,11 @@ class LawExplanationAPI:
             query: Current user message
             conversation_history: List of previous messages in format:
                 [{"role": "user", "content": "..."}, {"role": "assistant", "content": "..."}, ...]
+            rolling_summary: Stored rolling summary of the conversation (see
+                update_conversation_summary). When given, dependent queries are
+                rewritten from it plus the latest exchange instead of the full history.
+            conversation_id: Optional conversation ID, used to reuse the previous
+                turn's retrieved laws for dependent queries
 
         Returns:
             Dict containing structured explanation (same format as get_explanation)
@@ -147,22 +162,24 @@ class LawExplanationAPI:
             # Step 2: If no context, treat as new conversation
             if not conversation_history or len(conversation_history) == 0:
                 logger.info("No conversation history, processing as new query")
-                return self.get_explanation(query)
+                return self.get_explanation(query, conversation_id=conversation_id)
 
             # Step 3: Check if the query is independent of previous context
             is_independent = self.context_analyzer.is_independent_query(query, conversation_history)
 
             if is_independent:
                 logger.info("Independent query detected, processing without context")
-                return self.get_explanation(query)
+                return self.get_explanation(query, conversation_id=conversation_id)
 
             # Step 4: Dependent query - summarize conversation context
             logger.info("Dependent query detected, summarizing conversation context")
-            summarized_query = self.context_analyzer.summarize_conversation(query, conversation_history)
+            summarized_query = self.context_analyzer.summarize_conversation(
+                query, conversation_history, rolling_summary=rolling_summary
+            )
             logger.info(f"Summarized query: {summarized_query[:100]}...")
 
             # Step 5: Send summarized query to RAG pipeline
-            result = self.get_explanation(summarized_query)
+            result = self.get_explanation(summarized_query, conversation_id=conversation_id, follow_up=True)
 
             # Add metadata indicating context was used
             result['context_used'] = True
@@ -184,6 +201,22 @@ class LawExplanationAPI:
             # Fallback to basic explanation
             return self.get_explanation(query)
 
+    def update_conversation_summary(self, summary: Optional[str], query: str, result: Dict[str, Any]) -> str:
+        """
+        Fold a finished turn into the conversation's rolling summary.
+
+        Args:
+            summary: Current rolling summary (None for a new conversation)
+            query: The user's message for this turn
+            result: The response returned by get_explanation_with_context
+
+        Returns:
+            The updated rolling summary
+        """
+        # The short answer summary carries the gist without the full explanation
+        answer = result.get("summary") or result.get("explanation", "")
+        return self.context_analyzer.update_rolling_summary(summary, query, answer)
+
     def _detect_letter_generation_opportunity(self, next_steps: str, query: str) -> Optional[Dict[str, str]]:
         """
         Detect if the next steps suggest a letter generation opportunity using Mistral LLM.
@@ -235,10 +268,12 @@ Recommended Next Steps: "{next_steps}"
 
 Analyze if this requires generating a formal letter or application:"""
 
-            response = self.context_analyzer.llm_client.generate_response(
+            response = self.context_analyzer.llm_client.generate_for_task(
+                "classification",
                 prompt=prompt,
                 system_prompt=system_prompt,
-                temperature=0.1  # Low temperature for consistent classification
+                validate=lambda r: 1.0 if 'REQUIRES_LETTER:' in r.upper() else None,
+                call_site="interface.letter_detection"
             )
 
             # Parse the response
@@ -0,0 +1,341 @@
+"""
+LLM Response Cache Module
+Content-addressed cache for deterministic (low-temperature) LLM calls.
+
+Two tiers are used:
+- An in-memory LRU tier, local to each process
+- An on-disk SQLite tier, shared by every API worker on the host
+"""
+
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Dict, Any, Tuple
+
+from .config import (
+    LLM_CACHE_ENABLED,
+    LLM_CACHE_MAX_TEMPERATURE,
+    LLM_CACHE_MEMORY_SIZE,
+    LLM_CACHE_TTL_SECONDS,
+    LLM_CACHE_VERSION,
+    LLM_CACHE_DB_FILE,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def hash_text(text: Optional[str]) -> str:
+    """Return a stable SHA-256 hex digest for a (possibly empty) string"""
+    return hashlib.sha256((text or "").encode("utf-8")).hexdigest()
+
+
+class LLMResponseCache:
+    """
+    Caches LLM responses keyed by (model, system prompt, prompt, temperature).
+
+    Entries are versioned by the hash of the system prompt, so editing a
+    prompt template naturally stops old responses from being served.
+    """
+
+    def __init__(
+        self,
+        db_path: Optional[Path] = LLM_CACHE_DB_FILE,
+        memory_size: int = LLM_CACHE_MEMORY_SIZE,
+        ttl_seconds: int = LLM_CACHE_TTL_SECONDS,
+        max_temperature: float = LLM_CACHE_MAX_TEMPERATURE,
+        version: str = LLM_CACHE_VERSION,
+    ):
+        """
+        Initialize the cache
+
+        Args:
+            db_path: SQLite file for the shared tier (None disables the disk tier)
+            memory_size: Maximum number of entries kept in memory
+            ttl_seconds: Time-to-live for cached responses
+            max_temperature: Calls above this temperature are never cached
+            version: Global cache version, part of every key
+        """
+        self.memory_size = memory_size
+        self.ttl_seconds = ttl_seconds
+        self.max_temperature = max_temperature
+        self.version = version
+
+        self._memory: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, int]] = {}
+        self._local = threading.local()
+
+        self.db_path = Path(db_path) if db_path else None
+        if self.db_path:
+            try:
+                self.db_path.parent.mkdir(parents=True, exist_ok=True)
+                self._init_db()
+                logger.info(f"LLM response cache using disk tier at {self.db_path}")
+            except Exception as e:
+                logger.warning(f"LLM cache disk tier unavailable, using memory only: {e}")
+                self.db_path = None
+
+    # ------------------------------------------------------------------
+    # Keys
+    # ------------------------------------------------------------------
+
+    def is_cacheable(self, temperature: float) -> bool:
+        """Only near-deterministic calls are cached"""
+        return temperature <= self.max_temperature
+
+    def make_key(
+        self,
+        model: str,
+        system_prompt: Optional[str],
+        prompt: str,
+        temperature: float
+    ) -> str:
+        """Build the content-addressed key for an LLM call"""
+        parts = [
+            self.version,
+            model,
+            hash_text(system_prompt),
+            hash_text(prompt),
+            f"{temperature:.3f}",
+        ]
+        return hash_text("|".join(parts))
+
+    # ------------------------------------------------------------------
+    # Lookup / store
+    # ------------------------------------------------------------------
+
+    def get(self, key: str, call_site: str = "default") -> Optional[str]:
+        """
+        Look up a cached response
+
+        Args:
+            key: Key from make_key()
+            call_site: Name of the calling code path (for hit-rate metrics)
+
+        Returns:
+            Cached response text, or None on a miss
+        """
+        now = time.time()
+
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                response, expires_at = entry
+                if expires_at > now:
+                    self._memory.move_to_end(key)
+                    self._record(call_site, "memory_hits")
+                    return response
+                del self._memory[key]
+
+        found = self._disk_get(key, now)
+        if found is not None:
+            response, expires_at = found
+            with self._lock:
+                # Keep the disk entry's expiry; promotion must not extend its life
+                self._remember(key, response, expires_at)
+                self._record(call_site, "disk_hits")
+            return response
+
+        with self._lock:
+            self._record(call_site, "misses")
+        return None
+
+    def set(
+        self,
+        key: str,
+        response: str,
+        call_site: str = "default",
+        model: str = "",
+        system_prompt: Optional[str] = None
+    ) -> None:
+        """
+        Store a response in both tiers
+
+        Args:
+            key: Key from make_key()
+            response: LLM response text
+            call_site: Name of the calling code path
+            model: Model that produced the response
+            system_prompt: System prompt used (its hash is stored as the prompt version)
+        """
+        expires_at = time.time() + self.ttl_seconds
+
+        with self._lock:
+            self._remember(key, response, expires_at)
+            self._record(call_site, "stores")
+
+        self._disk_set(key, response, call_site, model, hash_text(system_prompt), expires_at)
+
+    def _remember(self, key: str, response: str, expires_at: float) -> None:
+        """Insert into the LRU tier (caller holds the lock)"""
+        self._memory[key] = (response, expires_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    def _record(self, call_site: str, field: str) -> None:
+        """Increment a per-call-site counter (caller holds the lock)"""
+        site_stats = self._stats.setdefault(
+            call_site, {"memory_hits": 0, "disk_hits": 0, "misses": 0, "stores": 0}
+        )
+        site_stats[field] += 1
+
+    # ------------------------------------------------------------------
+    # SQLite tier
+    # ------------------------------------------------------------------
+
+    def _connect(self) -> sqlite3.Connection:
+        """One connection per thread; SQLite handles cross-process locking"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.db_path), timeout=5.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _init_db(self) -> None:
+        conn = self._connect()
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS llm_cache (
+                key TEXT PRIMARY KEY,
+                response TEXT NOT NULL,
+                call_site TEXT,
+                model TEXT,
+                prompt_version TEXT,
+                created_at REAL NOT NULL,
+                expires_at REAL NOT NULL
+            )
+            """
+        )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_llm_cache_prompt_version ON llm_cache(prompt_version)"
+        )
+        conn.commit()
+
+    def _disk_get(self, key: str, now: float) -> Optional[Tuple[str, float]]:
+        """Return (response, expires_at) of a live disk entry"""
+        if not self.db_path:
+            return None
+        try:
+            row = self._connect().execute(
+                "SELECT response, expires_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+        except Exception as e:
+            logger.warning(f"LLM cache read failed: {e}")
+            return None
+
+        if row is None or row[1] <= now:
+            return None
+        return row[0], row[1]
+
+    def _disk_set(
+        self,
+        key: str,
+        response: str,
+        call_site: str,
+        model: str,
+        prompt_version: str,
+        expires_at: float
+    ) -> None:
+        if not self.db_path:
+            return
+        try:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO llm_cache "
+                "(key, response, call_site, model, prompt_version, created_at, expires_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, response, call_site, model, prompt_version, time.time(), expires_at)
+            )
+            conn.commit()
+        except Exception as e:
+            logger.warning(f"LLM cache write failed: {e}")
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
+
+    def purge_expired(self) -> int:
+        """Delete expired entries from the disk tier; returns rows removed"""
+        if not self.db_path:
+            return 0
+        conn = self._connect()
+        cursor = conn.execute("DELETE FROM llm_cache WHERE expires_at <= ?", (time.time(),))
+        conn.commit()
+        return cursor.rowcount
+
+    def purge_prompt_version(self, system_prompt: Optional[str]) -> int:
+        """Delete every entry produced with the given system prompt"""
+        with self._lock:
+            self._memory.clear()
+        if not self.db_path:
+            return 0
+        conn = self._connect()
+        cursor = conn.execute(
+            "DELETE FROM llm_cache WHERE prompt_version = ?", (hash_text(system_prompt),)
+        )
+        conn.commit()
+        return cursor.rowcount
+
+    def clear(self) -> None:
+        """Remove all entries from both tiers"""
+        with self._lock:
+            self._memory.clear()
+        if self.db_path:
+            conn = self._connect()
+            conn.execute("DELETE FROM llm_cache")
+            conn.commit()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get per-call-site hit-rate metrics
+
+        Returns:
+            Dictionary with overall settings and counters for each call site
+        """
+        with self._lock:
+            call_sites = {}
+            for site, counters in self._stats.items():
+                hits = counters["memory_hits"] + counters["disk_hits"]
+                lookups = hits + counters["misses"]
+                call_sites[site] = {
+                    **counters,
+                    "hit_rate": round(hits / lookups, 4) if lookups else 0.0,
+                }
+
+            return {
+                "enabled": LLM_CACHE_ENABLED,
+                "max_temperature": self.max_temperature,
+                "memory_entries": len(self._memory),
+                "disk_tier": str(self.db_path) if self.db_path else None,
+                "call_sites": call_sites,
+            }
+
+
+_cache_instance: Optional[LLMResponseCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_llm_cache() -> Optional[LLMResponseCache]:
+    """
+    Get the process-wide LLM response cache
+
+    Returns:
+        Shared LLMResponseCache, or None if caching is disabled
+    """
+    global _cache_instance
+
+    if not LLM_CACHE_ENABLED:
+        return None
+
+    if _cache_instance is None:
+        with _cache_lock:
+            if _cache_instance is None:
+                _cache_instance = LLMResponseCache()
+    return _cache_instance
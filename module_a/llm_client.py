@@ -4,8 +4,9 @@ Handles interaction with Mistral AI models
 """
 
 import os
+import time
 import logging
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Callable
 from dotenv import load_dotenv
 
 try:
@@ -17,7 +18,11 @@ except ImportError as e:
     print(f"DEBUG: Mistral import failed: {e}")
     MISTRAL_AVAILABLE = False
 
-from .config import MISTRAL_MODEL, MISTRAL_API_KEY_ENV_VAR
+from .config import MISTRAL_MODEL, MISTRAL_API_KEY_ENV_VAR, LLM_HEDGE_ENABLED, LLM_HEDGE_MODEL
+from .llm_cache import get_llm_cache
+from .llm_scheduler import LLMRequestCancelled, get_llm_scheduler, estimate_tokens
+from .llm_hedging import Attempt, run_hedged, latency_tracker
+from .model_routing import get_route
 
 logger = logging.getLogger(__name__)
 
@@ -60,21 +65,48 @@ class MistralClient:
         self, 
         prompt: str, 
         system_prompt: Optional[str] = None,
-        temperature: float = 0.7
+        temperature: float = 0.7,
+        call_site: str = "default",
+        priority: str = "interactive",
+        hedge: bool = False,
+        deadline: Optional[float] = None,
+        model: Optional[str] = None,
+        max_tokens: Optional[int] = None
     ) -> str:
         """
         Generate a response from the LLM
         
+        Low-temperature calls are served from the shared response cache
+        when an identical request has been answered before. All other
+        calls go through the shared scheduler, which enforces concurrency,
+        rate limits and priority between chat, review and bulk work.
+        
         Args:
             prompt: User prompt
             system_prompt: Optional system instruction
             temperature: Creativity parameter (0.0 to 1.0)
+            call_site: Name of the calling code path (used for cache metrics)
+            priority: Scheduler class: "interactive", "review" or "bulk"
+            hedge: Race a backup request if the primary is slower than usual
+            deadline: Hard time limit in seconds (raises LLMDeadlineExceeded)
+            model: Model override for this call (defaults to the client's model)
+            max_tokens: Optional cap on response length
             
         Returns:
             Generated text response
         """
         if not self.client:
             raise ValueError("Mistral client not initialized. Check API key.")
+        
+        model = model or self.model
+        cache = get_llm_cache()
+        cache_key = None
+        if cache is not None and cache.is_cacheable(temperature):
+            cache_key = cache.make_key(model, system_prompt, prompt, temperature)
+            cached = cache.get(cache_key, call_site=call_site)
+            if cached is not None:
+                logger.info(f"LLM cache hit ({call_site})")
+                return cached
             
         messages = []
         
@@ -82,21 +114,140 @@ class MistralClient:
             messages.append(SystemMessage(content=system_prompt))
             
         messages.append(UserMessage(content=prompt))
+        estimated_tokens = estimate_tokens(system_prompt, prompt)
+        
+        def complete(target_model: str, attempt: Optional[Attempt] = None) -> str:
+            return self._complete(target_model, messages, temperature, priority, estimated_tokens, max_tokens, attempt)
         
         try:
-            logger.info(f"Sending request to Mistral API (model: {self.model})")
-            
-            # Use the new chat.complete API
-            chat_response = self.client.chat.complete(
-                model=self.model,
-                messages=messages,
-                temperature=temperature
-            )
+            hedged_win = False
+            if (hedge and LLM_HEDGE_ENABLED) or deadline is not None:
+                hedge_model = LLM_HEDGE_MODEL or model
+                response_text, hedged_win = run_hedged(
+                    primary=lambda attempt: complete(model, attempt),
+                    hedge=(lambda attempt: complete(hedge_model, attempt)) if hedge and LLM_HEDGE_ENABLED else None,
+                    hedge_delay=latency_tracker.hedge_delay(model),
+                    deadline=deadline
+                )
+            else:
+                response_text = complete(model)
             
-            response_text = chat_response.choices[0].message.content
-            logger.info("Received response from Mistral API")
+            # Only cache answers produced by the model named in the key
+            if cache_key is not None and response_text and not hedged_win:
+                cache.set(
+                    cache_key,
+                    response_text,
+                    call_site=call_site,
+                    model=model,
+                    system_prompt=system_prompt
+                )
             return response_text
             
         except Exception as e:
             logger.error(f"Mistral API call failed: {e}")
             raise
+    
+    def _complete(
+        self,
+        model: str,
+        messages: List[Any],
+        temperature: float,
+        priority: str,
+        estimated_tokens: int,
+        max_tokens: Optional[int] = None,
+        attempt: Optional[Attempt] = None
+    ) -> str:
+        """
+        Send one chat completion through the scheduler and record its latency
+        
+        For a hedged `attempt`, cancelling it withdraws the request while it
+        waits for a slot, and the hedge delay starts once the slot is granted.
+        """
+        params = {"model": model, "messages": messages, "temperature": temperature}
+        if max_tokens:
+            params["max_tokens"] = max_tokens
+        
+        scheduler = get_llm_scheduler()
+        on_queued = None
+        if attempt is not None:
+            on_queued = lambda ticket: attempt.on_cancel(lambda: scheduler.cancel(ticket))
+        with scheduler.slot(priority, estimated_tokens, on_queued=on_queued) as ticket:
+            if attempt is not None:
+                if attempt.cancelled:
+                    raise LLMRequestCancelled("Hedged LLM request abandoned before it was sent")
+                attempt.mark_sent()
+            logger.info(f"Sending request to Mistral API (model: {model}, priority: {priority})")
+            started = time.monotonic()
+            
+            # Use the new chat.complete API
+            chat_response = self.client.chat.complete(**params)
+            
+            latency_tracker.record(model, time.monotonic() - started)
+            usage = getattr(chat_response, "usage", None)
+            if usage is not None and getattr(usage, "total_tokens", None):
+                scheduler.report_usage(ticket, usage.total_tokens)
+        
+        response_text = chat_response.choices[0].message.content
+        logger.info("Received response from Mistral API")
+        return response_text
+    
+    def generate_for_task(
+        self,
+        task: str,
+        prompt: str,
+        system_prompt: Optional[str] = None,
+        validate: Optional[Callable[[str], Optional[float]]] = None,
+        call_site: str = "default",
+        priority: str = "interactive",
+        model: Optional[str] = None
+    ) -> str:
+        """
+        Generate a response using the routing policy for a task
+        
+        The task's route (see MODEL_ROUTES) picks the model, temperature,
+        max_tokens and latency budget. If `validate` reports a parse failure
+        (None) or a confidence below the route's minimum, the call is retried
+        once on the route's escalation model.
+        
+        Args:
+            task: Task name, e.g. "classification", "explanation", "debias"
+            prompt: User prompt
+            system_prompt: Optional system instruction
+            validate: Returns a 0-1 confidence for a response, or None if unparseable
+            call_site: Name of the calling code path (used for cache metrics)
+            priority: Scheduler class: "interactive", "review" or "bulk"
+            model: Optional model that replaces the route's first-choice model
+            
+        Returns:
+            Generated text response
+        """
+        route = get_route(task)
+        
+        def run(target_model: str) -> str:
+            return self.generate_response(
+                prompt=prompt,
+                system_prompt=system_prompt,
+                temperature=route.temperature,
+                call_site=call_site,
+                priority=priority,
+                hedge=route.hedge,
+                deadline=route.latency_budget,
+                model=target_model,
+                max_tokens=route.max_tokens
+            )
+        
+        first_model = model or route.model
+        response_text = run(first_model)
+        
+        if validate is None or not route.escalate_to or route.escalate_to == first_model:
+            return response_text
+        
+        confidence = validate(response_text)
+        if confidence is not None and confidence >= route.min_confidence:
+            return response_text
+        
+        logger.info(
+            f"Escalating {task} ({call_site}) from {first_model} to {route.escalate_to} "
+            f"(confidence: {confidence})"
+        )
+        return run(route.escalate_to)
@@ -0,0 +1,224 @@
+"""
+Hedged Request Module
+Bounds LLM tail latency by racing a backup request against a slow primary.
+
+If the primary call has not returned after a delay taken from the observed
+latency distribution, a second request is sent (optionally to a faster
+model) and whichever finishes first wins. A hard deadline caps the total
+wait; callers then fall back to a non-LLM answer.
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, Future, wait, FIRST_COMPLETED
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+from .config import (
+    LLM_HEDGE_PERCENTILE,
+    LLM_HEDGE_MIN_DELAY_SECONDS,
+    LLM_HEDGE_DEFAULT_DELAY_SECONDS,
+    LLM_MAX_CONCURRENCY,
+)
+
+logger = logging.getLogger(__name__)
+
+_MIN_SAMPLES = 20  # Latency samples needed before the percentile is trusted
+
+
+class LLMDeadlineExceeded(TimeoutError):
+    """Raised when no LLM response arrived before the hard deadline"""
+
+
+class LatencyTracker:
+    """Sliding window of recent call latencies per model"""
+
+    def __init__(self, window: int = 500):
+        self._samples: Dict[str, Deque[float]] = {}
+        self._window = window
+        self._lock = threading.Lock()
+
+    def record(self, model: str, seconds: float) -> None:
+        with self._lock:
+            self._samples.setdefault(model, deque(maxlen=self._window)).append(seconds)
+
+    def percentile(self, model: str, q: float) -> Optional[float]:
+        """Return the q-th latency percentile, or None with too few samples"""
+        with self._lock:
+            samples = sorted(self._samples.get(model, ()))
+        if len(samples) < _MIN_SAMPLES:
+            return None
+        return samples[int(q * (len(samples) - 1))]
+
+    def hedge_delay(self, model: str) -> float:
+        """Delay before firing a hedge request for this model"""
+        observed = self.percentile(model, LLM_HEDGE_PERCENTILE)
+        if observed is None:
+            return LLM_HEDGE_DEFAULT_DELAY_SECONDS
+        return max(LLM_HEDGE_MIN_DELAY_SECONDS, observed)
+
+
+latency_tracker = LatencyTracker()
+
+# Hedged calls need threads of their own; a losing request keeps its worker
+# until the SDK call returns, so allow headroom over the scheduler limit.
+# Time a request spends queued for a thread counts against its deadline.
+_executor = ThreadPoolExecutor(max_workers=max(8, LLM_MAX_CONCURRENCY * 4), thread_name_prefix="llm-hedge")
+
+_stats_lock = threading.Lock()
+_stats = {"hedged_calls": 0, "hedges_fired": 0, "hedge_wins": 0, "deadline_exceeded": 0}
+
+
+def _bump(field: str) -> None:
+    with _stats_lock:
+        _stats[field] += 1
+
+
+class Attempt:
+    """
+    One request of a hedged call, shared with the thread that sends it.
+
+    The request calls mark_sent() once it holds its scheduler slot, which
+    starts the hedge delay, and registers with on_cancel() how to withdraw
+    itself while it is still queued.
+    """
+
+    def __init__(self):
+        self.sent: Future = Future()  # Resolves with the monotonic time the request was sent
+        self._lock = threading.Lock()
+        self._cancelled = False
+        self._on_cancel: List[Callable[[], None]] = []
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled
+
+    def mark_sent(self) -> None:
+        with self._lock:
+            if not self.sent.done():
+                self.sent.set_result(time.monotonic())
+
+    def on_cancel(self, callback: Callable[[], None]) -> None:
+        """Run `callback` when the attempt is cancelled (at once if it already is)"""
+        with self._lock:
+            if not self._cancelled:
+                self._on_cancel.append(callback)
+                return
+        callback()
+
+    def cancel(self) -> None:
+        with self._lock:
+            if self._cancelled:
+                return
+            self._cancelled = True
+            callbacks, self._on_cancel = self._on_cancel, []
+        for callback in callbacks:
+            callback()
+
+
+def run_hedged(
+    primary: Callable[[Attempt], str],
+    hedge: Optional[Callable[[Attempt], str]],
+    hedge_delay: float,
+    deadline: Optional[float] = None,
+) -> Tuple[str, bool]:
+    """
+    Run `primary`, racing `hedge` against it once `hedge_delay` has passed
+
+    The deadline is measured from this call, so time spent waiting for a
+    worker thread or a scheduler slot counts against it. The hedge delay
+    starts only once the primary reports it was sent (Attempt.mark_sent):
+    a primary still queued in the scheduler is not slow, and a hedge would
+    only add to the congestion. Requests that lose, or are still queued
+    when the deadline passes, are cancelled.
+
+    Args:
+        primary: Callable sending the primary request for an Attempt
+        hedge: Callable sending the backup request (None disables hedging)
+        hedge_delay: Seconds after the primary is sent before firing the hedge
+        deadline: Hard limit in seconds for the whole call (None = no limit)
+
+    Returns:
+        Tuple of (response text, True if the hedge request won)
+
+    Raises:
+        LLMDeadlineExceeded: If nothing succeeded before the deadline
+        Exception: The primary's error if every request failed
+    """
+    _bump("hedged_calls")
+    started = time.monotonic()
+    primary_attempt = Attempt()
+    attempts: Dict[Future, Attempt] = {_executor.submit(primary, primary_attempt): primary_attempt}
+
+    def remaining() -> Optional[float]:
+        if deadline is None:
+            return None
+        return max(0.0, deadline - (time.monotonic() - started))
+
+    def abandon(futures) -> None:
+        for future in futures:
+            future.cancel()
+            attempts[future].cancel()
+
+    pending: Dict[Future, bool] = {future: False for future in attempts}
+    first_error: Optional[BaseException] = None
+    hedge_fired = hedge is None
+
+    while pending:
+        timeout = remaining()
+        waiting_for = list(pending)
+        if not hedge_fired:
+            if primary_attempt.sent.done():
+                until_hedge = max(0.0, hedge_delay - (time.monotonic() - primary_attempt.sent.result()))
+                timeout = until_hedge if timeout is None else min(timeout, until_hedge)
+            else:
+                waiting_for.append(primary_attempt.sent)
+
+        done, _ = wait(waiting_for, timeout=timeout, return_when=FIRST_COMPLETED)
+
+        for future in done:
+            if future not in pending:
+                continue  # The primary was sent; the hedge delay starts now
+            is_hedge = pending.pop(future)
+            error = future.exception()
+            if error is None:
+                if is_hedge:
+                    _bump("hedge_wins")
+                abandon(pending)
+                return future.result(), is_hedge
+            if first_error is None:
+                first_error = error
+            logger.warning(f"{'Hedge' if is_hedge else 'Primary'} LLM request failed: {error}")
+
+        if deadline is not None and remaining() <= 0:
+            break
+
+        # Fire the hedge when the sent primary is slow, or at once if the primary failed
+        if not hedge_fired:
+            sent_for = time.monotonic() - primary_attempt.sent.result() if primary_attempt.sent.done() else None
+            if not pending or (sent_for is not None and sent_for >= hedge_delay):
+                if pending:
+                    logger.info(f"Primary LLM request slow after {sent_for:.1f}s, firing hedge")
+                hedge_attempt = Attempt()
+                hedge_future = _executor.submit(hedge, hedge_attempt)
+                attempts[hedge_future] = hedge_attempt
+                pending[hedge_future] = True
+                hedge_fired = True
+                _bump("hedges_fired")
+
+    if pending:
+        abandon(pending)
+        _bump("deadline_exceeded")
+        raise LLMDeadlineExceeded(f"No LLM response within {deadline:.1f}s")
+    raise first_error
+
+
+def get_hedging_stats() -> Dict[str, object]:
+    """Get hedging counters and the current hedge delay per model"""
+    with _stats_lock:
+        stats = dict(_stats)
+    with latency_tracker._lock:
+        models = list(latency_tracker._samples)
+    stats["hedge_delay_seconds"] = {m: round(latency_tracker.hedge_delay(m), 3) for m in models}
+    return stats
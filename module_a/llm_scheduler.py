@@ -0,0 +1,360 @@
+"""
+LLM Scheduler Module
+Coordinates every call made with the shared Mistral key.
+
+Enforces a maximum number of concurrent requests, a requests-per-second
+and a tokens-per-minute budget, and serves waiting callers by priority
+class (interactive > review > bulk) using weighted fair queuing so bulk
+work keeps moving without starving chat.
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Callable, Deque, Dict, Iterator, Optional
+
+from .config import (
+    LLM_MAX_CONCURRENCY,
+    LLM_REQUESTS_PER_SECOND,
+    LLM_TOKENS_PER_MINUTE,
+    LLM_QUEUE_TIMEOUT_SECONDS,
+    LLM_ESTIMATED_COMPLETION_TOKENS,
+    LLM_PRIORITY_WEIGHTS,
+)
+
+logger = logging.getLogger(__name__)
+
+_WAIT_SAMPLE_SIZE = 1000  # Recent queue-wait samples kept per class
+
+
+def estimate_tokens(*texts: Optional[str], completion_tokens: int = LLM_ESTIMATED_COMPLETION_TOKENS) -> int:
+    """
+    Rough token estimate for a request (1 word ≈ 1.3 tokens, as in chunking)
+
+    Args:
+        texts: Prompt texts sent with the request
+        completion_tokens: Tokens reserved for the response
+
+    Returns:
+        Estimated total tokens
+    """
+    words = sum(len(text.split()) for text in texts if text)
+    return int(words * 1.3) + completion_tokens
+
+
+class LLMRequestCancelled(Exception):
+    """Raised when a waiting caller's ticket is cancelled before it got a slot"""
+
+
+class TokenBucket:
+    """Continuously refilling token bucket (not thread-safe; guarded by the scheduler lock)"""
+
+    def __init__(self, capacity: float, refill_per_second: float):
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self.updated_at
+        self.tokens = min(self.capacity, self.tokens + elapsed * self.refill_per_second)
+        self.updated_at = now
+
+    def time_until(self, amount: float, now: float) -> float:
+        """Seconds until `amount` tokens are available (0 if available now)"""
+        self._refill(now)
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.refill_per_second
+
+    def take(self, amount: float, now: float) -> None:
+        self._refill(now)
+        self.tokens -= min(amount, self.capacity)
+
+    def adjust(self, delta: float) -> None:
+        """Correct the balance once actual usage is known (may go negative)"""
+        self.tokens = min(self.capacity, self.tokens - delta)
+
+
+class _Ticket:
+    """A caller waiting for (or holding) an LLM slot"""
+
+    def __init__(self, priority: str, tokens: int):
+        self.priority = priority
+        self.tokens = tokens
+        self.enqueued_at = time.monotonic()
+        self.granted = False
+        self.cancelled = False
+
+
+class LLMScheduler:
+    """Priority-aware concurrency and rate limiter for LLM calls"""
+
+    def __init__(
+        self,
+        max_concurrency: int = LLM_MAX_CONCURRENCY,
+        requests_per_second: float = LLM_REQUESTS_PER_SECOND,
+        tokens_per_minute: int = LLM_TOKENS_PER_MINUTE,
+        priority_weights: Optional[Dict[str, int]] = None,
+        queue_timeout: float = LLM_QUEUE_TIMEOUT_SECONDS,
+    ):
+        """
+        Initialize the scheduler
+
+        Args:
+            max_concurrency: Maximum in-flight LLM requests
+            requests_per_second: Sustained request rate (burst of one second)
+            tokens_per_minute: Sustained token rate (burst of one minute)
+            priority_weights: Weight per priority class, highest priority first
+            queue_timeout: Seconds a caller may wait before TimeoutError
+        """
+        self.max_concurrency = max_concurrency
+        self.queue_timeout = queue_timeout
+        self.priority_weights = dict(priority_weights or LLM_PRIORITY_WEIGHTS)
+
+        self._request_bucket = TokenBucket(max(1.0, requests_per_second), requests_per_second)
+        self._token_bucket = TokenBucket(tokens_per_minute, tokens_per_minute / 60.0)
+
+        self._cond = threading.Condition()
+        self._queues: Dict[str, Deque[_Ticket]] = {p: deque() for p in self.priority_weights}
+        self._current_weights: Dict[str, int] = {p: 0 for p in self.priority_weights}
+        self._in_flight = 0
+
+        self._wait_samples: Dict[str, Deque[float]] = {
+            p: deque(maxlen=_WAIT_SAMPLE_SIZE) for p in self.priority_weights
+        }
+        self._counters: Dict[str, Dict[str, float]] = {
+            p: {"requests": 0, "timeouts": 0, "cancelled": 0, "total_wait_seconds": 0.0, "max_wait_seconds": 0.0}
+            for p in self.priority_weights
+        }
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    @contextmanager
+    def slot(
+        self,
+        priority: str = "interactive",
+        estimated_tokens: int = LLM_ESTIMATED_COMPLETION_TOKENS,
+        on_queued: Optional[Callable[[_Ticket], None]] = None,
+    ) -> Iterator[_Ticket]:
+        """
+        Hold an LLM slot for the duration of a `with` block
+
+        Args:
+            priority: Priority class name
+            estimated_tokens: Token cost charged against the per-minute budget
+            on_queued: Called with the ticket before it is queued, so the
+                caller can cancel() it while it waits
+
+        Raises:
+            TimeoutError: If no slot was granted within queue_timeout
+            LLMRequestCancelled: If the ticket was cancelled while waiting
+        """
+        ticket = self.acquire(priority, estimated_tokens, on_queued)
+        try:
+            yield ticket
+        finally:
+            self.release(ticket)
+
+    def acquire(
+        self,
+        priority: str = "interactive",
+        estimated_tokens: int = LLM_ESTIMATED_COMPLETION_TOKENS,
+        on_queued: Optional[Callable[[_Ticket], None]] = None,
+    ) -> _Ticket:
+        """Block until the caller may send its request"""
+        if priority not in self._queues:
+            logger.warning(f"Unknown LLM priority '{priority}', using lowest class")
+            priority = list(self._queues)[-1]
+
+        ticket = _Ticket(priority, estimated_tokens)
+        deadline = ticket.enqueued_at + self.queue_timeout
+        if on_queued is not None:
+            on_queued(ticket)
+
+        with self._cond:
+            if not ticket.cancelled:
+                self._queues[priority].append(ticket)
+            while True:
+                retry_in = self._dispatch()
+                if ticket.granted:
+                    break
+                if ticket.cancelled:
+                    self._counters[priority]["cancelled"] += 1
+                    raise LLMRequestCancelled(f"LLM request cancelled while waiting for a slot ({priority})")
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._queues[priority].remove(ticket)
+                    self._counters[priority]["timeouts"] += 1
+                    self._cond.notify_all()
+                    raise TimeoutError(
+                        f"Timed out after {self.queue_timeout:.0f}s waiting for an LLM slot ({priority})"
+                    )
+                wait_for = remaining if retry_in is None else min(remaining, retry_in)
+                self._cond.wait(timeout=wait_for)
+
+            self._record_wait(ticket)
+        return ticket
+
+    def release(self, ticket: _Ticket, actual_tokens: Optional[int] = None) -> None:
+        """
+        Free a slot
+
+        Args:
+            ticket: Ticket returned by acquire()
+            actual_tokens: Real token usage, if known, to correct the budget
+        """
+        with self._cond:
+            if actual_tokens is not None:
+                self._token_bucket.adjust(actual_tokens - ticket.tokens)
+            self._in_flight -= 1
+            self._dispatch()
+            self._cond.notify_all()
+
+    def cancel(self, ticket: _Ticket) -> None:
+        """
+        Withdraw a ticket that is still waiting; its acquire() raises LLMRequestCancelled
+
+        A ticket that already holds a slot is left alone (release it instead).
+        """
+        with self._cond:
+            if ticket.granted or ticket.cancelled:
+                return
+            ticket.cancelled = True
+            queue = self._queues[ticket.priority]
+            if ticket in queue:
+                queue.remove(ticket)
+            self._cond.notify_all()
+
+    def report_usage(self, ticket: _Ticket, actual_tokens: int) -> None:
+        """Correct the token budget for a ticket that is still held"""
+        with self._cond:
+            self._token_bucket.adjust(actual_tokens - ticket.tokens)
+            ticket.tokens = actual_tokens
+
+    # ------------------------------------------------------------------
+    # Scheduling
+    # ------------------------------------------------------------------
+
+    def _next_priority(self, commit: bool = False) -> Optional[str]:
+        """
+        Smooth weighted round-robin over non-empty classes
+
+        Args:
+            commit: Persist the round-robin credit (only once the ticket is granted)
+        """
+        active = [p for p, q in self._queues.items() if q]
+        if not active:
+            return None
+
+        weights = dict(self._current_weights)
+        total = 0
+        for p in active:
+            weights[p] += self.priority_weights[p]
+            total += self.priority_weights[p]
+        chosen = max(active, key=lambda p: weights[p])
+        weights[chosen] -= total
+
+        if commit:
+            self._current_weights = weights
+        return chosen
+
+    def _dispatch(self) -> Optional[float]:
+        """
+        Grant as many waiting tickets as capacity allows (caller holds the lock)
+
+        Returns:
+            Seconds until rate limits may admit the next ticket, or None
+        """
+        granted_any = False
+        retry_in = None
+
+        while self._in_flight < self.max_concurrency:
+            priority = self._next_priority()
+            if priority is None:
+                break
+            ticket = self._queues[priority][0]
+
+            now = time.monotonic()
+            wait = max(
+                self._request_bucket.time_until(1, now),
+                self._token_bucket.time_until(ticket.tokens, now),
+            )
+            if wait > 0:
+                retry_in = wait
+                break
+
+            self._next_priority(commit=True)
+            self._queues[priority].popleft()
+            self._request_bucket.take(1, now)
+            self._token_bucket.take(ticket.tokens, now)
+            self._in_flight += 1
+            ticket.granted = True
+            granted_any = True
+
+        if granted_any:
+            self._cond.notify_all()
+        return retry_in
+
+    # ------------------------------------------------------------------
+    # Metrics
+    # ------------------------------------------------------------------
+
+    def _record_wait(self, ticket: _Ticket) -> None:
+        waited = time.monotonic() - ticket.enqueued_at
+        counters = self._counters[ticket.priority]
+        counters["requests"] += 1
+        counters["total_wait_seconds"] += waited
+        counters["max_wait_seconds"] = max(counters["max_wait_seconds"], waited)
+        self._wait_samples[ticket.priority].append(waited)
+
+    def get_stats(self) -> Dict[str, object]:
+        """
+        Get queue and wait-time metrics
+
+        Returns:
+            Dictionary with limits, current load and per-class wait times
+        """
+        with self._cond:
+            classes = {}
+            for priority, counters in self._counters.items():
+                samples = sorted(self._wait_samples[priority])
+                requests = counters["requests"]
+                classes[priority] = {
+                    "queued": len(self._queues[priority]),
+                    "requests": int(requests),
+                    "timeouts": int(counters["timeouts"]),
+                    "cancelled": int(counters["cancelled"]),
+                    "avg_wait_seconds": round(counters["total_wait_seconds"] / requests, 4) if requests else 0.0,
+                    "p95_wait_seconds": round(samples[int(0.95 * (len(samples) - 1))], 4) if samples else 0.0,
+                    "max_wait_seconds": round(counters["max_wait_seconds"], 4),
+                }
+
+            return {
+                "max_concurrency": self.max_concurrency,
+                "in_flight": self._in_flight,
+                "requests_per_second": self._request_bucket.refill_per_second,
+                "tokens_per_minute": int(self._token_bucket.capacity),
+                "classes": classes,
+            }
+
+
+_scheduler_instance: Optional[LLMScheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def get_llm_scheduler() -> LLMScheduler:
+    """Get the process-wide LLM scheduler"""
+    global _scheduler_instance
+
+    if _scheduler_instance is None:
+        with _scheduler_lock:
+            if _scheduler_instance is None:
+                _scheduler_instance = LLMScheduler()
+    return _scheduler_instance
@@ -0,0 +1,91 @@
+"""
+Model Routing Module
+Maps each LLM call site to a model, generation settings and latency budget
+"""
+
+import logging
+import os
+import re
+from dataclasses import dataclass
+from typing import Iterable, Optional
+
+from .config import MODEL_ROUTES
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ModelRoute:
+    """Generation policy for one task"""
+    task: str
+    model: str
+    temperature: float
+    max_tokens: Optional[int] = None
+    latency_budget: Optional[float] = None  # Hard deadline in seconds
+    escalate_to: Optional[str] = None  # Bigger model used on parse failure / low confidence
+    min_confidence: float = 0.0
+    hedge: bool = False
+
+
+_FIELD_TYPES = {
+    "model": str,
+    "temperature": float,
+    "max_tokens": int,
+    "latency_budget": float,
+    "escalate_to": str,
+    "min_confidence": float,
+    "hedge": lambda raw: raw.lower() == "true",
+}
+
+
+def _env_override(task: str, field: str, default):
+    """Read LLM_ROUTE_<TASK>_<FIELD> from the environment if set"""
+    raw = os.getenv(f"LLM_ROUTE_{task.upper()}_{field.upper()}")
+    if raw is None:
+        return default
+    if raw.lower() in ("", "none"):
+        return None
+    return _FIELD_TYPES[field](raw)
+
+
+def get_route(task: str) -> ModelRoute:
+    """
+    Get the routing policy for a task
+
+    Args:
+        task: Task name from MODEL_ROUTES (e.g. "classification", "explanation")
+
+    Returns:
+        ModelRoute with environment overrides applied
+    """
+    if task not in MODEL_ROUTES:
+        raise ValueError(f"Unknown LLM task '{task}'. Known tasks: {', '.join(MODEL_ROUTES)}")
+
+    settings = {
+        field: _env_override(task, field, value)
+        for field, value in MODEL_ROUTES[task].items()
+    }
+    return ModelRoute(task=task, **settings)
+
+
+def label_confidence(response: str, labels: Iterable[str]) -> Optional[float]:
+    """
+    Confidence that a classifier response names exactly one expected label
+
+    Args:
+        response: Raw LLM response
+        labels: Accepted labels, e.g. ("LEGAL", "NON_LEGAL")
+
+    Returns:
+        1.0 for a bare label, 0.7 for a label inside extra text,
+        0.3 when several labels appear, None when no label is found
+    """
+    text = response.strip().upper().replace("-", "_")
+    tokens = set(re.findall(r"[A-Z_]+", text))
+    found = [label for label in labels if label in tokens]
+
+    if not found:
+        return None
+    if len(found) > 1:
+        return 0.3
+    return 1.0 if text.strip('"\'. ') == found[0] else 0.7
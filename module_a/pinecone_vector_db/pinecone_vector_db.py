@@ -344,6 +344,7 @@ class PineconeLegalVectorDB:
         query_embedding: List[float],
         n_results: int = DEFAULT_RETRIEVAL_K,
         where: Optional[Dict] = None,
+        include_values: bool = False,
     ) -> Dict[str, Any]:
         """
         Query with pre-computed embedding
@@ -352,9 +353,11 @@ class PineconeLegalVectorDB:
             query_embedding: Query embedding vector
             n_results: Number of results to return
             where: Optional metadata filter (Pinecone filter syntax)
+            include_values: Also return the stored chunk embeddings
             
         Returns:
             Dict with 'ids', 'documents', 'metadatas', 'distances' (actually scores!)
+            and, with include_values, 'embeddings'
         """
         logger.info(f"🔍 QUERYING PINECONE - Index: {self.index_name}, Top K: {n_results}")
 
@@ -363,7 +366,8 @@ class PineconeLegalVectorDB:
             query_params = {
                 "vector": query_embedding,
                 "top_k": n_results,
-                "include_metadata": True
+                "include_metadata": True,
+                "include_values": include_values
             }
             if where:
                 query_params["filter"] = where
@@ -378,7 +382,8 @@ class PineconeLegalVectorDB:
                     "ids": [[]],
                     "documents": [[]],
                     "metadatas": [[]],
-                    "distances": [[]]  # Actually similarity scores!
+                    "distances": [[]],  # Actually similarity scores!
+                    "embeddings": [[]]
                 }
             
             # CRITICAL FIX: Retrieve full text from storage, not metadata
@@ -396,6 +401,8 @@ class PineconeLegalVectorDB:
                 # CRITICAL: These are SIMILARITY SCORES (0-1, higher=better), not distances!
                 "distances": [[match["score"] for match in matches]],
             }
+            if include_values:
+                formatted_results["embeddings"] = [[match["values"] for match in matches]]
 
             logger.info(
                 f"✅ PINECONE QUERY SUCCESS - Retrieved {len(matches)} results, "
@@ -0,0 +1,142 @@
+"""
+Prompt Compression Module
+Cuts retrieved chunks down to the sentences most relevant to the query before prompting
+"""
+
+import logging
+import re
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .config import (
+    COMPILED_SECTION_PATTERNS,
+    PROMPT_COMPRESSION_RATIO,
+    PROMPT_COMPRESSION_MAX_WORDS,
+)
+
+logger = logging.getLogger(__name__)
+
+_SENTENCE_SPLIT = re.compile(r'(?<=[.!?।;])\s+')
+_MAX_HEADER_WORDS = 20  # Longer first lines keep only the part up to the title colon
+_GAP = "..."  # Marks sentences dropped between two kept ones
+
+
+def split_chunk(text: str) -> Tuple[Optional[str], List[str]]:
+    """
+    Split a chunk into its article header (if any) and body sentences
+
+    Args:
+        text: Chunk text
+
+    Returns:
+        Tuple of (header line or None, list of sentences)
+    """
+    lines = [line.strip() for line in text.strip().split('\n') if line.strip()]
+    header = None
+
+    if lines and any(pattern.search(lines[0]) for pattern in COMPILED_SECTION_PATTERNS):
+        first = lines.pop(0)
+        if len(first.split()) <= _MAX_HEADER_WORDS:
+            header = first
+        else:
+            # "11. Right to citizenship: (1) Every ..." -> header up to the colon
+            title, sep, rest = first.partition(':')
+            if sep and len(title.split()) <= _MAX_HEADER_WORDS:
+                header = title + sep
+                lines.insert(0, rest.strip())
+            else:
+                lines.insert(0, first)
+
+    body = ' '.join(lines)
+    sentences = [s for s in _SENTENCE_SPLIT.split(body) if s.strip()]
+    return header, sentences
+
+
+def compress_chunks(
+    query_embedding: np.ndarray,
+    context_chunks: List[Dict[str, Any]],
+    embedder,
+    ratio: float = PROMPT_COMPRESSION_RATIO,
+    max_words: Optional[int] = PROMPT_COMPRESSION_MAX_WORDS,
+) -> List[Dict[str, Any]]:
+    """
+    Keep only the sentences of each chunk that are closest to the query
+
+    All sentences are embedded in one batch and ranked by cosine similarity
+    to the query. Every chunk keeps its header and its best sentence so each
+    source stays citable; the remaining budget goes to the best sentences
+    overall. Chunk order, ids and metadata are unchanged.
+
+    Args:
+        query_embedding: Embedding of the query
+        context_chunks: Retrieved chunk dictionaries
+        embedder: EmbeddingGenerator used for the sentence batch
+        ratio: Share of the original context words to keep
+        max_words: Optional hard cap on kept words
+
+    Returns:
+        New chunk dictionaries with compressed 'text'
+    """
+    total_words = sum(len(chunk['text'].split()) for chunk in context_chunks)
+    budget = int(total_words * ratio)
+    if max_words:
+        budget = min(budget, max_words)
+
+    parsed = [split_chunk(chunk['text']) for chunk in context_chunks]
+    sentences = [
+        (chunk_index, sentence)
+        for chunk_index, (_, chunk_sentences) in enumerate(parsed)
+        for sentence in chunk_sentences
+    ]
+    if not sentences or budget >= total_words:
+        return context_chunks
+
+    vectors = np.asarray(embedder.generate_embeddings_batch(
+        [sentence for _, sentence in sentences], show_progress=False
+    ), dtype=np.float32)
+    query = np.asarray(query_embedding, dtype=np.float32)
+    scores = vectors @ query / np.maximum(np.linalg.norm(vectors, axis=1) * np.linalg.norm(query), 1e-12)
+    order = np.argsort(-scores)
+
+    kept = set()
+    used = sum(len(header.split()) for header, _ in parsed if header)
+
+    def keep(index: int) -> None:
+        nonlocal used
+        kept.add(index)
+        used += len(sentences[index][1].split())
+
+    # Best sentence of every chunk first
+    best_of_chunk = {}
+    for index in order:
+        best_of_chunk.setdefault(sentences[index][0], index)
+    for index in best_of_chunk.values():
+        keep(index)
+
+    for index in order:
+        if index not in kept and used + len(sentences[index][1].split()) <= budget:
+            keep(index)
+
+    # Rebuild each chunk from its header and kept sentences in original order
+    pieces: Dict[int, List[str]] = {i: [] for i in range(len(context_chunks))}
+    previous: Dict[int, int] = {}
+    for index, (chunk_index, sentence) in enumerate(sentences):
+        if index not in kept:
+            continue
+        if chunk_index in previous and previous[chunk_index] != index - 1:
+            sentence = f"{_GAP} {sentence}"
+        pieces[chunk_index].append(sentence)
+        previous[chunk_index] = index
+
+    compressed = []
+    for chunk_index, chunk in enumerate(context_chunks):
+        header, _ = parsed[chunk_index]
+        body = ' '.join(pieces[chunk_index])
+        if not body:
+            compressed.append(chunk)
+            continue
+        compressed.append({**chunk, 'text': f"{header}\n{body}" if header else body})
+
+    logger.info(f"Compressed retrieved context from {total_words} to {used} words")
+    return compressed
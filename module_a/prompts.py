@@ -2,6 +2,8 @@
 Prompt templates for Legal Explanation RAG
 """
 
+import re
+
 # System prompt to set the persona and constraints
 LEGAL_SYSTEM_PROMPT = """You are an expert legal assistant for the "Nepal Justice Weaver" platform. 
 Your goal is to explain complex Nepali laws in simple, plain language that anyone can understand.
@@ -65,3 +67,60 @@ def format_rag_prompt(query: str, context_chunks: list) -> str:
         context=context_str,
         query=query
     )
+
+
+def format_extractive_fallback(query: str, context_chunks: list, max_points: int = 3) -> str:
+    """
+    Build an explanation directly from retrieved chunks, without the LLM.
+    Used when generation misses its deadline. Follows the same section
+    structure as LEGAL_SYSTEM_PROMPT so the response parser still works.
+    
+    Args:
+        query: User's question
+        context_chunks: List of retrieved chunk dictionaries
+        max_points: Maximum number of chunks to quote
+        
+    Returns:
+        Markdown-formatted explanation string
+    """
+    def lead_sentences(text: str, max_words: int) -> str:
+        """Leading sentences of a chunk, up to roughly max_words"""
+        sentences = re.split(r'(?<=[.!?।])\s+', ' '.join(text.split()))
+        selected, words = [], 0
+        for sentence in sentences:
+            if selected and words + len(sentence.split()) > max_words:
+                break
+            selected.append(sentence)
+            words += len(sentence.split())
+        return ' '.join(selected)
+    
+    if not context_chunks:
+        return (
+            "**Summary**\n"
+            "I could not generate a full explanation in time and found no matching law for your question.\n\n"
+            "**Next Steps**\n"
+            "Please try asking again in a moment."
+        )
+    
+    top = context_chunks[0]
+    top_source = top['metadata'].get('source_file', 'Unknown Source')
+    top_section = top['metadata'].get('article_section', 'Unknown Section')
+    
+    points = []
+    for chunk in context_chunks[:max_points]:
+        source = chunk['metadata'].get('source_file', 'Unknown Source')
+        section = chunk['metadata'].get('article_section', 'Unknown Section')
+        points.append(f"- {section} ({source}): {lead_sentences(chunk['text'], 30)}")
+    
+    return (
+        "**Summary**\n"
+        "A detailed explanation is taking longer than expected, so here are the legal provisions "
+        f"most relevant to your question: \"{query}\"\n\n"
+        "**Key Legal Point**\n"
+        f"\"{lead_sentences(top['text'], 60)}\" ({top_section}, {top_source})\n\n"
+        "**Explanation**\n"
+        + "\n".join(points) + "\n\n"
+        "**Next Steps**\n"
+        "Review the provisions above, and ask again in a moment for a plain-language explanation."
+    )
+
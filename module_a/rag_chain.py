@@ -8,8 +8,12 @@ from typing import Dict, Any, List, Optional
 
 from .embeddings import EmbeddingGenerator
 from .llm_client import MistralClient
-from .prompts import format_rag_prompt, LEGAL_SYSTEM_PROMPT
-from .config import DEFAULT_RETRIEVAL_K, PINECONE_API_KEY
+from .llm_hedging import LLMDeadlineExceeded
+from .prompts import format_rag_prompt, format_extractive_fallback, LEGAL_SYSTEM_PROMPT
+from .config import DEFAULT_RETRIEVAL_K, PINECONE_API_KEY, PROMPT_COMPRESSION_ENABLED
+from .prompt_compression import compress_chunks
+from .retrieval_cache import conversation_retrieval_cache
+from .single_flight import SingleFlight, normalize_key
 
 # Import Pinecone - required for RAG chain
 try:
@@ -32,6 +36,9 @@ def _setup_rag_logging():
 
 _setup_rag_logging()
 
+# Identical questions arriving together share one retrieval + generation run
+rag_flight = SingleFlight("rag_chain")
+
 
 class LegalRAGChain:
     """
@@ -101,56 +108,130 @@ class LegalRAGChain:
     def run(
         self, 
         query: str, 
-        k: int = DEFAULT_RETRIEVAL_K
+        k: int = DEFAULT_RETRIEVAL_K,
+        conversation_id: Optional[str] = None,
+        follow_up: bool = False
     ) -> Dict[str, Any]:
         """
         Run the full RAG pipeline
         
+        Concurrent calls with the same normalized query are coalesced
+        into a single pipeline run.
+        
         Args:
             query: User's question
             k: Number of chunks to retrieve
+            conversation_id: Conversation this turn belongs to; the chunks
+                used are remembered for its next turn
+            follow_up: The query depends on the previous turn, so the
+                conversation's cached chunks are tried before the index
             
         Returns:
             Dictionary with 'query', 'explanation', and 'sources'
         """
-        logger.info(f"Processing query: {query}")
+        reuse_from = conversation_id if follow_up else None
+        result = dict(rag_flight.do(normalize_key(query, k, reuse_from), self._run, query, k, reuse_from))
         
-        # Step 1: Retrieve relevant chunks
-        logger.info("Step 1: Retrieving relevant laws...")
-        query_embedding = self.embedder.generate_embedding(query)
+        retrieved_chunks = result.pop('retrieved_chunks', [])
+        if conversation_id:
+            conversation_retrieval_cache.put(conversation_id, retrieved_chunks)
+        
+        result['query'] = query
+        return result
+    
+    def _retrieve(self, query_embedding, k: int, reuse_from: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Retrieve the top-k chunks for a query embedding
+        
+        Args:
+            query_embedding: Embedding of the query
+            k: Number of chunks to retrieve
+            reuse_from: Conversation whose previous-turn chunks are scored first
+            
+        Returns:
+            List of chunk dicts with 'id', 'text', 'metadata', 'distance' and 'embedding'
+        """
+        reused = []
+        if reuse_from:
+            reused, covered = conversation_retrieval_cache.match(reuse_from, query_embedding, k)
+            if covered:
+                logger.info(f"Follow-up answered from {len(reused)} chunks of the previous turn")
+                return reused
+        
+        # A partial hit still costs a full top-k query: chunk ids are not in the
+        # index metadata, so cached chunks cannot be filtered out, and any of them
+        # may rank among the top k
         retrieval_results = self.vector_db.query_with_embedding(
             query_embedding.tolist(), 
-            n_results=k
+            n_results=k,
+            include_values=True
         )
         
         # Process retrieval results into a clean list
         context_chunks = []
         if retrieval_results['documents'][0]:
-            for doc, metadata, distance in zip(
+            for chunk_id, doc, metadata, distance, embedding in zip(
+                retrieval_results['ids'][0],
                 retrieval_results['documents'][0],
                 retrieval_results['metadatas'][0],
-                retrieval_results['distances'][0]
+                retrieval_results['distances'][0],
+                retrieval_results['embeddings'][0]
             ):
                 context_chunks.append({
+                    'id': chunk_id,
                     'text': doc,
                     'metadata': metadata,
-                    'distance': distance
+                    'distance': distance,
+                    'embedding': embedding
                 })
         
+        if reused:
+            # Keep the cached chunks that still match and fill up with new ones
+            cached_ids = {chunk['id'] for chunk in reused}
+            fetched = [chunk for chunk in context_chunks if chunk['id'] not in cached_ids]
+            context_chunks = sorted(reused + fetched, key=lambda c: c['distance'], reverse=True)[:k]
+            logger.info(f"Follow-up reused {len(reused)} cached chunks, fetched {len(fetched)} from the index")
+        
+        return context_chunks
+    
+    def _run(self, query: str, k: int, reuse_from: Optional[str] = None) -> Dict[str, Any]:
+        """Execute retrieval and generation for a query"""
+        logger.info(f"Processing query: {query}")
+        
+        # Step 1: Retrieve relevant chunks
+        logger.info("Step 1: Retrieving relevant laws...")
+        query_embedding = self.embedder.generate_embedding(query)
+        context_chunks = self._retrieve(query_embedding, k, reuse_from)
+        
         logger.info(f"Retrieved {len(context_chunks)} relevant chunks")
         
         # Step 2: Generate explanation
         logger.info("Step 2: Generating explanation...")
         
+        # Keep only the most relevant sentences of each chunk (same order and ids)
+        prompt_chunks = context_chunks
+        if PROMPT_COMPRESSION_ENABLED and context_chunks:
+            try:
+                prompt_chunks = compress_chunks(query_embedding, context_chunks, self.embedder)
+            except Exception as e:
+                logger.warning(f"Prompt compression failed, sending full chunks: {e}")
+        
         # Format prompt
-        prompt = format_rag_prompt(query, context_chunks)
+        prompt = format_rag_prompt(query, prompt_chunks)
         
-        # Call LLM
+        # Call LLM (the explanation route is hedged and has a hard latency budget)
+        is_fallback = False
         try:
-            explanation = self.llm.generate_response(
+            explanation = self.llm.generate_for_task(
+                "explanation",
                 prompt=prompt,
-                system_prompt=LEGAL_SYSTEM_PROMPT
+                system_prompt=LEGAL_SYSTEM_PROMPT,
+                call_site="rag.explanation"
             )
+        except LLMDeadlineExceeded as e:
+            logger.warning(f"{e}; returning extractive answer from retrieved chunks")
+            explanation = format_extractive_fallback(query, context_chunks)
+            is_fallback = True
         except Exception as e:
             logger.error(f"Generation failed: {e}")
             explanation = "I apologize, but I encountered an error while generating the explanation. Please try again later."
@@ -171,6 +252,7 @@ class LegalRAGChain:
 
             # Create source entry
             source_entry = {
+                'chunk_id': chunk.get('id'),
                 'file': source_file,
                 'section': article_section or f"Section {i+1}",
                 'relevance_score': 1.0 - chunk['distance']  # Approx score
@@ -180,7 +262,9 @@ class LegalRAGChain:
         result = {
             'query': query,
             'explanation': explanation,
-            'sources': sources
+            'sources': sources,
+            'is_fallback': is_fallback,
+            'retrieved_chunks': context_chunks
         }
 
         logger.info(f"Returning {len(sources)} sources")
@@ -0,0 +1,156 @@
+"""
+Conversation Retrieval Cache Module
+Remembers the chunks retrieved on a conversation's previous turn so dependent
+follow-ups can be answered from them without a fresh index query.
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+from .config import (
+    RETRIEVAL_REUSE_MIN_SCORE,
+    RETRIEVAL_CACHE_MAX_CONVERSATIONS,
+    RETRIEVAL_CACHE_TTL_SECONDS,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+class _Entry:
+    """Chunks from one conversation's latest turn"""
+
+    def __init__(self, chunks: List[Dict[str, Any]], embeddings: np.ndarray):
+        self.chunks = chunks
+        self.embeddings = _normalize(embeddings.astype(np.float32))
+        self.stored_at = time.time()
+
+
+class ConversationRetrievalCache:
+    """
+    Per-conversation cache of retrieved chunks and their embeddings.
+
+    A follow-up query is scored against the cached chunks (cosine
+    similarity, same metric as the Pinecone index). Chunks at or above
+    `min_score` are reused; the index is only queried when fewer than
+    k chunks qualify.
+    """
+
+    def __init__(
+        self,
+        min_score: float = RETRIEVAL_REUSE_MIN_SCORE,
+        max_conversations: int = RETRIEVAL_CACHE_MAX_CONVERSATIONS,
+        ttl_seconds: int = RETRIEVAL_CACHE_TTL_SECONDS,
+    ):
+        """
+        Initialize the cache
+
+        Args:
+            min_score: Minimum cosine similarity for a cached chunk to be reused
+            max_conversations: Conversations kept before the least recent is evicted
+            ttl_seconds: Age after which a conversation's chunks are ignored
+        """
+        self.min_score = min_score
+        self.max_conversations = max_conversations
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"full_hits": 0, "partial_hits": 0, "misses": 0}
+
+    def put(self, conversation_id: str, chunks: List[Dict[str, Any]]) -> None:
+        """
+        Remember the chunks used for a conversation's latest turn
+
+        Args:
+            conversation_id: Conversation the chunks belong to
+            chunks: Chunk dicts with 'id', 'text', 'metadata', 'distance' and 'embedding'
+        """
+        chunks = [c for c in chunks if c.get("embedding") is not None]
+        if not chunks:
+            return
+
+        embeddings = np.asarray([c["embedding"] for c in chunks])
+        stored = [{k: v for k, v in c.items() if k != "embedding"} for c in chunks]
+
+        with self._lock:
+            self._entries[conversation_id] = _Entry(stored, embeddings)
+            self._entries.move_to_end(conversation_id)
+            while len(self._entries) > self.max_conversations:
+                self._entries.popitem(last=False)
+
+    def match(
+        self,
+        conversation_id: str,
+        query_embedding: np.ndarray,
+        k: int,
+    ) -> Tuple[List[Dict[str, Any]], bool]:
+        """
+        Score a follow-up query against the conversation's cached chunks
+
+        Args:
+            conversation_id: Conversation to look up
+            query_embedding: Embedding of the (rewritten) follow-up query
+            k: Number of chunks the caller needs
+
+        Returns:
+            Tuple of (reusable chunks sorted by score with 'distance' set to the
+            new similarity, True if they fully cover the request)
+        """
+        with self._lock:
+            entry = self._entries.get(conversation_id)
+            if entry is not None and time.time() - entry.stored_at > self.ttl_seconds:
+                del self._entries[conversation_id]
+                entry = None
+
+        if entry is None:
+            self._bump("misses")
+            return [], False
+
+        query = _normalize(np.asarray(query_embedding, dtype=np.float32))
+        scores = entry.embeddings @ query
+
+        order = np.argsort(-scores)
+        reusable = []
+        for i in order[:k]:
+            if scores[i] < self.min_score:
+                break
+            chunk = dict(entry.chunks[i])
+            chunk["distance"] = float(scores[i])  # Similarity score, as returned by Pinecone
+            chunk["embedding"] = entry.embeddings[i]
+            reusable.append(chunk)
+
+        # Reusing every chunk that cleared the bar is enough even if the
+        # previous turn retrieved fewer than k
+        covered = bool(reusable) and len(reusable) >= min(k, len(entry.chunks))
+        self._bump("full_hits" if covered else "partial_hits" if reusable else "misses")
+        return reusable, covered
+
+    def forget(self, conversation_id: str) -> None:
+        """Drop a conversation's cached chunks"""
+        with self._lock:
+            self._entries.pop(conversation_id, None)
+
+    def _bump(self, field: str) -> None:
+        with self._lock:
+            self._stats[field] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get reuse counters"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["conversations"] = len(self._entries)
+        lookups = stats["full_hits"] + stats["partial_hits"] + stats["misses"]
+        stats["full_hit_rate"] = round(stats["full_hits"] / lookups, 4) if lookups else 0.0
+        return stats
+
+
+conversation_retrieval_cache = ConversationRetrievalCache()
@@ -0,0 +1,119 @@
+"""
+Single-Flight Module
+Coalesces identical in-flight requests so concurrent callers share one computation
+"""
+
+import copy
+import logging
+import re
+import threading
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_key(*parts: Any) -> str:
+    """
+    Build a coalescing key from request parts
+
+    Text is lowercased, whitespace is collapsed and trailing punctuation
+    is dropped, so "What is Article 11?" and "what is article 11" match.
+    """
+    normalized = []
+    for part in parts:
+        text = "" if part is None else str(part)
+        text = re.sub(r"\s+", " ", text).strip().lower()
+        normalized.append(text.rstrip(" ?.!।"))
+    return "|".join(normalized)
+
+
+class _Call:
+    """State of one in-flight computation"""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.followers = 0
+
+
+class SingleFlight:
+    """
+    Thread-safe request coalescing group.
+
+    The first caller for a key (the leader) runs the function; callers that
+    arrive while it is running wait for and share its result. If the leader
+    fails, waiting followers retry once under a new leader instead of all
+    inheriting the failure.
+    """
+
+    def __init__(self, name: str, max_retries: int = 1):
+        """
+        Initialize a coalescing group
+
+        Args:
+            name: Group name (for logs and stats)
+            max_retries: How many times a follower re-attempts after a failed leader
+        """
+        self.name = name
+        self.max_retries = max_retries
+        self._calls: Dict[str, _Call] = {}
+        self._lock = threading.Lock()
+        self._stats = {"leaders": 0, "coalesced": 0, "leader_failures": 0}
+
+    def do(self, key: str, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        """
+        Run fn(*args, **kwargs), or wait for an identical in-flight call
+
+        Args:
+            key: Coalescing key (see normalize_key)
+            fn: Function to execute
+
+        Returns:
+            The function result (followers receive a deep copy)
+        """
+        attempts = 0
+        while True:
+            with self._lock:
+                call = self._calls.get(key)
+                is_leader = call is None
+                if is_leader:
+                    call = _Call()
+                    self._calls[key] = call
+                    self._stats["leaders"] += 1
+                else:
+                    call.followers += 1
+                    self._stats["coalesced"] += 1
+
+            if is_leader:
+                return self._lead(key, call, fn, *args, **kwargs)
+
+            call.done.wait()
+            if call.error is None:
+                return copy.deepcopy(call.result)
+
+            if attempts >= self.max_retries:
+                raise call.error
+            attempts += 1
+            logger.info(f"[{self.name}] Leader failed for key, retrying as follower ({attempts})")
+
+    def _lead(self, key: str, call: _Call, fn: Callable[..., Any], *args, **kwargs) -> Any:
+        try:
+            call.result = fn(*args, **kwargs)
+            return call.result
+        except BaseException as e:
+            call.error = e
+            with self._lock:
+                self._stats["leader_failures"] += 1
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+                if call.followers:
+                    logger.info(f"[{self.name}] Shared one result with {call.followers} waiting callers")
+            call.done.set()
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get coalescing counters for this group"""
+        with self._lock:
+            return {**self._stats, "in_flight": len(self._calls)}
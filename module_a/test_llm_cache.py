@@ -0,0 +1,95 @@
+"""
+Test suite for the LLM response cache
+Covers key construction, both cache tiers, TTL and hit-rate metrics
+"""
+
+import time
+import pytest
+
+from module_a.llm_cache import LLMResponseCache
+
+
+class TestLLMResponseCache:
+    """Test cases for LLMResponseCache"""
+
+    @pytest.fixture
+    def cache(self, tmp_path):
+        """Create a cache backed by a temporary SQLite file"""
+        return LLMResponseCache(db_path=tmp_path / "llm_cache.sqlite3", memory_size=2)
+
+    def test_key_depends_on_every_field(self, cache):
+        """Model, system prompt, prompt and temperature all change the key"""
+        base = cache.make_key("mistral-tiny", "sys", "prompt", 0.1)
+        assert base == cache.make_key("mistral-tiny", "sys", "prompt", 0.1)
+        assert base != cache.make_key("mistral-small-latest", "sys", "prompt", 0.1)
+        assert base != cache.make_key("mistral-tiny", "sys v2", "prompt", 0.1)
+        assert base != cache.make_key("mistral-tiny", "sys", "other", 0.1)
+        assert base != cache.make_key("mistral-tiny", "sys", "prompt", 0.0)
+
+    def test_only_low_temperature_is_cacheable(self, cache):
+        """High-temperature calls bypass the cache"""
+        assert cache.is_cacheable(0.0)
+        assert cache.is_cacheable(0.1)
+        assert not cache.is_cacheable(0.7)
+
+    def test_memory_and_disk_hits(self, cache):
+        """Entries evicted from memory are still served from disk"""
+        keys = [cache.make_key("m", None, f"p{i}", 0.0) for i in range(3)]
+        for i, key in enumerate(keys):
+            cache.set(key, f"r{i}", call_site="test")
+
+        assert cache.get(keys[2], call_site="test") == "r2"
+        assert cache.get(keys[0], call_site="test") == "r0"  # Evicted from LRU, read from disk
+
+        stats = cache.get_stats()["call_sites"]["test"]
+        assert stats["memory_hits"] == 1
+        assert stats["disk_hits"] == 1
+
+    def test_shared_disk_tier(self, tmp_path):
+        """A second cache instance (another worker) sees stored entries"""
+        db_path = tmp_path / "shared.sqlite3"
+        first = LLMResponseCache(db_path=db_path)
+        second = LLMResponseCache(db_path=db_path)
+
+        key = first.make_key("m", "sys", "prompt", 0.0)
+        first.set(key, "LEGAL")
+        assert second.get(key) == "LEGAL"
+
+    def test_ttl_expiry(self, tmp_path):
+        """Expired entries are treated as misses"""
+        cache = LLMResponseCache(db_path=tmp_path / "ttl.sqlite3", ttl_seconds=0)
+        key = cache.make_key("m", None, "prompt", 0.0)
+        cache.set(key, "stale")
+        time.sleep(0.01)
+        assert cache.get(key) is None
+
+    def test_disk_hit_keeps_its_expiry(self, tmp_path):
+        """Promoting a disk entry to memory does not restart its TTL"""
+        db_path = tmp_path / "promote.sqlite3"
+        writer = LLMResponseCache(db_path=db_path, ttl_seconds=60)
+        key = writer.make_key("m", None, "prompt", 0.0)
+        writer.set(key, "answer")
+
+        reader = LLMResponseCache(db_path=db_path, ttl_seconds=60)
+        assert reader.get(key) == "answer"
+        assert reader._memory[key][1] == writer._memory[key][1]
+
+    def test_purge_prompt_version(self, cache):
+        """Purging a system prompt removes only its entries"""
+        old = cache.make_key("m", "old prompt", "q", 0.0)
+        new = cache.make_key("m", "new prompt", "q", 0.0)
+        cache.set(old, "a", system_prompt="old prompt")
+        cache.set(new, "b", system_prompt="new prompt")
+
+        assert cache.purge_prompt_version("old prompt") == 1
+        assert cache.get(old) is None
+        assert cache.get(new) == "b"
+
+    def test_hit_rate(self, cache):
+        """Hit rate is reported per call site"""
+        key = cache.make_key("m", None, "prompt", 0.0)
+        assert cache.get(key, call_site="site") is None
+        cache.set(key, "x", call_site="site")
+        assert cache.get(key, call_site="site") == "x"
+
+        assert cache.get_stats()["call_sites"]["site"]["hit_rate"] == 0.5
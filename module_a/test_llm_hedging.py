@@ -0,0 +1,106 @@
+"""
+Test suite for hedged LLM requests
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from module_a import llm_hedging
+from module_a.llm_hedging import run_hedged, LatencyTracker, LLMDeadlineExceeded
+from module_a.llm_scheduler import LLMScheduler
+
+
+def _after(seconds, value):
+    def call(attempt):
+        attempt.mark_sent()
+        time.sleep(seconds)
+        return value
+    return call
+
+
+def _failing(attempt):
+    raise RuntimeError("boom")
+
+
+def test_fast_primary_does_not_hedge():
+    """A primary that beats the hedge delay wins on its own"""
+    assert run_hedged(_after(0.01, "primary"), _after(0.01, "hedge"), hedge_delay=0.5) == ("primary", False)
+
+
+def test_slow_primary_is_hedged():
+    """A slow primary loses to a hedge fired after the delay"""
+    started = time.monotonic()
+    result = run_hedged(_after(1.0, "primary"), _after(0.05, "hedge"), hedge_delay=0.1)
+    assert result == ("hedge", True)
+    assert time.monotonic() - started < 0.5
+
+
+def test_failed_primary_fires_hedge_immediately():
+    """A failing primary triggers the hedge without waiting for the delay"""
+    started = time.monotonic()
+    assert run_hedged(_failing, _after(0.01, "hedge"), hedge_delay=5.0) == ("hedge", True)
+    assert time.monotonic() - started < 1.0
+
+
+def test_error_without_hedge_propagates():
+    """With hedging disabled the primary's error is raised"""
+    with pytest.raises(RuntimeError):
+        run_hedged(_failing, None, hedge_delay=0.1)
+
+
+def test_deadline():
+    """Nothing finishing before the deadline raises LLMDeadlineExceeded"""
+    started = time.monotonic()
+    with pytest.raises(LLMDeadlineExceeded):
+        run_hedged(_after(1.0, "primary"), _after(1.0, "hedge"), hedge_delay=0.05, deadline=0.2)
+    assert time.monotonic() - started < 0.5
+
+
+def test_waiting_for_a_thread_counts_against_the_deadline(monkeypatch):
+    """A busy executor cannot stretch the deadline"""
+    executor = ThreadPoolExecutor(max_workers=1)
+    monkeypatch.setattr(llm_hedging, "_executor", executor)
+    executor.submit(time.sleep, 0.5)
+
+    started = time.monotonic()
+    with pytest.raises(LLMDeadlineExceeded):
+        run_hedged(_after(0.01, "primary"), None, hedge_delay=1.0, deadline=0.2)
+    assert time.monotonic() - started < 0.4
+    executor.shutdown()
+
+
+def test_primary_queued_for_a_scheduler_slot_is_not_hedged_and_is_cancelled():
+    """Queue time is not a slow primary; the queued ticket is withdrawn at the deadline"""
+    scheduler = LLMScheduler(max_concurrency=1, requests_per_second=100)
+    held = scheduler.acquire("interactive")  # Congested: the only slot is taken
+    hedges = []
+
+    def primary(attempt):
+        with scheduler.slot("interactive", on_queued=lambda ticket: attempt.on_cancel(lambda: scheduler.cancel(ticket))):
+            attempt.mark_sent()
+            return "primary"
+
+    def hedge(attempt):
+        hedges.append(attempt)
+        return "hedge"
+
+    with pytest.raises(LLMDeadlineExceeded):
+        run_hedged(primary, hedge, hedge_delay=0.05, deadline=0.3)
+
+    time.sleep(0.05)
+    assert hedges == []
+    assert scheduler.get_stats()["classes"]["interactive"]["cancelled"] == 1
+    scheduler.release(held)
+    assert scheduler.get_stats()["in_flight"] == 0
+
+
+def test_hedge_delay_uses_percentile():
+    """The hedge delay follows observed latency once enough samples exist"""
+    tracker = LatencyTracker()
+    default = tracker.hedge_delay("m")
+    for i in range(100):
+        tracker.record("m", 10.0 + i / 100)
+    assert tracker.hedge_delay("m") != default
+    assert 10.0 <= tracker.hedge_delay("m") <= 11.0
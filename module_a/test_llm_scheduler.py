@@ -0,0 +1,96 @@
+"""
+Test suite for the LLM scheduler
+Covers concurrency limits, rate limits, priority ordering and wait metrics
+"""
+
+import threading
+import time
+import pytest
+
+from module_a.llm_scheduler import LLMScheduler, estimate_tokens
+
+
+def test_estimate_tokens():
+    """Estimate uses the 1.3 tokens/word heuristic plus the completion reserve"""
+    assert estimate_tokens("one two three", None, completion_tokens=0) == 3
+    assert estimate_tokens("", completion_tokens=100) == 100
+
+
+def test_max_concurrency():
+    """No more than max_concurrency callers hold a slot at once"""
+    scheduler = LLMScheduler(max_concurrency=2, requests_per_second=1000, tokens_per_minute=10**9)
+    active = []
+    peak = []
+    lock = threading.Lock()
+
+    def worker():
+        with scheduler.slot("interactive", 1):
+            with lock:
+                active.append(1)
+                peak.append(len(active))
+            time.sleep(0.05)
+            with lock:
+                active.pop()
+
+    threads = [threading.Thread(target=worker) for _ in range(6)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert max(peak) == 2
+
+
+def test_priority_order():
+    """Queued interactive work is served before queued bulk work"""
+    scheduler = LLMScheduler(
+        max_concurrency=1,
+        requests_per_second=1000,
+        tokens_per_minute=10**9,
+        priority_weights={"interactive": 100, "review": 10, "bulk": 1},
+    )
+    order = []
+    blocker = scheduler.acquire("interactive", 1)
+
+    def worker(priority):
+        with scheduler.slot(priority, 1):
+            order.append(priority)
+
+    threads = [threading.Thread(target=worker, args=("bulk",)) for _ in range(3)]
+    threads += [threading.Thread(target=worker, args=("interactive",)) for _ in range(3)]
+    for t in threads:
+        t.start()
+        time.sleep(0.01)
+
+    scheduler.release(blocker)
+    for t in threads:
+        t.join()
+
+    assert order[:3] == ["interactive"] * 3
+
+
+def test_requests_per_second_limit():
+    """The request bucket paces calls once its burst is used"""
+    scheduler = LLMScheduler(max_concurrency=10, requests_per_second=20, tokens_per_minute=10**9)
+    start = time.monotonic()
+    for _ in range(30):
+        with scheduler.slot("bulk", 1):
+            pass
+    # 20 burst, then 10 more at 20/s
+    assert time.monotonic() - start >= 0.4
+
+
+def test_queue_timeout_and_stats():
+    """Callers time out when no slot frees up, and waits are reported"""
+    scheduler = LLMScheduler(max_concurrency=1, requests_per_second=1000,
+                             tokens_per_minute=10**9, queue_timeout=0.05)
+    held = scheduler.acquire("interactive", 1)
+
+    with pytest.raises(TimeoutError):
+        scheduler.acquire("bulk", 1)
+
+    scheduler.release(held)
+    stats = scheduler.get_stats()
+    assert stats["classes"]["bulk"]["timeouts"] == 1
+    assert stats["classes"]["interactive"]["requests"] == 1
+    assert stats["in_flight"] == 0
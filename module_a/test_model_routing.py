@@ -0,0 +1,49 @@
+"""
+Test suite for per-task model routing
+"""
+
+import pytest
+
+from module_a.config import MODEL_ROUTES, LLM_STRONG_MODEL
+from module_a.model_routing import get_route, label_confidence
+
+
+def test_every_task_has_a_route():
+    """All configured tasks resolve to a ModelRoute"""
+    for task in MODEL_ROUTES:
+        route = get_route(task)
+        assert route.task == task
+        assert route.model
+
+
+def test_explanation_uses_strong_model():
+    """The expensive model is reserved for explanations"""
+    assert get_route("explanation").model == LLM_STRONG_MODEL
+    assert get_route("classification").escalate_to == LLM_STRONG_MODEL
+
+
+def test_env_override(monkeypatch):
+    """LLM_ROUTE_<TASK>_<FIELD> overrides the configured value"""
+    monkeypatch.setenv("LLM_ROUTE_DEBIAS_MODEL", "mistral-large-latest")
+    monkeypatch.setenv("LLM_ROUTE_DEBIAS_MAX_TOKENS", "64")
+    monkeypatch.setenv("LLM_ROUTE_DEBIAS_ESCALATE_TO", "none")
+
+    route = get_route("debias")
+    assert route.model == "mistral-large-latest"
+    assert route.max_tokens == 64
+    assert route.escalate_to is None
+
+
+def test_unknown_task():
+    with pytest.raises(ValueError):
+        get_route("poetry")
+
+
+def test_label_confidence():
+    """Bare labels are confident; ambiguous or missing labels trigger escalation"""
+    labels = ("LEGAL", "NON_LEGAL")
+    assert label_confidence("NON_LEGAL", labels) == 1.0
+    assert label_confidence("non-legal", labels) == 1.0
+    assert label_confidence("The answer is LEGAL.", labels) == 0.7
+    assert label_confidence("LEGAL or NON_LEGAL", labels) == 0.3
+    assert label_confidence("I am not sure", labels) is None
@@ -0,0 +1,42 @@
+"""
+Test suite for extractive prompt compression
+"""
+
+import numpy as np
+
+from module_a.prompt_compression import compress_chunks, split_chunk
+
+
+class _KeywordEmbedder:
+    """Embeds text as keyword counts so similarity is predictable"""
+
+    VOCAB = ["citizenship", "property", "tax"]
+
+    def generate_embeddings_batch(self, texts, show_progress=True):
+        return np.array([[t.lower().count(w) + 0.01 for w in self.VOCAB] for t in texts])
+
+
+def test_split_chunk_keeps_header():
+    """The article line is separated from the body sentences"""
+    header, sentences = split_chunk("Article 11\nEvery person has rights. Some apply; others do not.")
+    assert header == "Article 11"
+    assert sentences == ["Every person has rights.", "Some apply;", "others do not."]
+
+
+def test_compression_keeps_relevant_sentences_and_ids():
+    """Relevant sentences, headers and chunk ids survive; most words are dropped"""
+    filler = " ".join(f"Property rule {i} applies to land records." for i in range(10))
+    chunks = [
+        {"id": "c1", "text": f"Article 11\nCitizenship by descent is granted. {filler}", "metadata": {}, "distance": 0.8},
+        {"id": "c2", "text": f"Article 25\n{filler} Tax is separate.", "metadata": {}, "distance": 0.6},
+    ]
+
+    compressed = compress_chunks(np.array([1.0, 0.0, 0.0]), chunks, _KeywordEmbedder(), ratio=0.3)
+
+    assert [c["id"] for c in compressed] == ["c1", "c2"]
+    assert compressed[0]["text"].startswith("Article 11\nCitizenship by descent is granted.")
+    assert compressed[1]["text"].startswith("Article 25\n")
+
+    before = sum(len(c["text"].split()) for c in chunks)
+    after = sum(len(c["text"].split()) for c in compressed)
+    assert after <= before / 2
@@ -0,0 +1,49 @@
+"""
+Test suite for the per-conversation retrieval cache
+"""
+
+import numpy as np
+
+from module_a.retrieval_cache import ConversationRetrievalCache
+
+
+def _chunk(chunk_id, vector):
+    return {"id": chunk_id, "text": chunk_id, "metadata": {}, "distance": 0.9, "embedding": np.array(vector, dtype=float)}
+
+
+def test_matching_follow_up_is_fully_covered():
+    """A follow-up close to every cached chunk needs no index query"""
+    cache = ConversationRetrievalCache(min_score=0.5)
+    cache.put("conv", [_chunk("a", [1, 0]), _chunk("b", [0.9, 0.1])])
+
+    chunks, covered = cache.match("conv", np.array([1.0, 0.05]), k=2)
+
+    assert covered
+    assert [c["id"] for c in chunks] == ["a", "b"]
+    assert "embedding" in chunks[0]
+
+
+def test_partial_and_miss():
+    """Only chunks above the threshold are reused; unknown conversations miss"""
+    cache = ConversationRetrievalCache(min_score=0.5)
+    cache.put("conv", [_chunk("a", [1, 0]), _chunk("b", [0, 1])])
+
+    chunks, covered = cache.match("conv", np.array([1.0, 0.0]), k=2)
+    assert not covered
+    assert [c["id"] for c in chunks] == ["a"]
+
+    chunks, covered = cache.match("other", np.array([1.0, 0.0]), k=2)
+    assert chunks == [] and not covered
+
+    stats = cache.get_stats()
+    assert stats["partial_hits"] == 1 and stats["misses"] == 1
+
+
+def test_expired_and_evicted_entries_are_ignored():
+    """TTL and the conversation limit bound what is kept"""
+    cache = ConversationRetrievalCache(min_score=0.5, max_conversations=1, ttl_seconds=-1)
+    cache.put("old", [_chunk("a", [1, 0])])
+    cache.put("new", [_chunk("a", [1, 0])])
+
+    assert cache.get_stats()["conversations"] == 1
+    assert cache.match("new", np.array([1.0, 0.0]), k=1) == ([], False)
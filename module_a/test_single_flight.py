@@ -0,0 +1,75 @@
+"""
+Test suite for request coalescing
+"""
+
+import threading
+import time
+
+from module_a.single_flight import SingleFlight, normalize_key
+
+
+def test_normalize_key():
+    """Case, whitespace and trailing punctuation do not change the key"""
+    assert normalize_key("What is  Article 11?", 5) == normalize_key("what is article 11", 5)
+    assert normalize_key("a", 5) != normalize_key("a", 3)
+
+
+def _run_concurrently(n, target):
+    threads = [threading.Thread(target=target) for _ in range(n)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+
+def test_concurrent_callers_share_one_call():
+    """Identical concurrent calls execute the function once"""
+    flight = SingleFlight("test")
+    calls = []
+    results = []
+
+    def slow():
+        calls.append(1)
+        time.sleep(0.1)
+        return {"answer": 42}
+
+    _run_concurrently(8, lambda: results.append(flight.do("k", slow)))
+
+    assert len(calls) == 1
+    assert results == [{"answer": 42}] * 8
+    assert flight.get_stats()["coalesced"] == 7
+
+
+def test_followers_retry_after_leader_failure():
+    """A failing leader does not propagate its error to every follower"""
+    flight = SingleFlight("test")
+    attempts = []
+    results = []
+    errors = []
+
+    def flaky():
+        attempts.append(1)
+        time.sleep(0.1)
+        if len(attempts) == 1:
+            raise RuntimeError("leader failed")
+        return "ok"
+
+    def caller():
+        try:
+            results.append(flight.do("k", flaky))
+        except RuntimeError as e:
+            errors.append(e)
+
+    _run_concurrently(5, caller)
+
+    assert len(errors) == 1  # Only the original leader sees its own failure
+    assert results == ["ok"] * 4
+    assert len(attempts) == 2
+
+
+def test_sequential_calls_are_not_cached():
+    """Coalescing only applies to in-flight calls"""
+    flight = SingleFlight("test")
+    counter = iter(range(10))
+    assert flight.do("k", lambda: next(counter)) == 0
+    assert flight.do("k", lambda: next(counter)) == 1
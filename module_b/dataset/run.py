@@ -1,5 +1,59 @@
+"""
+Synthetic Bias Dataset Generator
+Writes seeded, sharded, de-duplicated train/val/test splits of template sentences
+
+Every shard draws its rows from its own random.Random seeded with (seed, shard),
+so a run is reproducible for the same --seed, --rows and --shards no matter how
+many worker processes execute it. Shards run in a process pool and stream their
+rows to disk, so memory does not grow with --rows.
+
+With de-duplication on (the default), shards write rows into hash buckets and a
+second pass keeps the first copy of every sentence across all shards; each bucket
+holds 1/--buckets of the distinct sentences in memory. The split of a row is taken
+from the hash of its text, so a sentence never lands in two splits.
+
+Rows keep the original shape: {"text": ..., <category>: 0/1, ...}, all zeros for
+neutral sentences. Output is <output>/<split>/part-NNNNN.jsonl (or .arrow) plus
+counts.json with per-split, per-category counts.
+
+    # Run from the repository root
+    python -m module_b.dataset.run --rows 15000 --output nepali_bias_dataset
+    python -m module_b.dataset.run --rows 10000000 --no-dedup --format arrow --workers 8
+
+The templates only produce a few hundred distinct sentences, so with
+de-duplication a large --rows mostly measures how many duplicates were dropped.
+"""
+
+import argparse
+import hashlib
 import json
+import logging
 import random
+import re
+import shutil
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from math import prod
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+try:
+    import pyarrow as pa
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+OUTPUT_FORMATS = ("jsonl", "arrow")
+SPLITS = ("train", "val", "test")
+NEUTRAL_LABEL = "neutral"
+DEFAULT_ROWS = 15000
+DEFAULT_SHARDS = 16
+ARROW_BATCH_ROWS = 10000  # Rows per Arrow record batch
+_SPLIT_RESOLUTION = 10000  # Split fractions are applied in steps of 1/10000
 
 # Categories (तपाईंको spelling अनुसार)
 categories = ["gender", "religional", "caste", "religion", "appearence", "socialstatus", "amiguity", "political", "Age", "Disablity"]
@@ -112,36 +166,390 @@ fillers = {
     ]
 }
 
-def generate_sentence():
-    template, main_cat = random.choice(templates)
-    sentence = template
-    
-    # Replace placeholders
-    for key in fillers:
-        while "{" + key + "}" in sentence:
-            if key == "neutral_sentence":
-                sentence = random.choice(fillers[key])
-            else:
-                sentence = sentence.replace("{" + key + "}", random.choice(fillers[key]), 1)
-    
-    # Binary labels: only ONE category = 1, or all 0
+_PLACEHOLDER = re.compile(r"\{(\w+)\}")
+
+
+def compile_templates() -> List[Tuple[List[str], List[List[str]], Optional[str]]]:
+    """
+    Pre-split every template around its placeholders
+
+    Returns:
+        List of (literal parts, filler choices per placeholder, category);
+        there is always one more literal part than placeholders
+    """
+    compiled = []
+    for template, category in templates:
+        pieces = _PLACEHOLDER.split(template)
+        compiled.append((pieces[0::2], [fillers[slot] for slot in pieces[1::2]], category))
+    return compiled
+
+
+_COMPILED = compile_templates()
+
+
+def template_space() -> int:
+    """Number of distinct sentences the templates can produce"""
+    unique = {tuple(literals): choices for literals, choices, _ in _COMPILED}
+    return sum(prod(len(options) for options in choices) for choices in unique.values())
+
+
+def labels_for(category: Optional[str]) -> Dict[str, int]:
+    """Binary labels: only ONE category = 1, or all 0 for neutral"""
     labels = {cat: 0 for cat in categories}
-    
-    if main_cat is not None:
-        labels[main_cat] = 1   # Strictly single label
-    # If main_cat is None → neutral (all 0)
-    
-    return {"text": sentence, **labels}
-
-# Generate 15,000 samples
-dataset = [generate_sentence() for _ in range(15000)]
-
-# Save to JSON file
-with open("nepali_binary_bias_dataset_15k.json", "w", encoding="utf-8") as f:
-    json.dump(dataset, f, ensure_ascii=False, indent=2)
-
-print("✅ सफलतापूर्वक १५,००० entries भएको BINARY classification dataset generate भयो!")
-print("फाइल नाम: nepali_binary_bias_dataset_15k.json")
-print("\nउदाहरण (पहिलो ३ entries):")
-for i in range(3):
-    print(json.dumps(dataset[i], ensure_ascii=False, indent=2))
\ No newline at end of file
+    if category is not None:
+        labels[category] = 1
+    return labels
+
+
+def generate_sentence(rng: random.Random = random) -> Dict[str, Any]:
+    """
+    Draw one labelled sentence
+
+    Args:
+        rng: Random source (a seeded random.Random for reproducible shards)
+
+    Returns:
+        {"text": ..., <category>: 0/1, ...}
+    """
+    literals, choices, category = rng.choice(_COMPILED)
+    parts = [literals[0]]
+    for options, literal in zip(choices, literals[1:]):
+        parts.append(rng.choice(options))
+        parts.append(literal)
+    return {"text": "".join(parts), **labels_for(category)}
+
+
+def text_digest(text: str) -> int:
+    """64-bit hash of a sentence, used for de-duplication, buckets and splits"""
+    return int.from_bytes(hashlib.blake2b(text.encode("utf-8"), digest_size=8).digest(), "big")
+
+
+def split_of(digest: int, val_fraction: float, test_fraction: float) -> str:
+    """
+    Pick the split of a row from its hash
+
+    Args:
+        digest: text_digest() of the row
+        val_fraction: Share of rows in "val"
+        test_fraction: Share of rows in "test"
+
+    Returns:
+        "train", "val" or "test"
+    """
+    position = (digest >> 32) % _SPLIT_RESOLUTION / _SPLIT_RESOLUTION
+    if position < test_fraction:
+        return "test"
+    if position < test_fraction + val_fraction:
+        return "val"
+    return "train"
+
+
+def category_of(row: Dict[str, Any]) -> str:
+    """The category set on a row, or neutral"""
+    return next((cat for cat in categories if row.get(cat) == 1), NEUTRAL_LABEL)
+
+
+class SplitWriter:
+    """
+    Writes one part file per split and counts its rows per category
+    """
+
+    def __init__(self, output_dir: Path, part: int, output_format: str = "jsonl"):
+        """
+        Initialize the writer
+
+        Args:
+            output_dir: Dataset directory; rows go to <output_dir>/<split>/part-NNNNN.<format>
+            part: Part number (the shard or bucket writing it)
+            output_format: "jsonl" or "arrow"
+        """
+        self.output_dir = Path(output_dir)
+        self.part = part
+        self.output_format = output_format
+        self.counts: Dict[str, Counter] = {split: Counter() for split in SPLITS}
+        self._files: Dict[str, Any] = {}
+        self._pending: Dict[str, List[Dict[str, Any]]] = {split: [] for split in SPLITS}
+
+    def _open(self, split: str):
+        if split not in self._files:
+            path = self.output_dir / split / f"part-{self.part:05d}.{self.output_format}"
+            path.parent.mkdir(parents=True, exist_ok=True)
+            if self.output_format == "arrow":
+                fields = [("text", pa.string())] + [(cat, pa.int8()) for cat in categories]
+                self._files[split] = pa.ipc.new_stream(str(path), pa.schema(fields))
+            else:
+                self._files[split] = open(path, "w", encoding="utf-8")
+        return self._files[split]
+
+    def write(self, split: str, row: Dict[str, Any]) -> None:
+        """Append a row to a split"""
+        self.counts[split][category_of(row)] += 1
+        if self.output_format == "arrow":
+            self._pending[split].append(row)
+            if len(self._pending[split]) >= ARROW_BATCH_ROWS:
+                self._flush(split)
+        else:
+            self._open(split).write(json.dumps(row, ensure_ascii=False) + "\n")
+
+    def _flush(self, split: str) -> None:
+        rows, self._pending[split] = self._pending[split], []
+        if rows:
+            self._open(split).write_batch(pa.RecordBatch.from_pylist(rows))
+
+    def close(self) -> Dict[str, Dict[str, int]]:
+        """
+        Flush and close every part file
+
+        Returns:
+            Row counts by split and category
+        """
+        if self.output_format == "arrow":
+            for split in SPLITS:
+                self._flush(split)
+        for handle in self._files.values():
+            handle.close()
+        self._files = {}
+        return {split: dict(counts) for split, counts in self.counts.items()}
+
+
+def generate_shard(
+    shard: int,
+    rows: int,
+    seed: int,
+    output_dir: str,
+    output_format: str,
+    val_fraction: float,
+    test_fraction: float,
+    buckets: int = 0,
+) -> Dict[str, Dict[str, int]]:
+    """
+    Generate the rows of one shard (runs in a worker process)
+
+    Args:
+        shard: Shard number
+        rows: Rows to draw
+        seed: Dataset seed; the shard draws from random.Random(f"{seed}:{shard}")
+        output_dir: Dataset directory
+        output_format: "jsonl" or "arrow"
+        val_fraction: Share of rows in "val"
+        test_fraction: Share of rows in "test"
+        buckets: With de-duplication, number of hash buckets to write rows into
+            for dedup_bucket(); 0 writes the final split files directly
+
+    Returns:
+        Row counts by split and category (empty when writing buckets)
+    """
+    rng = random.Random(f"{seed}:{shard}")
+
+    if not buckets:
+        writer = SplitWriter(Path(output_dir), shard, output_format)
+        for _ in range(rows):
+            row = generate_sentence(rng)
+            writer.write(split_of(text_digest(row["text"]), val_fraction, test_fraction), row)
+        return writer.close()
+
+    bucket_dir = Path(output_dir) / "_buckets"
+    handles = [
+        open(bucket_dir / f"bucket-{b:05d}-shard-{shard:05d}.jsonl", "w", encoding="utf-8")
+        for b in range(buckets)
+    ]
+    try:
+        for _ in range(rows):
+            row = generate_sentence(rng)
+            handles[text_digest(row["text"]) % buckets].write(
+                json.dumps([row["text"], category_of(row)], ensure_ascii=False) + "\n"
+            )
+    finally:
+        for handle in handles:
+            handle.close()
+    return {}
+
+
+def dedup_bucket(
+    bucket: int,
+    shards: int,
+    output_dir: str,
+    output_format: str,
+    val_fraction: float,
+    test_fraction: float,
+) -> Tuple[Dict[str, Dict[str, int]], int]:
+    """
+    Keep the first copy of every sentence in a bucket, reading shards in order
+
+    Args:
+        bucket: Bucket number
+        shards: Number of shards that wrote into the bucket
+        output_dir: Dataset directory
+        output_format: "jsonl" or "arrow"
+        val_fraction: Share of rows in "val"
+        test_fraction: Share of rows in "test"
+
+    Returns:
+        Tuple of (row counts by split and category, duplicates dropped)
+    """
+    bucket_dir = Path(output_dir) / "_buckets"
+    writer = SplitWriter(Path(output_dir), bucket, output_format)
+    seen = set()
+    duplicates = 0
+
+    for shard in range(shards):
+        path = bucket_dir / f"bucket-{bucket:05d}-shard-{shard:05d}.jsonl"
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                text, category = json.loads(line)
+                digest = text_digest(text)
+                if digest in seen:
+                    duplicates += 1
+                    continue
+                seen.add(digest)
+                row = {"text": text, **labels_for(None if category == NEUTRAL_LABEL else category)}
+                writer.write(split_of(digest, val_fraction, test_fraction), row)
+        path.unlink()
+
+    return writer.close(), duplicates
+
+
+def _merge_counts(totals: Dict[str, Counter], counts: Dict[str, Dict[str, int]]) -> None:
+    for split, by_category in counts.items():
+        totals[split].update(by_category)
+
+
+def run(
+    output_dir: str,
+    rows: int = DEFAULT_ROWS,
+    seed: int = 0,
+    shards: int = DEFAULT_SHARDS,
+    workers: Optional[int] = None,
+    output_format: str = "jsonl",
+    val_fraction: float = 0.05,
+    test_fraction: float = 0.05,
+    dedup: bool = True,
+    buckets: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Generate the dataset
+
+    Args:
+        output_dir: Dataset directory (existing part files in it are replaced)
+        rows: Rows to draw in total
+        seed: Dataset seed
+        shards: Number of independently seeded shards
+        workers: Generator processes (default: CPU count)
+        output_format: "jsonl" or "arrow"
+        val_fraction: Share of rows in "val"
+        test_fraction: Share of rows in "test"
+        dedup: Drop repeated sentences across all shards
+        buckets: Hash buckets for de-duplication (default: one per shard)
+
+    Returns:
+        Summary with per-split, per-category counts and throughput
+    """
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"Unknown output format: {output_format}")
+    if output_format == "arrow" and not PYARROW_AVAILABLE:
+        raise RuntimeError("Arrow output requires pyarrow: pip install pyarrow")
+    if val_fraction < 0 or test_fraction < 0 or val_fraction + test_fraction >= 1:
+        raise ValueError("val and test fractions must be non-negative and leave rows for train")
+
+    shards = max(1, shards)
+    buckets = max(1, buckets or shards) if dedup else 0
+    output = Path(output_dir)
+    for split in SPLITS:
+        shutil.rmtree(output / split, ignore_errors=True)
+    shutil.rmtree(output / "_buckets", ignore_errors=True)
+    (output / "_buckets" if dedup else output).mkdir(parents=True, exist_ok=True)
+
+    distinct = template_space()
+    if dedup and rows > distinct:
+        logger.warning(f"The templates produce only {distinct} distinct sentences; "
+                       f"at most that many of the {rows} rows are kept")
+
+    shard_rows = [rows // shards + (1 if shard < rows % shards else 0) for shard in range(shards)]
+    totals: Dict[str, Counter] = {split: Counter() for split in SPLITS}
+    duplicates = 0
+    start = time.perf_counter()
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(generate_shard, shard, count, seed, str(output), output_format,
+                        val_fraction, test_fraction, buckets)
+            for shard, count in enumerate(shard_rows)
+        ]
+        for future in futures:
+            _merge_counts(totals, future.result())
+        logger.info(f"Generated {rows} rows in {shards} shards")
+
+        if dedup:
+            futures = [
+                pool.submit(dedup_bucket, bucket, shards, str(output), output_format,
+                            val_fraction, test_fraction)
+                for bucket in range(buckets)
+            ]
+            for future in futures:
+                counts, dropped = future.result()
+                _merge_counts(totals, counts)
+                duplicates += dropped
+            (output / "_buckets").rmdir()
+
+    elapsed = time.perf_counter() - start
+    splits = {
+        split: {"rows": sum(counts.values()), "categories": dict(sorted(counts.items()))}
+        for split, counts in totals.items()
+    }
+    with open(output / "counts.json", "w", encoding="utf-8") as f:
+        json.dump(splits, f, ensure_ascii=False, indent=2)
+
+    return {
+        "output": str(output),
+        "format": output_format,
+        "seed": seed,
+        "shards": shards,
+        "rows_requested": rows,
+        "rows_written": sum(split["rows"] for split in splits.values()),
+        "duplicates_dropped": duplicates,
+        "distinct_possible": distinct,
+        "splits": splits,
+        "seconds": round(elapsed, 2),
+        "rows_per_second": round(rows / elapsed, 1) if elapsed else 0.0,
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Generate the synthetic Nepali bias dataset")
+    parser.add_argument("--output", default="nepali_bias_dataset", help="Dataset directory")
+    parser.add_argument("--rows", type=int, default=DEFAULT_ROWS, help="Rows to draw in total")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--shards", type=int, default=DEFAULT_SHARDS, help="Independently seeded shards")
+    parser.add_argument("--workers", type=int, default=None, help="Generator processes (default: CPU count)")
+    parser.add_argument("--format", choices=OUTPUT_FORMATS, default="jsonl")
+    parser.add_argument("--val", type=float, default=0.05, help="Share of rows in the val split")
+    parser.add_argument("--test", type=float, default=0.05, help="Share of rows in the test split")
+    parser.add_argument("--no-dedup", action="store_true", help="Keep repeated sentences")
+    parser.add_argument("--buckets", type=int, default=None, help="Hash buckets for de-duplication")
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+    if args.format == "arrow" and not PYARROW_AVAILABLE:
+        print("Arrow output requires pyarrow: pip install pyarrow", file=sys.stderr)
+        return 1
+
+    summary = run(
+        args.output,
+        rows=args.rows,
+        seed=args.seed,
+        shards=args.shards,
+        workers=args.workers,
+        output_format=args.format,
+        val_fraction=args.val,
+        test_fraction=args.test,
+        dedup=not args.no_dedup,
+        buckets=args.buckets,
+    )
+    print(json.dumps(summary, indent=2, ensure_ascii=False))
+    print(f"✅ सफलतापूर्वक {summary['rows_written']} entries भएको BINARY classification dataset generate भयो!")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
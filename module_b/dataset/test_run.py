@@ -0,0 +1,55 @@
+"""
+Test suite for the synthetic dataset generator
+"""
+
+import json
+import random
+
+from module_b.dataset.run import (SPLITS, categories, dedup_bucket, generate_sentence, generate_shard,
+                                  split_of, template_space, text_digest)
+
+
+def _rows(directory):
+    rows = []
+    for split in SPLITS:
+        for path in sorted((directory / split).glob("part-*.jsonl")):
+            rows.extend((split, json.loads(line)) for line in path.read_text(encoding="utf-8").splitlines())
+    return rows
+
+
+def test_sentences_fill_every_placeholder_and_carry_one_label():
+    """No placeholder survives and at most one category is set"""
+    rng = random.Random(7)
+    for _ in range(500):
+        row = generate_sentence(rng)
+        assert "{" not in row["text"] and "}" not in row["text"]
+        assert sum(row[cat] for cat in categories) <= 1
+
+
+def test_shards_are_deterministic_per_seed(tmp_path):
+    """The same (seed, shard) writes the same rows; another shard draws different ones"""
+    for name, shard in (("a", 3), ("b", 3), ("c", 4)):
+        generate_shard(shard, 200, seed=1, output_dir=str(tmp_path / name), output_format="jsonl",
+                       val_fraction=0.1, test_fraction=0.1)
+
+    assert _rows(tmp_path / "a") == _rows(tmp_path / "b")
+    assert _rows(tmp_path / "a") != _rows(tmp_path / "c")
+
+
+def test_buckets_drop_duplicates_across_shards_and_keep_splits_stable(tmp_path):
+    """Every sentence is kept once, in the split its hash picks"""
+    (tmp_path / "_buckets").mkdir()
+    counts = {}
+    for shard in range(2):
+        counts.update(generate_shard(shard, 3000, seed=0, output_dir=str(tmp_path), output_format="jsonl",
+                                     val_fraction=0.1, test_fraction=0.1, buckets=2))
+    assert counts == {}
+
+    dropped = sum(dedup_bucket(bucket, 2, str(tmp_path), "jsonl", 0.1, 0.1)[1] for bucket in range(2))
+
+    rows = _rows(tmp_path)
+    texts = [row["text"] for _, row in rows]
+    assert len(texts) == len(set(texts)) <= template_space()
+    assert len(texts) + dropped == 6000
+    assert all(split == split_of(text_digest(row["text"]), 0.1, 0.1) for split, row in rows)
+    assert not list((tmp_path / "_buckets").iterdir())
@@ -1,126 +1,466 @@
-import fitz  # pymupdf
+"""
+Batch Bias Inference
+Audits folders of PDFs with the bias classifier and writes one row per sentence
+
+Pages are extracted in a process pool while the main process streams their
+sentences into classifier batches, so extraction and inference overlap.
+Every output row holds (file, page, offset, sentence, label, score, is_biased),
+where offset is the sentence's index among its page's sentences (not a
+character offset).
+
+A file's rows are written only once all of its sentences are classified, and
+the file is then appended to the checkpoint. An interrupted run resumes where
+it stopped when started again with the same output; rows of files missing
+from the checkpoint (written just before a crash) are dropped on resume.
+
+    # Run from the repository root
+    python -m module_b.inference gazettes/ --output results.jsonl
+    python -m module_b.inference "archive/**/*.pdf" --output results --format parquet --workers 8
+
+Classification uses the same loader as the API, so BIAS_CLASSIFIER_BACKEND=pool
+spreads inference over worker processes, and BIAS_CLASSIFIER_QUANTIZATION and
+the classification cache apply here too.
+"""
+
+import argparse
+import glob
+import json
+import logging
+import multiprocessing as mp
+import os
 import re
-from typing import List
-from transformers import pipeline
-import torch
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
 
-PDF_FILE_PATH = "module_b/file_2.pdf"  
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
 
+OUTPUT_FORMATS = ("jsonl", "parquet")
+DEFAULT_BATCH_SIZE = 256  # Sentences per classification call, across files
+DEFAULT_PARQUET_ROWS = 50000  # Rows per Parquet part file
+PROGRESS_INTERVAL_SECONDS = 10.0
 
-def extract_nepali_sentences_from_pdf(pdf_path: str) -> List[str]:
+
+def split_sentences(text: str) -> List[str]:
     """
-    Extracts clean Nepali sentences from a searchable PDF using PyMuPDF.
+    Split Nepali text into clean sentences.
     """
-    print(f"Opening PDF: {pdf_path}")
-    doc = fitz.open(pdf_path)
-    
-    full_text = ""
-    for page in doc:
-        text = page.get_text("text")
-        full_text += text + "\n"
-    
-    doc.close()
-    
-    if not full_text.strip():
-        print("Warning: No text found. PDF might be scanned (image-based). Use OCR version instead.")
-        return []
-    
     # Clean whitespace
-    text = full_text.replace('\n', ' ')
+    text = text.replace('\n', ' ')
     text = re.sub(r'\s+', ' ', text).strip()
-    
+
     # Split sentences intelligently
     sentences = re.split(r'(?<=[।.!?])\s+(?=[अ-हँ-ॿअ-ह])|(?<=[।.!?])(?=$)', text)
     if len(sentences) <= 1:  # fallback
         sentences = re.split(r'(?<=[।.!?])\s+', text)
-    
+
     # Final cleaning
-    cleaned = [s.strip(' ।.!?').strip() for s in sentences if len(s.strip()) > 5]
-    
-    print(f"Successfully extracted {len(cleaned)} clean sentences.\n")
-    return cleaned
-
-
-print("Loading your model from Hugging Face...")
-model_name = "sangy1212/distilbert-base-nepali-fine-tuned"
-
-classifier = pipeline(
-    "text-classification",
-    model=model_name,
-    tokenizer=model_name,
-    device=0 if torch.cuda.is_available() else -1,  
-    batch_size=16  
-)
-
-print("Model loaded and ready!\n")
-
-id_to_label = {
-    "LABEL_0":  "neutral",
-    "LABEL_1":  "gender",
-    "LABEL_2":  "religional",
-    "LABEL_3":  "caste",
-    "LABEL_4":  "religion",
-    "LABEL_5":  "appearence",
-    "LABEL_6":  "socialstatus",
-    "LABEL_7":  "amiguity",
-    "LABEL_8":  "political",
-    "LABEL_9":  "Age",
-    "LABEL_10": "Disablity"
-}
-
-def predict_bias_on_sentences(sentences: List[str], confidence_threshold: float = 0.7):
-    """
-    Runs batch prediction and prints results with nice formatting.
-    """
-    if not sentences:
-        print("No sentences to analyze.")
-        return
-    
-    print(f"Running bias detection on {len(sentences)} sentences...\n")
-    
-    # Batch inference
-    results = classifier(sentences)
-    
-    print("="*100)
-    print("BIAS DETECTION RESULTS")
-    print("="*100)
-    
-    biased_count = 0
-    for sent, res in zip(sentences, results):
-        label_id = res['label']
-        category = id_to_label.get(label_id, "unknown")
-        confidence = res['score']
-        
-        if category != "neutral" and confidence >= confidence_threshold:
-            mark = " BIAS DETECTED"
-            biased_count += 1
+    return [s.strip(' ।.!?').strip() for s in sentences if len(s.strip()) > 5]
+
+
+def extract_pages(pdf_path: str) -> List[Tuple[int, List[str]]]:
+    """
+    Extract the sentences of each page of a searchable PDF (runs in a worker process)
+
+    Args:
+        pdf_path: PDF file
+
+    Returns:
+        List of (1-based page number, sentences) for pages that have text
+    """
+    import fitz  # pymupdf
+
+    pages = []
+    with fitz.open(pdf_path) as doc:
+        for page_num, page in enumerate(doc, 1):
+            sentences = split_sentences(page.get_text("text"))
+            if sentences:
+                pages.append((page_num, sentences))
+    return pages
+
+
+def find_pdfs(inputs: Iterable[str]) -> List[Path]:
+    """
+    Expand directories (searched recursively), glob patterns and files into PDF paths
+
+    Args:
+        inputs: Directories, glob patterns or files
+
+    Returns:
+        Distinct PDF paths in sorted order
+    """
+    found: Set[Path] = set()
+    for item in inputs:
+        path = Path(item)
+        if path.is_dir():
+            found.update(p for p in path.rglob("*") if p.suffix.lower() == ".pdf")
+        elif path.is_file():
+            found.add(path)
         else:
-            mark = "✓ neutral / low confidence"
-        
-        print(f"{mark}")
-        print(f"   Category   : {category.upper()}")
-        print(f"   Confidence : {confidence:.3f}")
-        print(f"   Sentence   : {sent}")
-        print("-" * 80)
-    
-    print(f"\nSummary: {biased_count}/{len(sentences)} sentences contain detectable bias (confidence ≥ {confidence_threshold})")
+            found.update(Path(p) for p in glob.glob(item, recursive=True) if p.lower().endswith(".pdf"))
+    return sorted(p.resolve() for p in found)
 
 
-if __name__ == "__main__":
-    pdf_file_path = PDF_FILE_PATH 
-    import os
+# ----------------------------------------------------------------------
+# Output
+# ----------------------------------------------------------------------
+
+class Checkpoint:
+    """
+    Append-only list of files whose rows are safely written.
+    """
+
+    def __init__(self, path: Path, restart: bool = False):
+        self.path = path
+        if restart and path.exists():
+            path.unlink()
+        self.done: Set[str] = set()
+        if path.exists():
+            self.done = {line.strip() for line in path.read_text(encoding="utf-8").splitlines() if line.strip()}
+
+    def mark(self, files: Iterable[str]) -> None:
+        files = [f for f in files if f not in self.done]
+        if not files:
+            return
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.writelines(file + "\n" for file in files)
+            f.flush()
+            os.fsync(f.fileno())
+        self.done.update(files)
+
+
+class JsonlWriter:
+    """
+    Writes rows to a JSON Lines file as each file completes.
+
+    When appending with `done`, rows of other files are removed first: they
+    were written but not checkpointed, and will be written again.
+    """
+
+    def __init__(self, path: Path, append: bool, done: Optional[Set[str]] = None):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if append and done is not None and path.exists():
+            self._drop_unfinished(path, done)
+        self._file = open(path, "a" if append else "w", encoding="utf-8")
+
+    @staticmethod
+    def _drop_unfinished(path: Path, done: Set[str]) -> None:
+        kept, dropped = [], 0
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    finished = json.loads(line)["file"] in done
+                except (ValueError, KeyError, TypeError):
+                    finished = False  # Partially written line
+                if finished:
+                    kept.append(line)
+                else:
+                    dropped += 1
+        if dropped:
+            logger.info(f"Dropping {dropped} rows of unfinished files from {path}")
+            temp = path.with_name(path.name + ".tmp")
+            temp.write_text("".join(kept), encoding="utf-8")
+            os.replace(temp, path)
+
+    def write(self, file: str, rows: List[Dict[str, Any]]) -> List[str]:
+        """Write one file's rows; returns the files now safely on disk"""
+        self._file.writelines(json.dumps(row, ensure_ascii=False) + "\n" for row in rows)
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        return [file]
+
+    def close(self) -> List[str]:
+        self._file.close()
+        return []
+
+
+class ParquetWriter:
+    """
+    Writes rows to numbered Parquet part files in a directory, `rows_per_part` at a time.
+
+    When appending with `done`, a part holding rows of any other file is
+    removed: it was written but not checkpointed, and will be written again.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        append: bool,
+        rows_per_part: int = DEFAULT_PARQUET_ROWS,
+        done: Optional[Set[str]] = None,
+    ):
+        if not PYARROW_AVAILABLE:
+            raise ImportError("Parquet output requires pyarrow: pip install pyarrow")
+        directory.mkdir(parents=True, exist_ok=True)
+        existing = sorted(directory.glob("part-*.parquet"))
+        for part in existing:
+            if not append:
+                part.unlink()
+            elif done is not None:
+                files = set(pq.read_table(str(part), columns=["file"])["file"].to_pylist())
+                if not files <= done:
+                    logger.info(f"Dropping {part}: it holds rows of unfinished files")
+                    part.unlink()
+        existing = sorted(directory.glob("part-*.parquet"))
+        self.directory = directory
+        self.rows_per_part = max(1, rows_per_part)
+        self._next_part = int(existing[-1].stem.split("-")[1]) + 1 if existing else 0
+        self._rows: List[Dict[str, Any]] = []
+        self._files: List[str] = []
+
+    def write(self, file: str, rows: List[Dict[str, Any]]) -> List[str]:
+        """Buffer one file's rows; returns the files written out by this call"""
+        self._rows.extend(rows)
+        self._files.append(file)
+        return self._flush() if len(self._rows) >= self.rows_per_part else []
+
+    def close(self) -> List[str]:
+        return self._flush()
+
+    def _flush(self) -> List[str]:
+        if self._rows:
+            path = self.directory / f"part-{self._next_part:05d}.parquet"
+            pq.write_table(pa.Table.from_pylist(self._rows), str(path))
+            self._next_part += 1
+        files, self._rows, self._files = self._files, [], []
+        return files
+
+
+# ----------------------------------------------------------------------
+# Classification
+# ----------------------------------------------------------------------
+
+class SentenceStream:
+    """
+    Collects sentences from many files into fixed-size classifier batches.
+
+    A file's rows are released through `on_file_done` as soon as its last
+    sentence is classified.
+    """
+
+    def __init__(
+        self,
+        classify: Callable[[List[str]], List[Dict[str, Any]]],
+        on_file_done: Callable[[str, List[Dict[str, Any]]], None],
+        batch_size: int = DEFAULT_BATCH_SIZE,
+        confidence_threshold: float = 0.7,
+        labels: Optional[Dict[str, str]] = None,
+    ):
+        self.classify = classify
+        self.on_file_done = on_file_done
+        self.batch_size = max(1, batch_size)
+        self.confidence_threshold = confidence_threshold
+        self.labels = labels or {}
+
+        self._buffer: List[Dict[str, Any]] = []
+        self._rows: Dict[str, List[Dict[str, Any]]] = {}
+        self._remaining: Dict[str, int] = {}
+        self.sentences = 0
+        self.biased = 0
+        self.classify_seconds = 0.0
+
+    def add_file(self, file: str, pages: List[Tuple[int, List[str]]]) -> None:
+        rows = [
+            {"file": file, "page": page, "offset": offset, "sentence": sentence}
+            for page, sentences in pages
+            for offset, sentence in enumerate(sentences)
+        ]
+        self._rows[file] = rows
+        self._remaining[file] = len(rows)
+        self._buffer.extend(rows)
+        if not rows:
+            self._release()
+        while len(self._buffer) >= self.batch_size:
+            self._classify(self._buffer[:self.batch_size])
+            self._buffer = self._buffer[self.batch_size:]
+
+    def finish(self) -> None:
+        """Classify what is left in the buffer"""
+        if self._buffer:
+            self._classify(self._buffer)
+            self._buffer = []
+
+    def _classify(self, batch: List[Dict[str, Any]]) -> None:
+        started = time.perf_counter()
+        predictions = self.classify([row["sentence"] for row in batch])
+        self.classify_seconds += time.perf_counter() - started
+
+        for row, prediction in zip(batch, predictions):
+            label = self.labels.get(prediction["label"], prediction["label"])
+            row["label"] = label
+            row["score"] = round(float(prediction["score"]), 4)
+            row["is_biased"] = label != "neutral" and row["score"] >= self.confidence_threshold
+            self.biased += row["is_biased"]
+            self._remaining[row["file"]] -= 1
+        self.sentences += len(batch)
+        self._release()
+
+    def _release(self) -> None:
+        for file in [f for f, remaining in self._remaining.items() if remaining == 0]:
+            del self._remaining[file]
+            self.on_file_done(file, self._rows.pop(file))
+
+
+# ----------------------------------------------------------------------
+# Run
+# ----------------------------------------------------------------------
+
+def run(
+    inputs: List[str],
+    output: str,
+    output_format: str = "jsonl",
+    workers: Optional[int] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    confidence_threshold: float = 0.7,
+    checkpoint_path: Optional[str] = None,
+    restart: bool = False,
+    classify: Optional[Callable[[List[str]], List[Dict[str, Any]]]] = None,
+) -> Dict[str, Any]:
+    """
+    Classify every sentence of the given PDFs
 
-    if os.path.exists(pdf_file_path):
-        print(f"Using PDF file at: {pdf_file_path}\n")
+    Args:
+        inputs: Directories, glob patterns or PDF files
+        output: JSONL file, or directory of Parquet part files
+        output_format: "jsonl" or "parquet"
+        workers: Extraction processes (default: CPU count)
+        batch_size: Sentences per classification call
+        confidence_threshold: Minimum score for is_biased
+        checkpoint_path: Checkpoint file (default: <output>.checkpoint)
+        restart: Ignore the checkpoint and overwrite the output
+        classify: Sentence classifier returning category labels
+            (default: the configured bias classifier, with the cache)
+
+    Returns:
+        Run summary with throughput
+    """
+    output_path = Path(output)
+    checkpoint = Checkpoint(Path(checkpoint_path or f"{output_path}.checkpoint"), restart=restart)
+    append = bool(checkpoint.done)
+
+    files = find_pdfs(inputs)
+    pending = [path for path in files if str(path) not in checkpoint.done]
+    logger.info(f"{len(files)} PDFs found, {len(files) - len(pending)} already done, {len(pending)} to process")
+
+    close_classifier = None
+    labels: Dict[str, str] = {}
+    if classify is None:
+        from utility.bias_classifier import create_classifier, id_to_label
+        from utility.classification_cache import classify_with_cache, get_classification_cache
+
+        # Build the classifier before starting the extraction pool: the pool backend forks its workers
+        model = create_classifier()
+        close_classifier = getattr(model, "close", None)
+        cache = get_classification_cache()
+        classify = lambda sentences: classify_with_cache(sentences, model, cache)
+        labels = id_to_label
+
+    if output_format == "jsonl":
+        writer = JsonlWriter(output_path, append, done=checkpoint.done)
     else:
-        print(f"PDF file not found at: {pdf_file_path}. Please check the path.")
-        exit(1)
-    
-    # Step 1: Extract sentences
-    sentences = extract_nepali_sentences_from_pdf(pdf_file_path)
-    
-    # Step 2: Run batch prediction
-    if sentences:
-        predict_bias_on_sentences(sentences, confidence_threshold=0.7)
-    
-    print("\nDone! Your bias detection is complete.")
\ No newline at end of file
+        writer = ParquetWriter(output_path, append, done=checkpoint.done)
+    stream = SentenceStream(
+        classify,
+        lambda file, rows: checkpoint.mark(writer.write(file, rows)),
+        batch_size=batch_size,
+        confidence_threshold=confidence_threshold,
+        labels=labels,
+    )
+
+    workers = workers or os.cpu_count() or 1
+    failed: List[str] = []
+    started = last_report = time.perf_counter()
+
+    # Spawned extraction workers never inherit the loaded model
+    with ProcessPoolExecutor(max_workers=workers, mp_context=mp.get_context("spawn")) as pool:
+        queue = list(reversed(pending))
+        in_flight = {}
+
+        def top_up() -> None:
+            while queue and len(in_flight) < workers * 2:
+                path = queue.pop()
+                in_flight[pool.submit(extract_pages, str(path))] = str(path)
+
+        top_up()
+        while in_flight:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                file = in_flight.pop(future)
+                try:
+                    stream.add_file(file, future.result())
+                except Exception as e:
+                    logger.error(f"Skipping {file}: {e}")
+                    failed.append(file)
+            top_up()
+
+            now = time.perf_counter()
+            if now - last_report >= PROGRESS_INTERVAL_SECONDS:
+                last_report = now
+                logger.info(
+                    f"{len(checkpoint.done)}/{len(files)} files, {stream.sentences} sentences, "
+                    f"{stream.sentences / (now - started):.1f} sentences/s"
+                )
+
+    stream.finish()
+    checkpoint.mark(writer.close())
+    if close_classifier:
+        close_classifier()
+
+    elapsed = time.perf_counter() - started
+    return {
+        "files": len(files),
+        "processed": len(pending) - len(failed),
+        "skipped_from_checkpoint": len(files) - len(pending),
+        "failed": failed,
+        "sentences": stream.sentences,
+        "biased": stream.biased,
+        "seconds": round(elapsed, 2),
+        "classify_seconds": round(stream.classify_seconds, 2),
+        "sentences_per_second": round(stream.sentences / elapsed, 1) if elapsed else 0.0,
+        "output": str(output_path),
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Run the bias classifier over folders of PDFs")
+    parser.add_argument("inputs", nargs="+", help="Directories, glob patterns or PDF files")
+    parser.add_argument("--output", required=True, help="JSONL file, or directory for Parquet part files")
+    parser.add_argument("--format", choices=OUTPUT_FORMATS, default="jsonl")
+    parser.add_argument("--workers", type=int, default=None, help="Extraction processes (default: CPU count)")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    parser.add_argument("--threshold", type=float, default=0.7, help="Minimum score for is_biased")
+    parser.add_argument("--checkpoint", default=None, help="Checkpoint file (default: <output>.checkpoint)")
+    parser.add_argument("--restart", action="store_true", help="Ignore the checkpoint and overwrite the output")
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(message)s")
+
+    if args.format == "parquet" and not PYARROW_AVAILABLE:
+        print("Parquet output requires pyarrow: pip install pyarrow", file=sys.stderr)
+        return 1
+
+    summary = run(
+        args.inputs,
+        args.output,
+        output_format=args.format,
+        workers=args.workers,
+        batch_size=args.batch_size,
+        confidence_threshold=args.threshold,
+        checkpoint_path=args.checkpoint,
+        restart=args.restart,
+    )
+    print(json.dumps(summary, indent=2, ensure_ascii=False))
+    return 1 if summary["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,90 @@
+"""
+Test suite for the batch bias inference CLI
+"""
+
+import json
+
+from module_b.inference import Checkpoint, JsonlWriter, SentenceStream, find_pdfs, split_sentences
+
+
+class _Classifier:
+    def __init__(self):
+        self.batches = []
+
+    def __call__(self, sentences):
+        self.batches.append(len(sentences))
+        return [{"label": "LABEL_1" if "महिला" in s else "LABEL_0", "score": 0.9} for s in sentences]
+
+
+def test_sentences_from_many_files_share_batches_and_files_complete_in_full():
+    """Batches cross file boundaries; a file is released only when all its rows are labelled"""
+    done = []
+    model = _Classifier()
+    stream = SentenceStream(model, lambda file, rows: done.append((file, rows)), batch_size=3,
+                            labels={"LABEL_0": "neutral", "LABEL_1": "gender"})
+
+    stream.add_file("a.pdf", [(1, ["महिला कमजोर हुन्छन्", "सडक बन्दैछ"])])
+    assert done == []
+    stream.add_file("empty.pdf", [])
+    stream.add_file("b.pdf", [(2, ["पढाइ राम्रो लाग्छ", "कृषि उत्पादन बढ्यो"])])
+    assert [file for file, _ in done] == ["empty.pdf", "a.pdf"]
+
+    stream.finish()
+    assert model.batches == [3, 1]
+    rows = dict(done)["b.pdf"]
+    assert [(r["page"], r["offset"], r["label"]) for r in rows] == [(2, 0, "neutral"), (2, 1, "neutral")]
+    assert dict(done)["a.pdf"][0]["is_biased"] and stream.biased == 1
+
+
+def test_checkpointed_files_survive_a_restart_of_the_writer(tmp_path):
+    """Rows are appended on resume and the checkpoint lists finished files"""
+    output, checkpoint_file = tmp_path / "out.jsonl", tmp_path / "out.jsonl.checkpoint"
+
+    checkpoint = Checkpoint(checkpoint_file)
+    writer = JsonlWriter(output, append=False)
+    checkpoint.mark(writer.write("a.pdf", [{"file": "a.pdf", "offset": 0}]))
+    writer.close()
+
+    resumed = Checkpoint(checkpoint_file)
+    assert resumed.done == {"a.pdf"}
+    writer = JsonlWriter(output, append=True)
+    resumed.mark(writer.write("b.pdf", [{"file": "b.pdf", "offset": 0}]))
+    writer.close()
+
+    assert [json.loads(line)["file"] for line in output.read_text().splitlines()] == ["a.pdf", "b.pdf"]
+    assert Checkpoint(checkpoint_file, restart=True).done == set()
+
+
+def test_resume_drops_rows_written_after_the_last_checkpoint(tmp_path):
+    """Rows of a file written but not checkpointed before a crash are not duplicated on resume"""
+    output, checkpoint_file = tmp_path / "out.jsonl", tmp_path / "out.jsonl.checkpoint"
+
+    checkpoint = Checkpoint(checkpoint_file)
+    writer = JsonlWriter(output, append=False)
+    checkpoint.mark(writer.write("a.pdf", [{"file": "a.pdf", "offset": 0}]))
+    writer.write("b.pdf", [{"file": "b.pdf", "offset": 0}])  # crash before checkpoint.mark
+    writer.close()
+
+    resumed = Checkpoint(checkpoint_file)
+    writer = JsonlWriter(output, append=True, done=resumed.done)
+    resumed.mark(writer.write("b.pdf", [{"file": "b.pdf", "offset": 0}]))
+    writer.close()
+
+    assert [json.loads(line)["file"] for line in output.read_text().splitlines()] == ["a.pdf", "b.pdf"]
+
+
+def test_inputs_expand_directories_and_globs(tmp_path):
+    """Directories are searched recursively; non-PDF files are ignored"""
+    (tmp_path / "sub").mkdir()
+    for name in ("a.pdf", "sub/b.PDF", "notes.txt"):
+        (tmp_path / name).write_text("")
+
+    assert [p.name for p in find_pdfs([str(tmp_path)])] == ["a.pdf", "b.PDF"]
+    assert [p.name for p in find_pdfs([str(tmp_path / "*.pdf")])] == ["a.pdf"]
+
+
+def test_split_sentences_drops_fragments():
+    """Short fragments are removed and sentence punctuation is stripped"""
+    assert split_sentences("महिलाहरू कमजोर हुन्छन्। क। सडक निर्माण भइरहेको छ।") == [
+        "महिलाहरू कमजोर हुन्छन्", "सडक निर्माण भइरहेको छ"
+    ]
@@ -14,7 +14,7 @@ TEMPLATE_DIR = DATA_DIR  # Templates are directly in data/module-C based on user
 DATA_DIR.mkdir(parents=True, exist_ok=True)
 
 # LLM settings (Shared with Module A for consistency)
-MISTRAL_MODEL = "mistral-tiny"
+MISTRAL_MODEL = os.getenv("MISTRAL_MODEL", "mistral-tiny")  # Task-specific models come from module_a.config.MODEL_ROUTES
 MISTRAL_API_KEY_ENV_VAR = "MISTRAL_API_KEY"
 
 # Logging configuration
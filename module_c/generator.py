@@ -69,7 +69,7 @@ Draft Letter:
 
 Refined Letter:
 """
-        return self.llm.generate_response(prompt)
+        return self.llm.generate_for_task("letter_fill", prompt, call_site="letter.refine")
 
     def analyze_requirements(self, description: str) -> Dict[str, Any]:
         """
@@ -114,7 +114,12 @@ Return ONLY a comma-separated list of missing placeholders. If none are missing,
 
 Missing Placeholders:
 """
-        response = self.llm.generate_response(prompt, temperature=0.0)
+        response = self.llm.generate_for_task(
+            "extraction",
+            prompt,
+            validate=lambda r: 1.0 if r.strip() else None,
+            call_site="letter.analyze_requirements"
+        )
         
         missing_fields = []
         if "None" not in response:
@@ -197,7 +202,11 @@ Instructions:
 
 Final Letter:
 """
-        generated_letter = self.llm.generate_response(prompt, temperature=0.3)
+        generated_letter = self.llm.generate_for_task(
+            "letter_fill",
+            prompt,
+            call_site="letter.fill"
+        )
         
         return {
             "success": True,
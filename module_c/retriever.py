@@ -7,9 +7,13 @@ import logging
 from typing import List, Dict, Any
 from .vector_db import TemplateVectorDB
 from module_a.embeddings import EmbeddingGenerator
+from module_a.single_flight import SingleFlight, normalize_key
 
 logger = logging.getLogger(__name__)
 
+# Shared across retriever instances so concurrent identical searches coalesce
+template_flight = SingleFlight("template_search")
+
 class TemplateRetriever:
     """
     Retrieves the most relevant letter templates for a given user query.
@@ -22,7 +26,12 @@ class TemplateRetriever:
     def retrieve_templates(self, query: str, k: int = 1) -> List[Dict[str, Any]]:
         """
         Retrieve top-k templates matching the query.
+        Concurrent identical searches share one embedding + DB query.
         """
+        return template_flight.do(normalize_key(query, k), self._retrieve, query, k)
+
+    def _retrieve(self, query: str, k: int) -> List[Dict[str, Any]]:
+        """Embed the query and search the template collection."""
         logger.info(f"Retrieving templates for query: {query}")
         
         # 1. Embed Query
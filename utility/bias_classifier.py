@@ -0,0 +1,282 @@
+"""
+Bias Classifier Module
+Loads the Nepali bias classification model and builds the configured inference backend
+"""
+
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+MODEL_NAME = "sangy1212/distilbert-base-nepali-fine-tuned"
+CLASSIFIER_BATCH_SIZE = 16  # Sentences per classifier forward pass
+CLASSIFIER_MAX_LENGTH = 512  # Token limit of the model; longer sentences are truncated
+CLASSIFIER_MAX_BATCH_TOKENS = int(os.getenv("BIAS_CLASSIFIER_MAX_BATCH_TOKENS", "4096"))  # Padded tokens per forward pass
+# Tokenize once, sort by token length and pad per bucket instead of letting the pipeline pad in arrival order
+BIAS_CLASSIFIER_BUCKETING = os.getenv("BIAS_CLASSIFIER_BUCKETING", "true").lower() == "true"
+
+# Inference backend:
+#   local  - pipeline inside this process (default)
+#   pool   - worker processes forked from this process after the model is loaded
+#   remote - thin client for a pool served with `python -m utility.classifier_pool`
+#            (both sides need the same BIAS_CLASSIFIER_AUTHKEY)
+BIAS_CLASSIFIER_BACKEND = os.getenv("BIAS_CLASSIFIER_BACKEND", "local")
+BIAS_CLASSIFIER_WORKERS = int(os.getenv("BIAS_CLASSIFIER_WORKERS", "2"))
+BIAS_CLASSIFIER_THREADS = int(os.getenv("BIAS_CLASSIFIER_THREADS", "1"))  # torch threads per worker
+BIAS_CLASSIFIER_ADDRESS = os.getenv("BIAS_CLASSIFIER_ADDRESS", "127.0.0.1:6010")
+# Seconds a pool call waits for its workers before failing (dead workers are also restarted)
+BIAS_CLASSIFIER_POOL_TIMEOUT_SECONDS = float(os.getenv("BIAS_CLASSIFIER_POOL_TIMEOUT_SECONDS", "60"))
+
+# Weight precision of the loaded model (CPU only; see utility/classifier_quantization.py):
+#   none    - full-precision torch model (default)
+#   dynamic - torch dynamic int8 quantization
+#   onnx    - ONNX int8 model run by onnxruntime, read from BIAS_CLASSIFIER_ONNX_DIR
+#             (export it first: python -m utility.classifier_quantization export)
+BIAS_CLASSIFIER_QUANTIZATION = os.getenv("BIAS_CLASSIFIER_QUANTIZATION", "none")
+# Relative paths are resolved against the repository root, not the working directory
+BIAS_CLASSIFIER_ONNX_DIR = str(
+    Path(__file__).resolve().parent.parent / os.getenv("BIAS_CLASSIFIER_ONNX_DIR", "models/bias-classifier-onnx")
+)
+
+# Label mapping
+id_to_label = {
+    "LABEL_0":  "neutral",
+    "LABEL_1":  "gender",
+    "LABEL_2":  "religional",
+    "LABEL_3":  "caste",
+    "LABEL_4":  "religion",
+    "LABEL_5":  "appearence",
+    "LABEL_6":  "socialstatus",
+    "LABEL_7":  "amiguity",
+    "LABEL_8":  "political",
+    "LABEL_9":  "Age",
+    "LABEL_10": "Disablity"
+}
+CATEGORY_LABELS = [id_to_label[f"LABEL_{i}"] for i in range(len(id_to_label))]  # Category of each probability column
+
+
+def load_classifier_pipeline(quantization: str = BIAS_CLASSIFIER_QUANTIZATION):
+    """
+    Load the text-classification pipeline
+
+    Args:
+        quantization: "none", "dynamic" or "onnx"
+
+    Returns:
+        transformers pipeline for MODEL_NAME
+    """
+    from transformers import pipeline
+    import torch
+    from .classifier_quantization import QUANTIZATION_MODES, load_dynamic_int8_model, load_onnx_int8_model
+
+    if quantization not in QUANTIZATION_MODES:
+        raise ValueError(f"Unknown BIAS_CLASSIFIER_QUANTIZATION '{quantization}'. Use none, dynamic or onnx.")
+
+    if quantization == "none" or torch.cuda.is_available():
+        if quantization != "none":
+            logger.warning("int8 quantization is CPU-only; loading the full-precision model on GPU")
+        return pipeline(
+            "text-classification",
+            model=MODEL_NAME,
+            tokenizer=MODEL_NAME,
+            device=0 if torch.cuda.is_available() else -1,
+            batch_size=CLASSIFIER_BATCH_SIZE
+        )
+
+    if quantization == "dynamic":
+        model, tokenizer = load_dynamic_int8_model(MODEL_NAME)
+    else:
+        model, tokenizer = load_onnx_int8_model(BIAS_CLASSIFIER_ONNX_DIR)
+    logger.info(f"Loaded {quantization} int8 bias classifier")
+
+    return pipeline(
+        "text-classification",
+        model=model,
+        tokenizer=tokenizer,
+        device=-1,
+        batch_size=CLASSIFIER_BATCH_SIZE
+    )
+
+
+def plan_buckets(lengths: List[int], max_batch_size: int, max_batch_tokens: int) -> List[List[int]]:
+    """
+    Group inputs of similar token length into batches
+
+    Inputs are sorted by length and a bucket is closed once it holds
+    max_batch_size items or padding to its longest item would exceed
+    max_batch_tokens. A single item longer than the token budget gets
+    its own bucket.
+
+    Args:
+        lengths: Token count of each input
+        max_batch_size: Maximum items per bucket
+        max_batch_tokens: Maximum padded tokens (items x longest) per bucket
+
+    Returns:
+        Buckets of input indices, shortest inputs first
+    """
+    order = sorted(range(len(lengths)), key=lambda i: lengths[i])
+    buckets: List[List[int]] = []
+    current: List[int] = []
+
+    for index in order:
+        # Sorted ascending, so the new item is the longest in the bucket
+        if current and (len(current) >= max_batch_size or (len(current) + 1) * lengths[index] > max_batch_tokens):
+            buckets.append(current)
+            current = []
+        current.append(index)
+
+    if current:
+        buckets.append(current)
+    return buckets
+
+
+class LengthBucketedClassifier:
+    """
+    Sequence classifier that pads per length bucket.
+
+    All sentences are tokenized in one fast batched call, grouped with
+    plan_buckets, padded only to the longest sentence of their bucket and
+    run through the model; predictions come back in input order as
+    {'label', 'score'} dictionaries, like the text-classification pipeline,
+    plus 'probabilities' with the full softmax vector in label-id order.
+    """
+
+    def __init__(
+        self,
+        model,
+        tokenizer,
+        batch_size: int = CLASSIFIER_BATCH_SIZE,
+        max_batch_tokens: int = CLASSIFIER_MAX_BATCH_TOKENS,
+        max_length: int = CLASSIFIER_MAX_LENGTH,
+    ):
+        """
+        Initialize the classifier
+
+        Args:
+            model: Sequence classification model (torch or onnxruntime)
+            tokenizer: Fast tokenizer of the model
+            batch_size: Maximum sentences per forward pass
+            max_batch_tokens: Maximum padded tokens per forward pass
+            max_length: Truncation length in tokens
+        """
+        self.model = model
+        self.tokenizer = tokenizer
+        self.batch_size = batch_size
+        self.max_batch_tokens = max_batch_tokens
+        self.max_length = max_length
+        self._stats_lock = threading.Lock()
+        self._stats = {"sentences": 0, "batches": 0, "tokens": 0, "padded_tokens": 0}
+
+    @classmethod
+    def from_pipeline(cls, pipe, **kwargs) -> "LengthBucketedClassifier":
+        """Reuse the model and tokenizer of a loaded text-classification pipeline"""
+        return cls(pipe.model, pipe.tokenizer, **kwargs)
+
+    def __call__(self, sentences: List[str], batch_size: Optional[int] = None, truncation: bool = True) -> List[Dict[str, Any]]:
+        """
+        Classify sentences
+
+        Args:
+            sentences: Sentences to classify
+            batch_size: Overrides the maximum sentences per forward pass
+            truncation: Accepted for pipeline compatibility; inputs are always truncated
+
+        Returns:
+            Predictions ({'label', 'score', 'probabilities'}) in input order
+        """
+        import torch
+
+        if not sentences:
+            return []
+
+        encoded = self.tokenizer(list(sentences), truncation=True, max_length=self.max_length)
+        lengths = [len(ids) for ids in encoded["input_ids"]]
+        buckets = plan_buckets(lengths, batch_size or self.batch_size, self.max_batch_tokens)
+        id2label = self.model.config.id2label
+        device = getattr(self.model, "device", None)
+
+        predictions: List[Optional[Dict[str, Any]]] = [None] * len(sentences)
+        padded_tokens = 0
+        with torch.inference_mode():
+            for bucket in buckets:
+                features = [{key: encoded[key][i] for key in encoded.keys()} for i in bucket]
+                inputs = self.tokenizer.pad(features, return_tensors="pt")
+                if device is not None:
+                    inputs = inputs.to(device)
+                padded_tokens += inputs["input_ids"].numel()
+
+                probabilities = torch.softmax(self.model(**inputs).logits.float(), dim=-1)
+                scores, label_ids = probabilities.max(dim=-1)
+                for i, score, label_id, row in zip(bucket, scores.tolist(), label_ids.tolist(), probabilities.tolist()):
+                    predictions[i] = {"label": id2label[label_id], "score": score, "probabilities": row}
+
+        with self._stats_lock:
+            self._stats["sentences"] += len(sentences)
+            self._stats["batches"] += len(buckets)
+            self._stats["tokens"] += sum(lengths)
+            self._stats["padded_tokens"] += padded_tokens
+        return predictions
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get padding counters"""
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats["padding_ratio"] = round(1 - stats["tokens"] / stats["padded_tokens"], 4) if stats["padded_tokens"] else 0.0
+        return stats
+
+
+def load_classifier(quantization: str = BIAS_CLASSIFIER_QUANTIZATION, bucketing: bool = BIAS_CLASSIFIER_BUCKETING):
+    """
+    Load the classifier used for inference
+
+    Args:
+        quantization: "none", "dynamic" or "onnx"
+        bucketing: Wrap the model in a LengthBucketedClassifier
+
+    Returns:
+        Callable taking (sentences, batch_size=..., truncation=...) like the pipeline
+    """
+    pipe = load_classifier_pipeline(quantization)
+    return LengthBucketedClassifier.from_pipeline(pipe) if bucketing else pipe
+
+
+def create_classifier(backend: str = BIAS_CLASSIFIER_BACKEND) -> Callable[[List[str]], List[Dict[str, Any]]]:
+    """
+    Build a callable that classifies a list of sentences
+
+    Args:
+        backend: "local", "pool" or "remote"
+
+    Returns:
+        Function mapping sentences to pipeline predictions ({'label', 'score'})
+    """
+    from .classifier_pool import ClassifierPool, RemoteClassifier
+
+    if backend == "remote":
+        logger.info(f"Using remote bias classifier at {BIAS_CLASSIFIER_ADDRESS}")
+        return RemoteClassifier(BIAS_CLASSIFIER_ADDRESS)
+
+    if backend == "pool":
+        import torch
+        if torch.cuda.is_available():
+            # CUDA contexts cannot be shared with forked workers
+            logger.warning("Classifier pool is CPU-only; using the in-process pipeline on GPU")
+        else:
+            return ClassifierPool(
+                load_classifier,
+                num_workers=BIAS_CLASSIFIER_WORKERS,
+                threads_per_worker=BIAS_CLASSIFIER_THREADS,
+                batch_size=CLASSIFIER_BATCH_SIZE,
+                timeout=BIAS_CLASSIFIER_POOL_TIMEOUT_SECONDS,
+            )
+    elif backend != "local":
+        raise ValueError(f"Unknown BIAS_CLASSIFIER_BACKEND '{backend}'. Use local, pool or remote.")
+
+    model = load_classifier()
+    if isinstance(model, LengthBucketedClassifier):
+        return model
+    return lambda sentences: model(sentences, batch_size=CLASSIFIER_BATCH_SIZE, truncation=True)
@@ -0,0 +1,375 @@
+"""
+Classification Cache Module
+Content-addressed cache of bias classifier predictions, shared across documents and users
+
+Keys are (model version, hash of the normalized sentence), so boilerplate that
+repeats across gazette files and re-uploaded PDFs is classified only once.
+
+Two tiers are used:
+- An in-memory LRU tier, local to each process
+- An optional on-disk SQLite tier, shared by every worker on the host
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import unicodedata
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+CLASSIFICATION_CACHE_ENABLED = os.getenv("BIAS_CLASSIFICATION_CACHE_ENABLED", "true").lower() == "true"
+CLASSIFICATION_CACHE_MEMORY_SIZE = int(os.getenv("BIAS_CLASSIFICATION_CACHE_MEMORY_SIZE", "50000"))  # Sentences kept in memory
+CLASSIFICATION_CACHE_DB_FILE = os.getenv("BIAS_CLASSIFICATION_CACHE_DB_FILE", "")  # Empty keeps the cache in memory only
+CLASSIFICATION_CACHE_VERSION = os.getenv("BIAS_CLASSIFICATION_CACHE_VERSION", "1")  # Bump to drop every cached prediction
+
+_WHITESPACE = re.compile(r'\s+')
+
+
+def normalize_sentence(sentence: str) -> str:
+    """Canonical form used for hashing: NFC Unicode and single spaces"""
+    text = unicodedata.normalize("NFC", sentence)
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+def sentence_hash(sentence: str) -> str:
+    """Return the SHA-256 hex digest of the normalized sentence"""
+    return hashlib.sha256(normalize_sentence(sentence).encode("utf-8")).hexdigest()
+
+
+def dedupe_sentences(sentences: List[str]) -> Tuple[List[str], "OrderedDict[str, str]"]:
+    """
+    Collapse repeated sentences before inference
+
+    Args:
+        sentences: Sentences in document order
+
+    Returns:
+        Tuple of (hash of each input sentence, first sentence seen for each distinct hash)
+    """
+    hashes = [sentence_hash(sentence) for sentence in sentences]
+    unique: "OrderedDict[str, str]" = OrderedDict()
+    for digest, sentence in zip(hashes, sentences):
+        unique.setdefault(digest, sentence)
+    return hashes, unique
+
+
+class ClassificationCache:
+    """
+    Caches classifier predictions ({'label', 'score', 'probabilities'}) by sentence hash.
+
+    The model version is part of every key, so switching the model or its
+    quantization never serves predictions made by another model.
+    """
+
+    def __init__(
+        self,
+        model_version: str,
+        db_path: Optional[str] = CLASSIFICATION_CACHE_DB_FILE,
+        memory_size: int = CLASSIFICATION_CACHE_MEMORY_SIZE,
+    ):
+        """
+        Initialize the cache
+
+        Args:
+            model_version: Identifies the model producing predictions
+            db_path: SQLite file for the shared tier (None or empty disables it)
+            memory_size: Maximum number of predictions kept in memory
+        """
+        self.model_version = f"{CLASSIFICATION_CACHE_VERSION}:{model_version}"
+        self.memory_size = memory_size
+
+        self._memory: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._stats = {"lookups": 0, "memory_hits": 0, "disk_hits": 0, "misses": 0, "duplicates": 0, "stores": 0}
+
+        self.db_path = Path(db_path) if db_path else None
+        if self.db_path:
+            try:
+                self.db_path.parent.mkdir(parents=True, exist_ok=True)
+                self._init_db()
+                logger.info(f"Classification cache using disk tier at {self.db_path}")
+            except Exception as e:
+                logger.warning(f"Classification cache disk tier unavailable, using memory only: {e}")
+                self.db_path = None
+
+    def make_key(self, digest: str) -> str:
+        """Combine the model version with a sentence hash"""
+        return f"{self.model_version}|{digest}"
+
+    # ------------------------------------------------------------------
+    # Lookup / store
+    # ------------------------------------------------------------------
+
+    def lookup(self, sentences: List[str]) -> Tuple[List[str], Dict[str, Dict[str, Any]], "OrderedDict[str, str]"]:
+        """
+        Deduplicate sentences and find the cached predictions
+
+        Args:
+            sentences: Sentences in document order
+
+        Returns:
+            Tuple of (key of each input sentence, cached predictions by key,
+            distinct uncached sentences by key in first-seen order)
+        """
+        hashes, unique = dedupe_sentences(sentences)
+        keys = [self.make_key(digest) for digest in hashes]
+        found: Dict[str, Dict[str, Any]] = {}
+        missing: "OrderedDict[str, str]" = OrderedDict()
+
+        with self._lock:
+            self._stats["lookups"] += len(sentences)
+            self._stats["duplicates"] += len(sentences) - len(unique)
+            for digest, sentence in unique.items():
+                key = self.make_key(digest)
+                prediction = self._memory.get(key)
+                if prediction is not None:
+                    self._memory.move_to_end(key)
+                    self._stats["memory_hits"] += 1
+                    found[key] = prediction
+                else:
+                    missing[key] = sentence
+
+        if missing and self.db_path:
+            from_disk = self._disk_get(list(missing))
+            with self._lock:
+                for key, prediction in from_disk.items():
+                    self._remember(key, prediction)
+                    del missing[key]
+                self._stats["disk_hits"] += len(from_disk)
+            found.update(from_disk)
+
+        with self._lock:
+            self._stats["misses"] += len(missing)
+        return keys, found, missing
+
+    def store(self, keys: List[str], predictions: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        """
+        Cache fresh predictions
+
+        Args:
+            keys: Keys from lookup() of the classified sentences
+            predictions: Classifier outputs in the same order
+
+        Returns:
+            The stored predictions by key
+        """
+        entries = {key: _cacheable(prediction) for key, prediction in zip(keys, predictions)}
+        with self._lock:
+            for key, prediction in entries.items():
+                self._remember(key, prediction)
+            self._stats["stores"] += len(entries)
+        self._disk_set(entries)
+        return entries
+
+    def _remember(self, key: str, prediction: Dict[str, Any]) -> None:
+        """Insert into the LRU tier (caller holds the lock)"""
+        self._memory[key] = prediction
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_size:
+            self._memory.popitem(last=False)
+
+    # ------------------------------------------------------------------
+    # SQLite tier
+    # ------------------------------------------------------------------
+
+    def _connect(self) -> sqlite3.Connection:
+        """One connection per thread; SQLite handles cross-process locking"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.db_path), timeout=5.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _init_db(self) -> None:
+        conn = self._connect()
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS classification_cache (
+                key TEXT PRIMARY KEY,
+                label TEXT NOT NULL,
+                score REAL NOT NULL,
+                probabilities TEXT
+            )
+            """
+        )
+        conn.commit()
+
+    def _disk_get(self, keys: List[str]) -> Dict[str, Dict[str, Any]]:
+        found: Dict[str, Dict[str, Any]] = {}
+        try:
+            conn = self._connect()
+            for start in range(0, len(keys), 500):  # Stay under SQLite's bound-parameter limit
+                batch = keys[start:start + 500]
+                rows = conn.execute(
+                    f"SELECT key, label, score, probabilities FROM classification_cache "
+                    f"WHERE key IN ({','.join('?' * len(batch))})",
+                    batch
+                ).fetchall()
+                for key, label, score, probabilities in rows:
+                    found[key] = {
+                        "label": label,
+                        "score": score,
+                        "probabilities": json.loads(probabilities) if probabilities else None,
+                    }
+        except Exception as e:
+            logger.warning(f"Classification cache read failed: {e}")
+        return found
+
+    def _disk_set(self, entries: Dict[str, Dict[str, Any]]) -> None:
+        if not self.db_path or not entries:
+            return
+        try:
+            conn = self._connect()
+            conn.executemany(
+                "INSERT OR REPLACE INTO classification_cache (key, label, score, probabilities) VALUES (?, ?, ?, ?)",
+                [
+                    (
+                        key,
+                        prediction["label"],
+                        prediction["score"],
+                        json.dumps(prediction["probabilities"]) if prediction.get("probabilities") else None,
+                    )
+                    for key, prediction in entries.items()
+                ]
+            )
+            conn.commit()
+        except Exception as e:
+            logger.warning(f"Classification cache write failed: {e}")
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
+
+    def clear(self) -> None:
+        """Remove all entries from both tiers"""
+        with self._lock:
+            self._memory.clear()
+        if self.db_path:
+            conn = self._connect()
+            conn.execute("DELETE FROM classification_cache")
+            conn.commit()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get hit-rate and deduplication counters"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["memory_entries"] = len(self._memory)
+        hits = stats["memory_hits"] + stats["disk_hits"]
+        distinct = hits + stats["misses"]
+        stats["hit_rate"] = round(hits / distinct, 4) if distinct else 0.0
+        stats["model_version"] = self.model_version
+        stats["disk_tier"] = str(self.db_path) if self.db_path else None
+        return stats
+
+
+def _cacheable(prediction: Dict[str, Any]) -> Dict[str, Any]:
+    """Keep only the fields worth caching"""
+    return {
+        "label": prediction["label"],
+        "score": float(prediction["score"]),
+        "probabilities": prediction.get("probabilities"),
+    }
+
+
+def _plan_classification(
+    sentences: List[str],
+    cache: Optional[ClassificationCache],
+) -> Tuple[List[str], Callable[[List[Dict[str, Any]]], List[Dict[str, Any]]]]:
+    """
+    Split a classification into the sentences the model must see and a finishing step
+
+    Returns:
+        Tuple of (distinct uncached sentences, function taking their
+        predictions and returning all predictions in input order)
+    """
+    if cache is None:
+        hashes, unique = dedupe_sentences(sentences)
+
+        def finish(fresh: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+            by_hash = dict(zip(unique, fresh))
+            return [by_hash[digest] for digest in hashes]
+
+        return list(unique.values()), finish
+
+    keys, found, missing = cache.lookup(sentences)
+
+    def finish(fresh: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        if missing:
+            found.update(cache.store(list(missing), fresh))
+        return [found[key] for key in keys]
+
+    return list(missing.values()), finish
+
+
+def classify_with_cache(
+    sentences: List[str],
+    classify_fn: Callable[[List[str]], List[Dict[str, Any]]],
+    cache: Optional[ClassificationCache],
+) -> List[Dict[str, Any]]:
+    """
+    Classify sentences, running the model only on distinct uncached ones
+
+    Args:
+        sentences: Sentences in document order
+        classify_fn: Classifier for a list of sentences
+        cache: Shared cache, or None to only deduplicate within this call
+
+    Returns:
+        Predictions in input order
+    """
+    pending, finish = _plan_classification(sentences, cache)
+    return finish(classify_fn(pending) if pending else [])
+
+
+async def classify_with_cache_async(
+    sentences: List[str],
+    classify_fn: Callable[[List[str]], Awaitable[List[Dict[str, Any]]]],
+    cache: Optional[ClassificationCache],
+) -> List[Dict[str, Any]]:
+    """
+    Like classify_with_cache, for a classifier that is awaited
+
+    Args:
+        sentences: Sentences in document order
+        classify_fn: Coroutine function classifying a list of sentences
+        cache: Shared cache, or None to only deduplicate within this call
+
+    Returns:
+        Predictions in input order
+    """
+    pending, finish = _plan_classification(sentences, cache)
+    return finish(await classify_fn(pending) if pending else [])
+
+
+_cache_instance: Optional[ClassificationCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_classification_cache() -> Optional[ClassificationCache]:
+    """
+    Get the process-wide classification cache
+
+    Returns:
+        Shared ClassificationCache, or None if caching is disabled
+    """
+    global _cache_instance
+
+    if not CLASSIFICATION_CACHE_ENABLED:
+        return None
+
+    if _cache_instance is None:
+        with _cache_lock:
+            if _cache_instance is None:
+                from .bias_classifier import MODEL_NAME, BIAS_CLASSIFIER_QUANTIZATION
+                _cache_instance = ClassificationCache(f"{MODEL_NAME}@{BIAS_CLASSIFIER_QUANTIZATION}")
+    return _cache_instance
@@ -0,0 +1,390 @@
+"""
+Classifier Worker Pool Module
+Runs the bias classifier in worker processes that share one copy of the model weights.
+
+The model is loaded once in the parent and the workers are forked afterwards,
+so the weights are shared copy-on-write instead of being loaded per process.
+Each worker pins its torch thread count, and batches of sentences travel over
+multiprocessing queues. A worker that dies (OOM, segfault) fails the chunks it
+held and is replaced by a spawned process that loads its own copy of the model:
+by then the parent runs other threads, so forking it again is not safe. The
+pool can also be served over a socket so API processes become thin clients:
+
+    BIAS_CLASSIFIER_AUTHKEY=... python -m utility.classifier_pool --address 127.0.0.1:6010 --workers 4
+
+The server unpickles what clients send, so it requires BIAS_CLASSIFIER_AUTHKEY
+and only listens on loopback addresses unless --allow-remote is given.
+"""
+
+import argparse
+import ipaddress
+import itertools
+import logging
+import multiprocessing as mp
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from multiprocessing.connection import Client, Listener
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+AUTHKEY_ENV = "BIAS_CLASSIFIER_AUTHKEY"  # Shared secret of serve() and RemoteClassifier; no default
+WORKER_CHECK_INTERVAL_SECONDS = 0.5  # How often the collector looks for dead workers
+_STOP = None  # Sentinel telling a worker to exit
+
+
+def parse_address(address: str) -> Tuple[str, int]:
+    """Split "host:port" into a (host, port) tuple"""
+    host, _, port = address.rpartition(":")
+    return host or "127.0.0.1", int(port)
+
+
+def is_loopback(host: str) -> bool:
+    """True if host only accepts connections from this machine"""
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+def resolve_authkey(authkey: Optional[bytes] = None) -> bytes:
+    """
+    Get the shared secret of the classifier server
+
+    Args:
+        authkey: Explicit key; BIAS_CLASSIFIER_AUTHKEY is used when omitted
+
+    Returns:
+        The key as bytes
+
+    Raises:
+        RuntimeError: If no key is configured
+    """
+    key = authkey or os.getenv(AUTHKEY_ENV, "").encode()
+    if not key:
+        raise RuntimeError(
+            f"{AUTHKEY_ENV} is not set. The classifier server unpickles client requests, "
+            f"so server and clients must share a secret key."
+        )
+    return key
+
+
+def _worker_main(model: Callable, tasks, results, threads: int, batch_size: int) -> None:
+    """Worker loop: classify chunks until the stop sentinel arrives"""
+    try:
+        import torch
+        torch.set_num_threads(threads)
+    except ImportError:
+        pass
+
+    while True:
+        task = tasks.get()
+        if task is _STOP:
+            break
+        job_id, sentences = task
+        try:
+            predictions = model(sentences, batch_size=batch_size, truncation=True)
+            results.put((job_id, predictions, None))
+        except Exception as e:
+            results.put((job_id, None, repr(e)))
+
+
+def _spawned_worker_main(loader: Callable[[], Callable], tasks, results, threads: int, batch_size: int) -> None:
+    """Replacement worker: load the model in this fresh process, then run the worker loop"""
+    _worker_main(loader(), tasks, results, threads, batch_size)
+
+
+class ClassifierPool:
+    """
+    Process pool for the bias classifier.
+
+    Calls are split into chunks of `chunk_size` sentences so one large
+    document is spread over all workers. Each worker has its own task queue,
+    so the chunks a dead worker held are known and failed immediately
+    instead of leaving their callers waiting.
+    """
+
+    def __init__(
+        self,
+        loader: Callable[[], Callable],
+        num_workers: int = 2,
+        threads_per_worker: int = 1,
+        batch_size: int = 16,
+        chunk_size: int = 32,
+        timeout: float = 60.0,
+    ):
+        """
+        Load the model and start the workers
+
+        Args:
+            loader: Returns the classifier; called once in this process before forking,
+                and again in each replacement worker, so it must be picklable
+                (a module-level function)
+            num_workers: Worker processes
+            threads_per_worker: torch intra-op threads per worker
+            batch_size: Pipeline batch size inside a worker
+            chunk_size: Sentences per task sent to a worker
+            timeout: Seconds a call waits for its predictions before raising TimeoutError
+        """
+        self.num_workers = max(1, num_workers)
+        self.chunk_size = max(1, chunk_size)
+        self.timeout = timeout
+        self._threads_per_worker = threads_per_worker
+        self._batch_size = batch_size
+
+        # Fork the first workers so they inherit the loaded weights instead of reloading
+        # them; this happens before the collector thread starts. Replacements are spawned
+        # (see _replace_dead_workers). Queues come from the spawn context so both kinds
+        # of worker can use them.
+        self._fork_ctx = mp.get_context("fork")
+        self._spawn_ctx = mp.get_context("spawn")
+        self._loader = loader
+        self._model = loader()
+        self._results = self._spawn_ctx.Queue()
+        self._tasks: List[Any] = [None] * self.num_workers
+        self._workers: List[Any] = [None] * self.num_workers
+        self._assigned: List[Dict[int, Future]] = [{} for _ in range(self.num_workers)]
+        self._owner: Dict[int, int] = {}  # job id -> worker index
+        self._pending_lock = threading.Lock()
+        self._job_ids = itertools.count()
+        self._restarts = 0
+        self._closed = False
+
+        for index in range(self.num_workers):
+            self._tasks[index] = self._spawn_ctx.Queue()
+            self._start_worker(index, spawn=False)
+
+        self._collector = threading.Thread(target=self._collect, name="bias-classifier-results", daemon=True)
+        self._collector.start()
+        logger.info(f"Started classifier pool with {self.num_workers} workers x {threads_per_worker} threads")
+
+    def _start_worker(self, index: int, spawn: bool) -> None:
+        """Start the worker reading self._tasks[index]: forked with the loaded model, or spawned"""
+        if spawn:
+            ctx, target, model = self._spawn_ctx, _spawned_worker_main, self._loader
+        else:
+            ctx, target, model = self._fork_ctx, _worker_main, self._model
+        worker = ctx.Process(
+            target=target,
+            args=(model, self._tasks[index], self._results, self._threads_per_worker, self._batch_size),
+            name=f"bias-classifier-{index}",
+            daemon=True,
+        )
+        worker.start()
+        self._workers[index] = worker
+
+    def _collect(self) -> None:
+        last_check = time.monotonic()
+        while not self._closed:
+            try:
+                job_id, predictions, error = self._results.get(timeout=WORKER_CHECK_INTERVAL_SECONDS)
+                with self._pending_lock:
+                    index = self._owner.pop(job_id, None)
+                    future = self._assigned[index].pop(job_id, None) if index is not None else None
+                if future is not None:
+                    if error is not None:
+                        future.set_exception(RuntimeError(f"Classifier worker failed: {error}"))
+                    else:
+                        future.set_result(predictions)
+            except queue.Empty:
+                pass
+
+            if time.monotonic() - last_check >= WORKER_CHECK_INTERVAL_SECONDS:
+                self._replace_dead_workers()
+                last_check = time.monotonic()
+
+    def _replace_dead_workers(self) -> None:
+        """
+        Fail the chunks of workers that exited and spawn replacements
+
+        This process is multithreaded by now (collector, server and executor
+        threads), and a child forked while another thread holds an allocator,
+        logging or torch lock can deadlock, so replacements are spawned and
+        load the model themselves. The lock is not held while starting them.
+        """
+        for index, worker in enumerate(self._workers):
+            if self._closed or worker.is_alive():
+                continue
+            with self._pending_lock:
+                lost, self._assigned[index] = self._assigned[index], {}
+                for job_id in lost:
+                    self._owner.pop(job_id, None)
+                # New chunks wait in a fresh queue until the replacement has started
+                self._tasks[index] = self._spawn_ctx.Queue()
+                self._restarts += 1
+            logger.warning(f"Classifier worker {worker.name} died (exit code {worker.exitcode}); "
+                           f"failed {len(lost)} chunks and spawning a new worker")
+            for future in lost.values():
+                future.set_exception(RuntimeError(f"Classifier worker died (exit code {worker.exitcode})"))
+            try:
+                self._start_worker(index, spawn=True)
+            except Exception:
+                logger.exception(f"Could not spawn a replacement for classifier worker {index}")
+
+    def __call__(self, sentences: List[str]) -> List[Dict[str, Any]]:
+        """
+        Classify sentences using the worker processes
+
+        Args:
+            sentences: Sentences to classify
+
+        Returns:
+            Pipeline predictions ({'label', 'score'}) in input order
+
+        Raises:
+            RuntimeError: If a worker failed or died while holding a chunk
+            TimeoutError: If the predictions did not arrive within `timeout` seconds
+        """
+        jobs: List[Tuple[int, Future]] = []
+        with self._pending_lock:
+            for start in range(0, len(sentences), self.chunk_size):
+                future: Future = Future()
+                job_id = next(self._job_ids)
+                # Least loaded worker first
+                index = min(range(self.num_workers), key=lambda i: len(self._assigned[i]))
+                self._assigned[index][job_id] = future
+                self._owner[job_id] = index
+                self._tasks[index].put((job_id, sentences[start:start + self.chunk_size]))
+                jobs.append((job_id, future))
+
+        deadline = time.monotonic() + self.timeout
+        try:
+            return [
+                prediction
+                for _, future in jobs
+                for prediction in future.result(timeout=max(0.0, deadline - time.monotonic()))
+            ]
+        except TimeoutError:
+            with self._pending_lock:
+                for job_id, _ in jobs:
+                    index = self._owner.pop(job_id, None)
+                    if index is not None:
+                        self._assigned[index].pop(job_id, None)
+            raise TimeoutError(f"Classifier pool did not answer within {self.timeout}s")
+
+    def get_worker_stats(self) -> Dict[str, Any]:
+        """Get worker liveness and restart counters"""
+        with self._pending_lock:
+            return {
+                "workers": self.num_workers,
+                "alive": sum(1 for worker in self._workers if worker.is_alive()),
+                "restarts": self._restarts,
+                "pending_chunks": len(self._owner),
+            }
+
+    def close(self) -> None:
+        """Stop the workers"""
+        self._closed = True
+        for tasks in self._tasks:
+            tasks.put(_STOP)
+        for worker in self._workers:
+            worker.join(timeout=5)
+
+
+def serve(
+    pool: Callable[[List[str]], List[Dict[str, Any]]],
+    address: str,
+    authkey: Optional[bytes] = None,
+    allow_remote: bool = False,
+) -> None:
+    """
+    Serve a classifier to RemoteClassifier clients (blocks forever)
+
+    Args:
+        pool: Callable classifying a list of sentences (usually a ClassifierPool)
+        address: "host:port" to listen on
+        authkey: Shared secret clients must present (default: BIAS_CLASSIFIER_AUTHKEY)
+        allow_remote: Allow a non-loopback address
+
+    Raises:
+        RuntimeError: If no authkey is configured
+        ValueError: If address is not a loopback address and allow_remote is False
+    """
+    authkey = resolve_authkey(authkey)
+    host, port = parse_address(address)
+    if not is_loopback(host) and not allow_remote:
+        raise ValueError(
+            f"Refusing to listen on non-loopback address {address}: any client that knows the "
+            f"authkey can run code on this host. Pass allow_remote (--allow-remote) to do it anyway."
+        )
+
+    def handle(conn) -> None:
+        with conn:
+            while True:
+                try:
+                    sentences = conn.recv()
+                except EOFError:
+                    return
+                try:
+                    conn.send((pool(sentences), None))
+                except Exception as e:
+                    conn.send((None, repr(e)))
+
+    with Listener((host, port), authkey=authkey) as listener:
+        logger.info(f"Classifier server listening on {address}")
+        while True:
+            conn = listener.accept()
+            threading.Thread(target=handle, args=(conn,), daemon=True).start()
+
+
+class RemoteClassifier:
+    """Thin client for a classifier served with serve() (one connection per thread)"""
+
+    def __init__(self, address: str, authkey: Optional[bytes] = None):
+        self.address = parse_address(address)
+        self.authkey = resolve_authkey(authkey)
+        self._local = threading.local()
+
+    def __call__(self, sentences: List[str]) -> List[Dict[str, Any]]:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = Client(self.address, authkey=self.authkey)
+        try:
+            conn.send(list(sentences))
+            predictions, error = conn.recv()
+        except (EOFError, OSError):
+            # Server restarted: drop the connection so the next call reconnects
+            self._local.conn = None
+            raise
+        if error is not None:
+            raise RuntimeError(f"Remote classifier failed: {error}")
+        return predictions
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Serve the bias classifier from a worker pool")
+    parser.add_argument("--address", default=os.getenv("BIAS_CLASSIFIER_ADDRESS", "127.0.0.1:6010"))
+    parser.add_argument("--workers", type=int, default=int(os.getenv("BIAS_CLASSIFIER_WORKERS", "2")))
+    parser.add_argument("--threads", type=int, default=int(os.getenv("BIAS_CLASSIFIER_THREADS", "1")))
+    parser.add_argument("--allow-remote", action="store_true",
+                        help="Listen on a non-loopback address (clients with the authkey can run code on this host)")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO)
+    from .bias_classifier import load_classifier, CLASSIFIER_BATCH_SIZE, BIAS_CLASSIFIER_POOL_TIMEOUT_SECONDS
+
+    # Check the key and address before loading the model
+    try:
+        resolve_authkey()
+    except RuntimeError as e:
+        parser.error(str(e))
+    if not is_loopback(parse_address(args.address)[0]) and not args.allow_remote:
+        parser.error(f"{args.address} is not a loopback address; pass --allow-remote to listen on it")
+
+    pool = ClassifierPool(
+        load_classifier,
+        num_workers=args.workers,
+        threads_per_worker=args.threads,
+        batch_size=CLASSIFIER_BATCH_SIZE,
+        timeout=BIAS_CLASSIFIER_POOL_TIMEOUT_SECONDS,
+    )
+    serve(pool, args.address, allow_remote=args.allow_remote)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,282 @@
+"""
+Classifier Quantization Module
+Builds int8 variants of the bias classifier and checks their accuracy drift against fp32
+
+Two CPU paths are supported:
+    dynamic - torch dynamic quantization of the Linear layers (no extra dependencies)
+    onnx    - ONNX export with dynamic int8 quantization, run by onnxruntime (needs optimum)
+
+Both are wrapped in a regular transformers text-classification pipeline, so
+predictions keep the {'label': 'LABEL_n', 'score': float} format used with id_to_label.
+
+    # Export the ONNX model once (to BIAS_CLASSIFIER_ONNX_DIR by default)
+    python -m utility.classifier_quantization export
+
+    # Compare a quantized model with fp32 on the synthetic dataset from module_b/dataset/run.py
+    python -m utility.classifier_quantization check --dataset nepali_bias_dataset/test --quantization onnx
+"""
+
+import argparse
+import glob
+import json
+import logging
+import os
+import sys
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+try:
+    from optimum.onnxruntime import ORTModelForSequenceClassification, ORTQuantizer
+    from optimum.onnxruntime.configuration import AutoQuantizationConfig
+    OPTIMUM_AVAILABLE = True
+except ImportError:
+    OPTIMUM_AVAILABLE = False
+
+QUANTIZATION_MODES = ("none", "dynamic", "onnx")
+ONNX_QUANTIZED_FILE = "model_quantized.onnx"
+MAX_LABEL_DRIFT = 0.01  # Largest tolerated share of sentences whose label changes vs fp32
+NEUTRAL_LABEL = "neutral"
+
+
+# ----------------------------------------------------------------------
+# Model builders
+# ----------------------------------------------------------------------
+
+def load_dynamic_int8_model(model_name: str):
+    """
+    Load the classifier with torch dynamic int8 quantization of its Linear layers
+
+    Args:
+        model_name: Hugging Face model id or local path
+
+    Returns:
+        Tuple of (quantized model, tokenizer)
+    """
+    import torch
+    from transformers import AutoModelForSequenceClassification, AutoTokenizer
+
+    model = AutoModelForSequenceClassification.from_pretrained(model_name)
+    model.eval()
+    quantized = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    return quantized, AutoTokenizer.from_pretrained(model_name)
+
+
+def export_onnx_int8(model_name: str, output_dir: str) -> str:
+    """
+    Export the classifier to ONNX and apply dynamic int8 quantization
+
+    Args:
+        model_name: Hugging Face model id or local path
+        output_dir: Directory receiving the quantized model and tokenizer files
+
+    Returns:
+        Path of the quantized ONNX file
+    """
+    if not OPTIMUM_AVAILABLE:
+        raise ImportError("ONNX export requires optimum[onnxruntime]: pip install optimum[onnxruntime]")
+    from transformers import AutoTokenizer
+
+    os.makedirs(output_dir, exist_ok=True)
+    logger.info(f"Exporting {model_name} to ONNX in {output_dir}")
+    model = ORTModelForSequenceClassification.from_pretrained(model_name, export=True)
+    model.save_pretrained(output_dir)
+    AutoTokenizer.from_pretrained(model_name).save_pretrained(output_dir)
+
+    # avx2 kernels run on every x86 box we deploy to; weights are int8, activations quantized per call
+    quantizer = ORTQuantizer.from_pretrained(output_dir)
+    qconfig = AutoQuantizationConfig.avx2(is_static=False, per_channel=False)
+    quantizer.quantize(save_dir=output_dir, quantization_config=qconfig)
+
+    path = os.path.join(output_dir, ONNX_QUANTIZED_FILE)
+    logger.info(f"Saved quantized ONNX model to {path}")
+    return path
+
+
+def load_onnx_int8_model(onnx_dir: str):
+    """
+    Load the quantized ONNX classifier
+
+    The model is never exported here: an export takes minutes and would
+    otherwise run inside API startup. Run the `export` command first.
+
+    Args:
+        onnx_dir: Directory written by export_onnx_int8
+
+    Returns:
+        Tuple of (onnxruntime model, tokenizer)
+
+    Raises:
+        FileNotFoundError: If onnx_dir has no quantized model
+    """
+    if not OPTIMUM_AVAILABLE:
+        raise ImportError("ONNX inference requires optimum[onnxruntime]: pip install optimum[onnxruntime]")
+    from transformers import AutoTokenizer
+
+    if not os.path.exists(os.path.join(onnx_dir, ONNX_QUANTIZED_FILE)):
+        raise FileNotFoundError(
+            f"No quantized ONNX model in {onnx_dir}. Export it with "
+            f"`python -m utility.classifier_quantization export --output {onnx_dir}` "
+            "or set BIAS_CLASSIFIER_ONNX_DIR."
+        )
+
+    model = ORTModelForSequenceClassification.from_pretrained(onnx_dir, file_name=ONNX_QUANTIZED_FILE)
+    return model, AutoTokenizer.from_pretrained(onnx_dir)
+
+
+# ----------------------------------------------------------------------
+# Accuracy drift
+# ----------------------------------------------------------------------
+
+def load_labelled_sentences(path: str, limit: Optional[int] = None) -> List[Tuple[str, str]]:
+    """
+    Read the synthetic dataset written by module_b/dataset/run.py
+
+    Each row has a "text" field and one 0/1 column per category; rows with
+    no category set are neutral.
+
+    Args:
+        path: A split directory of part-*.jsonl files (e.g. nepali_bias_dataset/test),
+            a single JSONL file, or a JSON list
+        limit: Optional number of rows to keep
+
+    Returns:
+        List of (sentence, category) tuples
+    """
+    if os.path.isdir(path):
+        files = sorted(glob.glob(os.path.join(path, "part-*.jsonl")))
+    else:
+        files = [path]
+
+    rows = []
+    for file in files:
+        with open(file, encoding="utf-8") as f:
+            if file.endswith(".json"):
+                rows.extend(json.load(f))
+            else:
+                rows.extend(json.loads(line) for line in f if line.strip())
+        if limit and len(rows) >= limit:
+            break
+
+    labelled = []
+    for row in rows[:limit] if limit else rows:
+        category = next((key for key, value in row.items() if key != "text" and value == 1), NEUTRAL_LABEL)
+        labelled.append((row["text"], category))
+    return labelled
+
+
+def compare_predictions(
+    reference: Sequence[Dict[str, Any]],
+    candidate: Sequence[Dict[str, Any]],
+    label_names: Dict[str, str],
+    gold: Optional[Sequence[str]] = None,
+) -> Dict[str, Any]:
+    """
+    Measure how far candidate predictions drift from the reference model
+
+    Args:
+        reference: fp32 predictions ({'label', 'score'})
+        candidate: Quantized predictions for the same sentences
+        label_names: Mapping from model labels to category names (id_to_label)
+        gold: Optional true categories, to report accuracy of both models
+
+    Returns:
+        Dictionary with label agreement, score differences and optional accuracies
+    """
+    if len(reference) != len(candidate):
+        raise ValueError(f"Got {len(reference)} reference and {len(candidate)} candidate predictions")
+
+    total = len(reference)
+    agree = sum(1 for ref, cand in zip(reference, candidate) if ref["label"] == cand["label"])
+    score_diffs = [
+        abs(ref["score"] - cand["score"])
+        for ref, cand in zip(reference, candidate)
+        if ref["label"] == cand["label"]
+    ]
+
+    report: Dict[str, Any] = {
+        "sentences": total,
+        "label_agreement": agree / total if total else 1.0,
+        "label_drift": 1 - agree / total if total else 0.0,
+        "mean_score_diff": sum(score_diffs) / len(score_diffs) if score_diffs else 0.0,
+        "max_score_diff": max(score_diffs) if score_diffs else 0.0,
+    }
+
+    if gold is not None:
+        def accuracy(predictions: Sequence[Dict[str, Any]]) -> float:
+            correct = sum(1 for p, g in zip(predictions, gold) if label_names.get(p["label"], "unknown") == g)
+            return correct / total if total else 0.0
+
+        report["reference_accuracy"] = accuracy(reference)
+        report["candidate_accuracy"] = accuracy(candidate)
+        report["accuracy_delta"] = report["candidate_accuracy"] - report["reference_accuracy"]
+
+    return report
+
+
+def check_drift(dataset_path: str, quantization: str, limit: Optional[int] = 2000) -> Dict[str, Any]:
+    """
+    Classify the synthetic dataset with fp32 and a quantized model and compare them
+
+    Args:
+        dataset_path: Dataset split written by module_b/dataset/run.py
+        quantization: "dynamic" or "onnx"
+        limit: Number of dataset rows to use (None for all)
+
+    Returns:
+        compare_predictions report plus the timing of both models
+    """
+    from .bias_classifier import CLASSIFIER_BATCH_SIZE, id_to_label, load_classifier
+
+    labelled = load_labelled_sentences(dataset_path, limit)
+    sentences = [text for text, _ in labelled]
+
+    timings = {}
+    predictions = {}
+    for mode in ("none", quantization):
+        model = load_classifier(quantization=mode)
+        started = time.perf_counter()
+        predictions[mode] = model(sentences, batch_size=CLASSIFIER_BATCH_SIZE, truncation=True)
+        timings[mode] = time.perf_counter() - started
+
+    report = compare_predictions(predictions["none"], predictions[quantization], id_to_label, [g for _, g in labelled])
+    report["quantization"] = quantization
+    report["reference_seconds"] = round(timings["none"], 3)
+    report["candidate_seconds"] = round(timings[quantization], 3)
+    report["speedup"] = round(timings["none"] / timings[quantization], 2) if timings[quantization] else None
+    return report
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    from .bias_classifier import BIAS_CLASSIFIER_ONNX_DIR, MODEL_NAME
+
+    parser = argparse.ArgumentParser(description="Quantize the bias classifier and check its accuracy drift")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    export = commands.add_parser("export", help="Export the ONNX int8 model")
+    export.add_argument("--output", default=BIAS_CLASSIFIER_ONNX_DIR)
+
+    check = commands.add_parser("check", help="Compare a quantized model with fp32")
+    check.add_argument("--dataset", required=True, help="Split directory or JSONL file written by module_b/dataset/run.py")
+    check.add_argument("--quantization", choices=["dynamic", "onnx"], default="dynamic")
+    check.add_argument("--limit", type=int, default=2000, help="Rows to use (0 for all)")
+    check.add_argument("--max-drift", type=float, default=MAX_LABEL_DRIFT)
+
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO)
+
+    if args.command == "export":
+        export_onnx_int8(MODEL_NAME, args.output)
+        return 0
+
+    report = check_drift(args.dataset, args.quantization, args.limit or None)
+    print(json.dumps(report, indent=2))
+    if report["label_drift"] > args.max_drift:
+        print(f"Label drift {report['label_drift']:.4f} exceeds {args.max_drift}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
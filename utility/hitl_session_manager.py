@@ -3,10 +3,57 @@ Human-in-the-Loop Session Manager
 Manages review sessions for bias detection with user approval workflow
 """
 
+import threading
 import uuid
 from datetime import datetime
-from typing import Dict, Optional
-from api.schemas import BiasReviewSession, BiasReviewItem
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from api.schemas import BiasReviewSession, BiasReviewItem, ReviewProgress
+
+NEUTRAL_CATEGORY = "neutral"
+
+
+def apply_thresholds(
+    probabilities: np.ndarray,
+    labels: Sequence[str],
+    confidence_threshold: float,
+    category_thresholds: Optional[Dict[str, float]] = None
+) -> List[Tuple[str, float, bool]]:
+    """
+    Decide category and bias flag for each sentence from its softmax vector.
+
+    A sentence is biased when a non-neutral category reaches its threshold
+    (the highest such category wins); otherwise it keeps its top-1 category.
+    For thresholds above 0.5 this matches flagging at classification time.
+
+    Args:
+        probabilities: Array of shape (sentences, labels)
+        labels: Category name of each column
+        confidence_threshold: Threshold for categories without their own
+        category_thresholds: Optional per-category thresholds
+
+    Returns:
+        List of (category, confidence, is_biased) per sentence
+    """
+    probs = np.asarray(probabilities, dtype=np.float32)
+    if probs.size == 0:
+        return []
+    category_thresholds = category_thresholds or {}
+    thresholds = np.array([category_thresholds.get(label, confidence_threshold) for label in labels], dtype=np.float32)
+
+    passing = probs >= thresholds
+    if NEUTRAL_CATEGORY in labels:
+        passing[:, list(labels).index(NEUTRAL_CATEGORY)] = False
+    flagged = passing.any(axis=1)
+    chosen = np.where(flagged, np.where(passing, probs, -1.0).argmax(axis=1), probs.argmax(axis=1))
+    confidence = probs[np.arange(len(probs)), chosen]
+
+    return [
+        (labels[index], float(score), bool(is_biased))
+        for index, score, is_biased in zip(chosen, confidence, flagged)
+    ]
 
 class HITLSessionManager:
     """
@@ -17,13 +64,18 @@ class HITLSessionManager:
     def __init__(self):
         """Initialize session manager with empty sessions dictionary."""
         self._sessions: Dict[str, BiasReviewSession] = {}
+        self._alternatives_lock = threading.Lock()  # Alternatives are added from background workers
+        self._progress_lock = threading.Lock()  # Background review jobs append sentences and report progress
 
     def create_session(
         self,
         filename: str,
         sentences: list,
         raw_text: str,
-        original_pdf_bytes: Optional[bytes] = None
+        original_pdf_bytes: Optional[bytes] = None,
+        probabilities: Optional[Sequence[Sequence[float]]] = None,
+        confidence_threshold: float = 0.7,
+        processing: bool = False
     ) -> BiasReviewSession:
         """
         Create a new review session.
@@ -33,6 +85,9 @@ class HITLSessionManager:
             sentences: List of BiasReviewItem objects
             raw_text: Raw extracted text from PDF
             original_pdf_bytes: Original PDF file as bytes (for PDF regeneration)
+            probabilities: Softmax vector per sentence, kept as float16 for re-thresholding
+            confidence_threshold: Threshold the sentences were flagged with
+            processing: True for a background job that fills the session with append_sentences()
 
         Returns:
             BiasReviewSession object with generated session_id
@@ -46,7 +101,10 @@ class HITLSessionManager:
             raw_text=raw_text,
             original_pdf_bytes=original_pdf_bytes,
             created_at=datetime.utcnow().isoformat(),
-            status="pending_review"
+            status="processing" if processing else "pending_review",
+            progress=ReviewProgress() if processing else None,
+            confidence_threshold=confidence_threshold,
+            probabilities=np.asarray(probabilities, dtype=np.float16) if probabilities is not None else None
         )
 
         self._sessions[session_id] = session
@@ -92,6 +150,9 @@ class HITLSessionManager:
                 sentence.status = status
                 if approved_suggestion:
                     sentence.approved_suggestion = approved_suggestion
+                if (status == "needs_regeneration" and sentence.suggestion
+                        and sentence.suggestion not in sentence.rejected_suggestions):
+                    sentence.rejected_suggestions.append(sentence.suggestion)
 
                 # Update session status to in_progress once first action taken
                 if session.status == "pending_review":
@@ -105,7 +166,8 @@ class HITLSessionManager:
         self,
         session_id: str,
         sentence_id: str,
-        new_suggestion: str
+        new_suggestion: str,
+        verification_score: Optional[float] = None
     ) -> bool:
         """
         Update the suggestion for a specific sentence.
@@ -114,6 +176,7 @@ class HITLSessionManager:
             session_id: Session identifier
             sentence_id: Sentence identifier
             new_suggestion: New suggestion text from LLM
+            verification_score: Classifier bias score of the suggestion
 
         Returns:
             True if update successful, False otherwise
@@ -125,11 +188,268 @@ class HITLSessionManager:
         for sentence in session.sentences:
             if sentence.sentence_id == sentence_id:
                 sentence.suggestion = new_suggestion
+                sentence.verification_score = verification_score
+                sentence.suggestion_pending = False
                 sentence.status = "pending"  # Reset to pending after regeneration
                 return True
 
         return False
 
+    def fill_suggestion(
+        self,
+        session_id: str,
+        sentence_id: str,
+        suggestion: Optional[str],
+        verification_score: Optional[float] = None
+    ) -> bool:
+        """
+        Record the first generated suggestion for a sentence.
+        Unlike update_sentence_suggestion, the review status is left untouched.
+
+        Args:
+            session_id: Session identifier
+            sentence_id: Sentence identifier
+            suggestion: Generated suggestion, or None if generation failed
+            verification_score: Classifier bias score of the suggestion
+
+        Returns:
+            True if update successful, False otherwise
+        """
+        session = self.get_session(session_id)
+        if not session:
+            return False
+
+        for sentence in session.sentences:
+            if sentence.sentence_id == sentence_id:
+                if suggestion and sentence.suggestion is None:
+                    sentence.suggestion = suggestion
+                    sentence.verification_score = verification_score
+                sentence.suggestion_pending = False
+                return True
+
+        return False
+
+    def add_alternatives(
+        self,
+        session_id: str,
+        sentence_id: str,
+        alternatives: List[str]
+    ) -> bool:
+        """
+        Add pre-generated rewrites to a sentence's alternative pool.
+        Rewrites already shown, rejected or pooled are skipped.
+
+        Args:
+            session_id: Session identifier
+            sentence_id: Sentence identifier
+            alternatives: Generated rewrites
+
+        Returns:
+            True if update successful, False otherwise
+        """
+        session = self.get_session(session_id)
+        if not session:
+            return False
+
+        with self._alternatives_lock:
+            for sentence in session.sentences:
+                if sentence.sentence_id == sentence_id:
+                    for alternative in alternatives:
+                        if (alternative != sentence.suggestion
+                                and alternative not in sentence.rejected_suggestions
+                                and alternative not in sentence.alternatives):
+                            sentence.alternatives.append(alternative)
+                    return True
+
+        return False
+
+    def pop_alternative(self, session_id: str, sentence_id: str) -> Optional[str]:
+        """
+        Take the next pre-generated rewrite for a sentence.
+
+        Args:
+            session_id: Session identifier
+            sentence_id: Sentence identifier
+
+        Returns:
+            A rewrite the reviewer has not seen yet, or None if the pool is empty
+        """
+        session = self.get_session(session_id)
+        if not session:
+            return None
+
+        with self._alternatives_lock:
+            for sentence in session.sentences:
+                if sentence.sentence_id == sentence_id:
+                    while sentence.alternatives:
+                        alternative = sentence.alternatives.pop(0)
+                        if alternative != sentence.suggestion and alternative not in sentence.rejected_suggestions:
+                            return alternative
+                    return None
+
+        return None
+
+    def rethreshold(
+        self,
+        session_id: str,
+        labels: Sequence[str],
+        confidence_threshold: float,
+        category_thresholds: Optional[Dict[str, float]] = None
+    ) -> Optional[Tuple[List[BiasReviewItem], List[BiasReviewItem]]]:
+        """
+        Re-flag a session's sentences with new thresholds, without re-running the model.
+
+        Newly flagged sentences go back to review (or stay approved if the
+        reviewer already approved a rewrite); sentences that are no longer
+        flagged are auto-approved and keep their suggestions in case they
+        are flagged again.
+
+        Args:
+            session_id: Session identifier
+            labels: Category name of each probability column
+            confidence_threshold: Default threshold
+            category_thresholds: Optional per-category thresholds
+
+        Returns:
+            Tuple of (newly flagged, unflagged) sentences, or None if the session is not found
+        """
+        session = self.get_session(session_id)
+        if not session:
+            return None
+
+        if session.probabilities is not None:
+            decisions = apply_thresholds(session.probabilities, labels, confidence_threshold, category_thresholds)
+        else:
+            # Model without probability output: re-threshold the top-1 prediction
+            thresholds = category_thresholds or {}
+            decisions = [
+                (s.category, s.confidence,
+                 s.category != NEUTRAL_CATEGORY and s.confidence >= thresholds.get(s.category, confidence_threshold))
+                for s in session.sentences
+            ]
+
+        newly_flagged, unflagged = [], []
+        for sentence, (category, confidence, is_biased) in zip(session.sentences, decisions):
+            if is_biased and not sentence.is_biased:
+                sentence.status = "approved" if sentence.approved_suggestion else "pending"
+                newly_flagged.append(sentence)
+            elif sentence.is_biased and not is_biased:
+                sentence.status = "approved"
+                unflagged.append(sentence)
+            sentence.category = category
+            sentence.confidence = confidence
+            sentence.is_biased = is_biased
+
+        session.confidence_threshold = confidence_threshold
+        session.category_thresholds = dict(category_thresholds or {})
+        return newly_flagged, unflagged
+
+    def append_sentences(
+        self,
+        session_id: str,
+        sentences: List[BiasReviewItem],
+        probabilities: Optional[Sequence[Sequence[float]]] = None
+    ) -> bool:
+        """
+        Add classified sentences to a session that is still processing.
+        They can be reviewed as soon as they are added.
+
+        Args:
+            session_id: Session identifier
+            sentences: Newly classified BiasReviewItem objects, in document order
+            probabilities: Softmax vector per new sentence (None drops re-thresholding for the session)
+
+        Returns:
+            True if update successful, False otherwise
+        """
+        session = self.get_session(session_id)
+        if not session:
+            return False
+
+        with self._progress_lock:
+            if probabilities is None or any(p is None for p in probabilities):
+                session.probabilities = None
+            elif session.probabilities is not None or not session.sentences:
+                rows = np.asarray(probabilities, dtype=np.float16)
+                session.probabilities = rows if session.probabilities is None else np.concatenate([session.probabilities, rows])
+            session.sentences.extend(sentences)
+            if session.progress is not None:
+                session.progress.sentences_classified += len(sentences)
+        return True
+
+    def update_progress(self, session_id: str, **changes) -> bool:
+        """
+        Update the pipeline progress of a background session.
+
+        Args:
+            session_id: Session identifier
+            **changes: ReviewProgress fields to set
+
+        Returns:
+            True if update successful, False otherwise
+        """
+        session = self.get_session(session_id)
+        if not session or session.progress is None:
+            return False
+
+        with self._progress_lock:
+            for field, value in changes.items():
+                setattr(session.progress, field, value)
+        return True
+
+    def finish_processing(self, session_id: str, error: Optional[str] = None) -> bool:
+        """
+        Mark a background session as classified (suggestions may still be generating) or failed.
+
+        Args:
+            session_id: Session identifier
+            error: Failure reason, or None on success
+
+        Returns:
+            True if update successful, False otherwise
+        """
+        session = self.get_session(session_id)
+        if not session or session.progress is None:
+            return False
+
+        with self._progress_lock:
+            session.progress.stage = "failed" if error else "suggesting"
+            session.progress.error = error
+            if error:
+                session.status = "failed"
+            elif session.status == "processing":
+                session.status = "pending_review"
+        return True
+
+    def get_progress(self, session_id: str) -> Optional[ReviewProgress]:
+        """
+        Get a snapshot of a session's progress, with suggestion counts taken from its sentences.
+        Sessions created in one request report their classification as complete.
+
+        Args:
+            session_id: Session identifier
+
+        Returns:
+            ReviewProgress or None if session not found
+        """
+        session = self.get_session(session_id)
+        if not session:
+            return None
+
+        with self._progress_lock:
+            if session.progress is not None:
+                progress = session.progress.model_copy()
+            else:
+                total = len(session.sentences)
+                progress = ReviewProgress(stage="suggesting", sentences_total=total, sentences_classified=total)
+            biased = [s for s in session.sentences if s.is_biased]
+
+        progress.suggestions_total = len(biased)
+        progress.suggestions_ready = sum(1 for s in biased if not s.suggestion_pending)
+        if progress.stage == "suggesting" and progress.suggestions_ready == progress.suggestions_total:
+            progress.stage = "ready"
+        return progress
+
     def get_session_stats(self, session_id: str) -> Optional[Dict]:
         """
         Get statistics for a session.
@@ -148,12 +468,14 @@ class HITLSessionManager:
         pending = sum(1 for s in session.sentences if s.status == "pending")
         approved = sum(1 for s in session.sentences if s.status == "approved")
         needs_regen = sum(1 for s in session.sentences if s.status == "needs_regeneration")
+        suggestions_pending = sum(1 for s in session.sentences if s.suggestion_pending)
 
         return {
             "total_sentences": total,
             "pending_count": pending,
             "approved_count": approved,
-            "needs_regeneration_count": needs_regen
+            "needs_regeneration_count": needs_regen,
+            "suggestions_pending_count": suggestions_pending
         }
 
     def is_session_ready_for_pdf(self, session_id: str) -> bool:
@@ -167,7 +489,7 @@ class HITLSessionManager:
             True if all sentences are approved, False otherwise
         """
         session = self.get_session(session_id)
-        if not session:
+        if not session or session.status in ("processing", "failed"):
             return False
 
         # Check if all sentences are either approved or were neutral
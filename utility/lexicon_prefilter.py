@@ -0,0 +1,375 @@
+"""
+Lexicon Pre-filter Module
+Cheap word match that lets obviously neutral sentences skip the bias classifier
+
+Each bias category has a lexicon of trigger terms. Sentences containing a term
+are classified as usual; the rest are treated as neutral without inference,
+except for a random audit sample that still goes to the model so the recall
+cost of skipping can be measured (see get_stats: skip_rate, audit_disagreement_rate).
+
+Terms are stemmed words and a sentence matches on its own stemmed words, so a
+term never matches inside a longer, unrelated word. The lexicon is seeded from
+the template and filler vocabulary of the synthetic dataset generator
+(module_b/dataset/run.py). It grows with the words reviewers remove when
+approving HITL rewrites: a word becomes a trigger once PREFILTER_LEARN_MIN_COUNT
+approvals removed it, counted in a SQLite file shared by every API worker.
+"""
+
+import ast
+import logging
+import os
+import random
+import re
+import sqlite3
+import threading
+from collections import Counter, deque
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+PREFILTER_ENABLED = os.getenv("BIAS_PREFILTER_ENABLED", "false").lower() == "true"
+PREFILTER_AUDIT_RATE = float(os.getenv("BIAS_PREFILTER_AUDIT_RATE", "0.05"))  # Share of unmatched sentences still classified
+PREFILTER_LEXICON_DB_FILE = os.getenv("BIAS_PREFILTER_LEXICON_DB_FILE", "")  # Learned terms; empty keeps them in memory only
+PREFILTER_LEARN_MIN_COUNT = int(os.getenv("BIAS_PREFILTER_LEARN_MIN_COUNT", "3"))  # Approvals that must remove a word
+PREFILTER_SEED_FILE = os.getenv(
+    "BIAS_PREFILTER_SEED_FILE",
+    str(Path(__file__).resolve().parent.parent / "module_b" / "dataset" / "run.py")
+)
+
+MIN_TERM_LENGTH = 3  # Shorter stems (in code points) are too ambiguous to be terms
+MAX_TERM_CATEGORIES = 2  # Words used by more categories are generic phrasing, not bias triggers
+RECENT_MISSES = 50  # Audit disagreements kept for lexicon review
+
+# Function words, generic verbs and the common words of legal and procedural text
+# that the templates use around the actual triggers (raw words and stems)
+_STOPWORDS = {
+    "लाई", "पनि", "मात्र", "भन्ने", "अझै", "केही", "एउटा", "अन्य", "कुरा", "त्यसै", "जस्तो", "छैन", "नभए",
+    "दिन", "दिनु", "लिन", "गर्न", "गरिए", "गरिन्छ", "देखिए", "देखिन्छ", "हुने", "हुन्छ", "हुन्छन्", "कायम", "कारण",
+    "उल्लेख", "रहेको", "रहे", "भएका", "भएकाले", "आएका", "गर्छन्", "सक्छन्", "सक्दैनन्", "मानिन्छन्", "ठानिन्छ", "ठानिने",
+    "मानिने", "भनिन्छ", "लगाइन्छ", "लिइए", "होइन", "भन्दा", "नयाँ", "गलत", "ठूला", "राम्रा", "स्पष्ट", "पूर्ण", "सीमित",
+    "क्षेत्र", "नीति", "प्रतिवेदन", "अवस्था", "रूप", "आधारित", "मूल्यांकन", "कमी", "क्षमता", "योग्य", "मान्यता",
+    "परिवार", "आर्थिक", "राजनीति", "व्यवसाय", "प्राविधिक", "सिक्न", "बुझ्न", "सम्हाल्न",
+}
+
+_WORD = re.compile(r'[^\s।,.!?;:"\'()\[\]{}]+')
+_PLACEHOLDER = re.compile(r'\{(\w+)\}')
+_SUFFIXES = ("हरूलाई", "हरूको", "हरूका", "हरूले", "हरूबाट", "हरूमा", "हरू", "लाई", "बाट", "को", "का", "की", "ले", "मा")
+
+
+def stem(word: str) -> str:
+    """Strip common Nepali case and plural suffixes, keeping at least MIN_TERM_LENGTH characters"""
+    stripped = True
+    while stripped:
+        stripped = False
+        for suffix in _SUFFIXES:
+            if word.endswith(suffix) and len(word) - len(suffix) >= MIN_TERM_LENGTH:
+                word = word[:-len(suffix)]
+                stripped = True
+                break
+    return word
+
+
+def terms_of(text: str) -> Set[str]:
+    """Stemmed words of a text that are long enough to be lexicon terms"""
+    terms = (stem(word) for word in _WORD.findall(text) if word not in _STOPWORDS)
+    return {term for term in terms if len(term) >= MIN_TERM_LENGTH and term not in _STOPWORDS}
+
+
+def seed_lexicon(path: str = PREFILTER_SEED_FILE) -> Tuple[Dict[str, Set[str]], Set[str]]:
+    """
+    Build a lexicon from the dataset generator's templates and fillers
+
+    The generator writes its dataset when run, so its `templates` and
+    `fillers` literals are read from the source instead of importing it.
+    A category's terms are the words of its templates and of the fillers
+    those templates use. Function words, words from neutral sentences and
+    words shared by more than MAX_TERM_CATEGORIES categories are left out.
+
+    Args:
+        path: Path to module_b/dataset/run.py
+
+    Returns:
+        Tuple of (terms by category, neutral vocabulary)
+    """
+    literals: Dict[str, Any] = {}
+    tree = ast.parse(Path(path).read_text(encoding="utf-8"))
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Assign) and len(node.targets) == 1 and isinstance(node.targets[0], ast.Name):
+            if node.targets[0].id in ("templates", "fillers"):
+                literals[node.targets[0].id] = ast.literal_eval(node.value)
+
+    fillers: Dict[str, List[str]] = literals.get("fillers", {})
+    words: Dict[str, Set[str]] = {}
+    neutral: Set[str] = set()
+
+    for template, category in literals.get("templates", []):
+        text = _PLACEHOLDER.sub(" ", template)
+        for slot in _PLACEHOLDER.findall(template):
+            text += " " + " ".join(fillers.get(slot, []))
+        if category is None:
+            neutral |= terms_of(text)
+        else:
+            words.setdefault(category, set()).update(terms_of(text))
+
+    spread: Dict[str, int] = {}
+    for terms in words.values():
+        for term in terms:
+            spread[term] = spread.get(term, 0) + 1
+
+    lexicon = {
+        category: {t for t in terms if t not in neutral and spread[t] <= MAX_TERM_CATEGORIES}
+        for category, terms in words.items()
+    }
+    return lexicon, neutral
+
+
+class LexiconPrefilter:
+    """
+    Decides which sentences need the classifier, and tracks what skipping costs.
+    """
+
+    def __init__(
+        self,
+        lexicon: Dict[str, Iterable[str]],
+        stopwords: Iterable[str] = (),
+        audit_rate: float = PREFILTER_AUDIT_RATE,
+        db_path: Optional[str] = PREFILTER_LEXICON_DB_FILE,
+        learn_min_count: int = PREFILTER_LEARN_MIN_COUNT,
+        seed: Optional[int] = None,
+    ):
+        """
+        Initialize the pre-filter
+
+        Args:
+            lexicon: Trigger terms by category
+            stopwords: Words never learned as triggers
+            audit_rate: Share of unmatched sentences sent to the model anyway
+            db_path: SQLite file counting removed words (None keeps the counts in memory)
+            learn_min_count: Approvals that must remove a word before it becomes a trigger
+            seed: Seed for the audit sampler
+        """
+        self.audit_rate = audit_rate
+        self.stopwords = set(stopwords)
+        self.learn_min_count = max(1, learn_min_count)
+
+        self._lexicon: Dict[str, Set[str]] = {category: set(terms) for category, terms in lexicon.items()}
+        self._removed: Counter = Counter()  # (category, term) -> approvals, without a database
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._random = random.Random(seed)
+        self._recent_misses: deque = deque(maxlen=RECENT_MISSES)
+        self._stats = {"sentences": 0, "matched": 0, "audited": 0, "skipped": 0, "audit_flagged": 0, "learned": 0}
+
+        self.db_path = Path(db_path) if db_path else None
+        if self.db_path:
+            try:
+                self.db_path.parent.mkdir(parents=True, exist_ok=True)
+                self._init_db()
+            except Exception as e:
+                logger.warning(f"Learned lexicon unavailable, keeping counts in memory: {e}")
+                self.db_path = None
+
+        self._merge_learned()
+        self._build()
+
+    # ------------------------------------------------------------------
+    # Matching
+    # ------------------------------------------------------------------
+
+    def _build(self) -> None:
+        """Index the terms (caller holds the lock, or is __init__)"""
+        owners: Dict[str, Set[str]] = {}
+        for category, terms in self._lexicon.items():
+            for term in terms:
+                owners.setdefault(term, set()).add(category)
+        self._owners = owners
+
+    def match(self, sentence: str) -> Set[str]:
+        """
+        Find the categories whose trigger terms are words of a sentence
+
+        Args:
+            sentence: Sentence to scan
+
+        Returns:
+            Matched categories (empty if the sentence looks neutral)
+        """
+        owners = self._owners
+        found = [owners[term] for term in terms_of(sentence) if term in owners]
+        return set().union(*found) if found else set()
+
+    def select(self, sentences: Sequence[str]) -> Tuple[List[int], Set[int]]:
+        """
+        Pick the sentences that need the classifier
+
+        Args:
+            sentences: Sentences in document order
+
+        Returns:
+            Tuple of (indices to classify in input order, the audited subset of them).
+            Every other sentence is treated as neutral.
+        """
+        selected: List[int] = []
+        audited: Set[int] = set()
+        with self._lock:
+            for i, sentence in enumerate(sentences):
+                if self.match(sentence):
+                    selected.append(i)
+                elif self._random.random() < self.audit_rate:
+                    selected.append(i)
+                    audited.add(i)
+            self._stats["sentences"] += len(sentences)
+            self._stats["matched"] += len(selected) - len(audited)
+            self._stats["audited"] += len(audited)
+            self._stats["skipped"] += len(sentences) - len(selected)
+        return selected, audited
+
+    def record_audit(self, results: Iterable[Tuple[str, str, bool]]) -> None:
+        """
+        Count audited sentences the classifier flagged although no term matched
+
+        Args:
+            results: (sentence, category, is_biased) of each audited sentence
+        """
+        with self._lock:
+            for sentence, category, is_biased in results:
+                if is_biased:
+                    self._stats["audit_flagged"] += 1
+                    self._recent_misses.append({"sentence": sentence, "category": category})
+
+    # ------------------------------------------------------------------
+    # Learning
+    # ------------------------------------------------------------------
+
+    def learn(self, original: str, approved: str, category: str) -> List[str]:
+        """
+        Count the words a reviewer removed from a biased sentence
+
+        A word becomes a trigger of the category once `learn_min_count`
+        approvals, from any worker, removed it. Terms other workers promoted
+        in the meantime are picked up as well.
+
+        Args:
+            original: Sentence flagged as biased
+            approved: Rewrite the reviewer approved
+            category: Bias category of the sentence
+
+        Returns:
+            Removed words that became triggers with this approval
+        """
+        removed = terms_of(original) - terms_of(approved) - self.stopwords
+        if not removed:
+            return []
+        with self._lock:
+            before = set(self._lexicon.get(category, set()))
+            self._count_removed(category, removed)
+            if self._merge_learned():
+                self._build()
+            return sorted((self._lexicon.get(category, set()) - before) & removed)
+
+    def _count_removed(self, category: str, terms: Set[str]) -> None:
+        """Add one approval to each removed word (caller holds the lock)"""
+        if not self.db_path:
+            self._removed.update((category, term) for term in terms)
+            return
+        try:
+            conn = self._connect()
+            conn.executemany(
+                "INSERT INTO learned_terms (category, term, approvals) VALUES (?, ?, 1) "
+                "ON CONFLICT(category, term) DO UPDATE SET approvals = approvals + 1",
+                [(category, term) for term in terms]
+            )
+            conn.commit()
+        except Exception as e:
+            logger.warning(f"Learned lexicon write failed: {e}")
+
+    def _merge_learned(self) -> int:
+        """Add every term with enough approvals to the lexicon (caller holds the lock, or is __init__)"""
+        if self.db_path:
+            try:
+                rows = self._connect().execute(
+                    "SELECT category, term FROM learned_terms WHERE approvals >= ?", (self.learn_min_count,)
+                ).fetchall()
+            except Exception as e:
+                logger.warning(f"Learned lexicon read failed: {e}")
+                return 0
+        else:
+            rows = [key for key, approvals in self._removed.items() if approvals >= self.learn_min_count]
+
+        added = 0
+        for category, term in rows:
+            terms = self._lexicon.setdefault(category, set())
+            if term not in terms and term not in self.stopwords:
+                terms.add(term)
+                added += 1
+        self._stats["learned"] += added
+        return added
+
+    # ------------------------------------------------------------------
+    # SQLite
+    # ------------------------------------------------------------------
+
+    def _connect(self) -> sqlite3.Connection:
+        """One connection per thread; SQLite handles cross-process locking"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.db_path), timeout=5.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _init_db(self) -> None:
+        conn = self._connect()
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS learned_terms (
+                category TEXT NOT NULL,
+                term TEXT NOT NULL,
+                approvals INTEGER NOT NULL DEFAULT 0,
+                PRIMARY KEY (category, term)
+            )
+            """
+        )
+        conn.commit()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get skip-rate and audit counters"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["recent_misses"] = list(self._recent_misses)
+            stats["terms"] = len(self._owners)
+        stats["skip_rate"] = round(stats["skipped"] / stats["sentences"], 4) if stats["sentences"] else 0.0
+        stats["audit_disagreement_rate"] = round(stats["audit_flagged"] / stats["audited"], 4) if stats["audited"] else 0.0
+        stats["audit_rate"] = self.audit_rate
+        stats["db"] = str(self.db_path) if self.db_path else None
+        return stats
+
+
+_prefilter_instance: Optional[LexiconPrefilter] = None
+_prefilter_lock = threading.Lock()
+
+
+def get_prefilter() -> Optional[LexiconPrefilter]:
+    """
+    Get the process-wide pre-filter
+
+    Returns:
+        Shared LexiconPrefilter, or None if the pre-filter is disabled or has no seed
+    """
+    global _prefilter_instance
+
+    if not PREFILTER_ENABLED:
+        return None
+
+    if _prefilter_instance is None:
+        with _prefilter_lock:
+            if _prefilter_instance is None:
+                try:
+                    lexicon, neutral = seed_lexicon()
+                except Exception as e:
+                    logger.warning(f"Lexicon pre-filter disabled, could not seed from {PREFILTER_SEED_FILE}: {e}")
+                    return None
+                _prefilter_instance = LexiconPrefilter(lexicon, stopwords=neutral)
+    return _prefilter_instance
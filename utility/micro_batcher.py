@@ -0,0 +1,199 @@
+"""
+Micro-Batching Module
+Groups inference requests from concurrent callers into shared model batches
+"""
+
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class _Slice:
+    """Part of one caller's request waiting in the queue"""
+
+    def __init__(self, items: List[Any]):
+        self.items = items
+        self.future: Future = Future()
+        self.enqueued_at = time.monotonic()
+
+    def split(self, size: int) -> Tuple["_Slice", "_Slice"]:
+        """Split into the first `size` items and the rest, both resolving this slice's future"""
+        parts = (_Slice(self.items[:size]), _Slice(self.items[size:]))
+        for part in parts:
+            part.enqueued_at = self.enqueued_at
+        _gather(list(parts), self.future)
+        return parts
+
+
+def _gather(parts: List[_Slice], result: Future) -> None:
+    """Resolve `result` with the outputs of all `parts`, in order, once every part is done"""
+    remaining = [len(parts)]
+    lock = threading.Lock()
+
+    def on_part_done(_: Future) -> None:
+        with lock:
+            remaining[0] -= 1
+            if remaining[0] or result.done():
+                return
+        errors = [p.future.exception() for p in parts if p.future.exception() is not None]
+        if errors:
+            result.set_exception(errors[0])
+        else:
+            result.set_result([output for p in parts for output in p.future.result()])
+
+    for part in parts:
+        part.future.add_done_callback(on_part_done)
+
+
+class MicroBatcher:
+    """
+    Dynamic micro-batching queue in front of a batch inference function.
+
+    A background worker takes the oldest pending request, keeps collecting
+    requests from other callers for up to `max_wait_ms` or until
+    `max_batch_size` items are gathered, runs `batch_fn` once on all of
+    them, and resolves each caller's future with its own outputs. Large
+    requests are split into slices of `max_batch_size` so small requests
+    queued behind them are not starved, and a slice that does not fit in
+    the current batch is split, its remainder starting the next batch.
+    """
+
+    def __init__(
+        self,
+        batch_fn: Callable[[List[Any]], List[Any]],
+        max_batch_size: int = 64,
+        max_wait_ms: float = 5.0,
+        name: str = "micro-batcher",
+    ):
+        """
+        Initialize the batcher
+
+        Args:
+            batch_fn: Function mapping a list of inputs to a list of outputs (same order)
+            max_batch_size: Maximum items per call of batch_fn
+            max_wait_ms: How long to wait for more requests after the first arrives
+            name: Worker thread name (for logs and stats)
+        """
+        self.batch_fn = batch_fn
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max_wait_ms / 1000.0
+        self.name = name
+
+        self._queue: "queue.Queue[_Slice]" = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+        self._carry: Optional[_Slice] = None  # Remainder of a split slice (worker thread only)
+        self._start_lock = threading.Lock()
+
+        self._stats_lock = threading.Lock()
+        self._stats = {"requests": 0, "batches": 0, "items": 0, "errors": 0, "total_wait_seconds": 0.0}
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def submit(self, items: List[Any]) -> Future:
+        """
+        Queue items for inference
+
+        Args:
+            items: Inputs for batch_fn
+
+        Returns:
+            Future resolving to the list of outputs, in input order
+        """
+        result: Future = Future()
+        items = list(items)
+        with self._stats_lock:
+            self._stats["requests"] += 1
+
+        if not items:
+            result.set_result([])
+            return result
+
+        self._ensure_worker()
+        slices = [_Slice(items[i:i + self.max_batch_size]) for i in range(0, len(items), self.max_batch_size)]
+        _gather(slices, result)
+        for item_slice in slices:
+            self._queue.put(item_slice)
+        return result
+
+    def __call__(self, items: List[Any]) -> List[Any]:
+        """Blocking helper: submit items and wait for their outputs"""
+        return self.submit(items).result()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get batching counters"""
+        with self._stats_lock:
+            stats = dict(self._stats)
+        batches = stats["batches"]
+        stats["avg_batch_size"] = round(stats["items"] / batches, 2) if batches else 0.0
+        stats["avg_wait_ms"] = round(1000 * stats.pop("total_wait_seconds") / batches, 3) if batches else 0.0
+        stats["queued"] = self._queue.qsize()
+        stats["max_batch_size"] = self.max_batch_size
+        stats["max_wait_ms"] = self.max_wait * 1000.0
+        return stats
+
+    # ------------------------------------------------------------------
+    # Worker
+    # ------------------------------------------------------------------
+
+    def _ensure_worker(self) -> None:
+        if self._worker is not None:
+            return
+        with self._start_lock:
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._loop, name=self.name, daemon=True)
+                self._worker.start()
+
+    def _loop(self) -> None:
+        while True:
+            batch = [self._carry or self._queue.get()]
+            self._carry = None
+            size = len(batch[0].items)
+            deadline = time.monotonic() + self.max_wait
+
+            while size < self.max_batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item_slice = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if size + len(item_slice.items) > self.max_batch_size:
+                    item_slice, self._carry = item_slice.split(self.max_batch_size - size)
+                batch.append(item_slice)
+                size += len(item_slice.items)
+
+            self._run(batch)
+
+    def _run(self, batch: List[_Slice]) -> None:
+        items = [item for item_slice in batch for item in item_slice.items]
+        started = time.monotonic()
+
+        with self._stats_lock:
+            self._stats["batches"] += 1
+            self._stats["items"] += len(items)
+            self._stats["total_wait_seconds"] += started - batch[0].enqueued_at
+
+        try:
+            outputs = list(self.batch_fn(items))
+            if len(outputs) != len(items):
+                raise RuntimeError(f"{self.name}: batch_fn returned {len(outputs)} outputs for {len(items)} inputs")
+        except Exception as e:
+            logger.error(f"[{self.name}] Batch of {len(items)} failed: {e}")
+            with self._stats_lock:
+                self._stats["errors"] += 1
+            for item_slice in batch:
+                item_slice.future.set_exception(e)
+            return
+
+        offset = 0
+        for item_slice in batch:
+            item_slice.future.set_result(outputs[offset:offset + len(item_slice.items)])
+            offset += len(item_slice.items)
@@ -7,7 +7,7 @@ Uses PyMuPDF for extraction and Mistral LLM for sentence refinement
 import logging
 import re
 import json
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Callable, Optional
 import fitz  # PyMuPDF
 
 # Import Mistral client from module_a
@@ -191,10 +191,13 @@ Remember:
 
         try:
             logger.info("Sending sentences to Mistral for refinement")
-            response = self.llm_client.generate_response(
+            response = self.llm_client.generate_for_task(
+                "sentence_refinement",
                 prompt=user_prompt,
                 system_prompt=system_prompt,
-                temperature=0.2  # Very low temperature for consistent sentence splitting
+                validate=self._json_array_confidence,
+                call_site="pdf.refine_sentences",
+                priority="bulk"  # Whole-document work must not starve interactive chat
             )
             
             # Try to extract JSON array from response
@@ -222,6 +225,17 @@ Remember:
             logger.warning(f"LLM refinement failed, using original sentences: {e}")
             return sentences
 
+    @staticmethod
+    def _json_array_confidence(response: str) -> Optional[float]:
+        """Validator for the refinement cascade: None unless a JSON array parses"""
+        json_match = re.search(r'\[.*\]', response, re.DOTALL)
+        if not json_match:
+            return None
+        try:
+            return 1.0 if isinstance(json.loads(json_match.group()), list) else None
+        except json.JSONDecodeError:
+            return None
+
     def process_pdf(
         self, 
         pdf_path: str, 
@@ -296,7 +310,8 @@ Remember:
     def process_pdf_from_bytes(
         self,
         pdf_bytes: bytes,
-        refine_with_llm: bool = True
+        refine_with_llm: bool = True,
+        on_progress: Optional[Callable[[str, int, int], None]] = None
     ) -> Dict[str, Any]:
         """
         Process PDF from bytes (for file uploads via API).
@@ -304,6 +319,8 @@ Remember:
         Args:
             pdf_bytes: PDF file contents as bytes
             refine_with_llm: Whether to use LLM for refinement (default: True)
+            on_progress: Optional callback(stage, done, total), called with
+                "extracting" after each page and "refining" before LLM refinement
 
         Returns:
             Dictionary with extraction results
@@ -319,6 +336,8 @@ Remember:
                 text = page.get_text("text")
                 full_text += text + "\n"
                 logger.debug(f"Extracted text from page {page_num + 1}")
+                if on_progress:
+                    on_progress("extracting", page_num + 1, doc.page_count)
             
             doc.close()
             
@@ -345,6 +364,8 @@ Remember:
             
             # Optionally refine with LLM
             if refine_with_llm:
+                if on_progress:
+                    on_progress("refining", 0, len(sentences))
                 sentences = self.refine_sentences_with_llm(sentences)
             
             logger.info(f"Successfully processed PDF from bytes: {len(sentences)} sentences")
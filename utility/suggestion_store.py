@@ -0,0 +1,214 @@
+"""
+Debias Suggestion Store Module
+Persistent, cross-worker store of debias rewrites with reviewer approval stats
+
+Every key (sentence, category, model, prompt version) holds several candidate
+rewrites. The candidate reviewers approved most is served first, and a
+regenerate can serve another stored candidate before a fresh LLM call is made.
+The store is a SQLite file, so every API worker on the host shares it.
+"""
+
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+from .classification_cache import normalize_sentence
+
+logger = logging.getLogger(__name__)
+
+_MAX_NET_REJECTIONS = 2  # Candidates rejected this many times more than approved are no longer served
+
+# Serving order: net approvals, then approvals, then the newest candidate
+_RANK = "approvals - rejections DESC, approvals DESC, created_at DESC, rowid DESC"
+
+
+class SuggestionStore:
+    """
+    Keeps up to `max_candidates` rewrites per key with approval and rejection counts.
+    """
+
+    def __init__(self, db_path: Optional[Path], max_candidates: int = 5):
+        """
+        Initialize the store
+
+        Args:
+            db_path: SQLite file (None disables the store)
+            max_candidates: Rewrites kept per key; the lowest ranked are dropped
+        """
+        self.max_candidates = max(1, max_candidates)
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "stores": 0, "approvals": 0, "rejections": 0}
+
+        self.db_path = Path(db_path) if db_path else None
+        if self.db_path:
+            try:
+                self.db_path.parent.mkdir(parents=True, exist_ok=True)
+                self._init_db()
+                logger.info(f"Debias suggestion store at {self.db_path}")
+            except Exception as e:
+                logger.warning(f"Debias suggestion store unavailable: {e}")
+                self.db_path = None
+
+    @staticmethod
+    def make_key(sentence: str, category: str, model: str, prompt_version: str) -> str:
+        """Build the key for a sentence rewrite"""
+        parts = [normalize_sentence(sentence), category.strip().lower(), model, prompt_version]
+        return hashlib.sha256("|".join(parts).encode("utf-8")).hexdigest()
+
+    # ------------------------------------------------------------------
+    # Lookup / store
+    # ------------------------------------------------------------------
+
+    def candidates(self, key: str, exclude: Iterable[str] = ()) -> List[str]:
+        """
+        List servable candidates, best first
+
+        Args:
+            key: Key from make_key()
+            exclude: Rewrites the caller has already seen
+
+        Returns:
+            Candidate rewrites in serving order
+        """
+        if not self.db_path:
+            return []
+        excluded = {s.strip() for s in exclude if s}
+        try:
+            rows = self._connect().execute(
+                f"SELECT suggestion FROM debias_suggestions "
+                f"WHERE key = ? AND rejections - approvals < ? ORDER BY {_RANK}",
+                (key, _MAX_NET_REJECTIONS)
+            ).fetchall()
+        except Exception as e:
+            logger.warning(f"Suggestion store read failed: {e}")
+            return []
+        return [row[0] for row in rows if row[0] not in excluded]
+
+    def best(self, key: str, exclude: Iterable[str] = ()) -> Optional[str]:
+        """
+        Get the highest ranked candidate not in `exclude`
+
+        Args:
+            key: Key from make_key()
+            exclude: Rewrites the caller has already seen
+
+        Returns:
+            Stored rewrite, or None if a fresh one is needed
+        """
+        found = self.candidates(key, exclude)
+        with self._lock:
+            self._stats["hits" if found else "misses"] += 1
+        if not found:
+            return None
+
+        try:
+            conn = self._connect()
+            conn.execute(
+                "UPDATE debias_suggestions SET served = served + 1 WHERE key = ? AND suggestion = ?",
+                (key, found[0])
+            )
+            conn.commit()
+        except Exception as e:
+            logger.warning(f"Suggestion store write failed: {e}")
+        return found[0]
+
+    def add(self, key: str, suggestion: str, approvals: int = 0) -> None:
+        """
+        Store a candidate rewrite (existing candidates keep their stats)
+
+        Args:
+            key: Key from make_key()
+            suggestion: Rewrite text
+            approvals: Initial approval count (1 for reviewer-written rewrites)
+        """
+        suggestion = suggestion.strip()
+        if not self.db_path or not suggestion:
+            return
+        try:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR IGNORE INTO debias_suggestions "
+                "(key, suggestion, approvals, rejections, served, created_at) VALUES (?, ?, ?, 0, 0, ?)",
+                (key, suggestion, approvals, time.time())
+            )
+            conn.execute(
+                f"DELETE FROM debias_suggestions WHERE key = ? AND suggestion NOT IN ("
+                f"SELECT suggestion FROM debias_suggestions WHERE key = ? ORDER BY {_RANK} LIMIT ?)",
+                (key, key, self.max_candidates)
+            )
+            conn.commit()
+        except Exception as e:
+            logger.warning(f"Suggestion store write failed: {e}")
+            return
+        with self._lock:
+            self._stats["stores"] += 1
+
+    def record_feedback(self, key: str, suggestion: str, approved: bool) -> None:
+        """
+        Count a reviewer decision on a served candidate
+
+        Args:
+            key: Key from make_key()
+            suggestion: Rewrite the reviewer saw
+            approved: True for approve, False for reject
+        """
+        if not self.db_path or not suggestion:
+            return
+        column = "approvals" if approved else "rejections"
+        try:
+            conn = self._connect()
+            conn.execute(
+                f"UPDATE debias_suggestions SET {column} = {column} + 1 WHERE key = ? AND suggestion = ?",
+                (key, suggestion.strip())
+            )
+            conn.commit()
+        except Exception as e:
+            logger.warning(f"Suggestion store write failed: {e}")
+            return
+        with self._lock:
+            self._stats[column] += 1
+
+    # ------------------------------------------------------------------
+    # SQLite
+    # ------------------------------------------------------------------
+
+    def _connect(self) -> sqlite3.Connection:
+        """One connection per thread; SQLite handles cross-process locking"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.db_path), timeout=5.0)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _init_db(self) -> None:
+        conn = self._connect()
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS debias_suggestions (
+                key TEXT NOT NULL,
+                suggestion TEXT NOT NULL,
+                approvals INTEGER NOT NULL DEFAULT 0,
+                rejections INTEGER NOT NULL DEFAULT 0,
+                served INTEGER NOT NULL DEFAULT 0,
+                created_at REAL NOT NULL,
+                PRIMARY KEY (key, suggestion)
+            )
+            """
+        )
+        conn.commit()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get hit-rate and feedback counters"""
+        with self._lock:
+            stats = dict(self._stats)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / lookups, 4) if lookups else 0.0
+        stats["db"] = str(self.db_path) if self.db_path else None
+        return stats
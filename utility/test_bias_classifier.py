@@ -0,0 +1,24 @@
+"""
+Test suite for length-bucketed classification
+"""
+
+from utility.bias_classifier import plan_buckets
+
+
+def test_buckets_group_similar_lengths():
+    """Inputs are sorted by length and every index appears exactly once"""
+    lengths = [120, 5, 7, 118, 6, 60]
+    buckets = plan_buckets(lengths, max_batch_size=2, max_batch_tokens=10_000)
+
+    assert buckets == [[1, 4], [2, 5], [3, 0]]
+    assert sorted(i for bucket in buckets for i in bucket) == list(range(len(lengths)))
+
+
+def test_token_budget_closes_buckets():
+    """Padded size (items x longest) stays within the budget; oversized items stand alone"""
+    lengths = [10, 10, 10, 30, 600]
+    buckets = plan_buckets(lengths, max_batch_size=16, max_batch_tokens=60)
+
+    assert buckets == [[0, 1, 2], [3], [4]]
+    for bucket in buckets[:-1]:
+        assert len(bucket) * max(lengths[i] for i in bucket) <= 60
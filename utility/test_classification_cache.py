@@ -0,0 +1,70 @@
+"""
+Test suite for the sentence classification cache
+"""
+
+import asyncio
+
+from utility.classification_cache import ClassificationCache, classify_with_cache, classify_with_cache_async
+
+
+class _CountingClassifier:
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, sentences):
+        self.calls.append(list(sentences))
+        return [{"label": "LABEL_1", "score": 0.9, "probabilities": [0.1, 0.9]} for _ in sentences]
+
+
+def test_duplicates_are_classified_once_and_reused():
+    """Repeats within a document share one inference; a second document hits the cache"""
+    cache = ClassificationCache("model@none", db_path=None)
+    model = _CountingClassifier()
+
+    first = classify_with_cache(["क ख।", "ग घ।", "क  ख।"], model, cache)
+    second = classify_with_cache(["ग घ।", "ङ च।"], model, cache)
+
+    assert model.calls == [["क ख।", "ग घ।"], ["ङ च।"]]
+    assert len(first) == 3 and len(second) == 2
+    assert first[2]["probabilities"] == [0.1, 0.9]
+
+    stats = cache.get_stats()
+    assert stats["duplicates"] == 1
+    assert stats["memory_hits"] == 1
+
+
+def test_disk_tier_is_shared_and_versioned(tmp_path):
+    """A new process reads the disk tier; another model version does not"""
+    db = str(tmp_path / "classification.sqlite3")
+    classify_with_cache(["क ख।"], _CountingClassifier(), ClassificationCache("model@none", db_path=db))
+
+    model = _CountingClassifier()
+    classify_with_cache(["क ख।"], model, ClassificationCache("model@none", db_path=db))
+    assert model.calls == []
+
+    classify_with_cache(["क ख।"], model, ClassificationCache("model@onnx", db_path=db))
+    assert model.calls == [["क ख।"]]
+
+
+def test_without_cache_still_deduplicates():
+    """Passing no cache keeps in-document deduplication"""
+    model = _CountingClassifier()
+    predictions = classify_with_cache(["a b", "a b", "c d"], model, None)
+
+    assert model.calls == [["a b", "c d"]]
+    assert len(predictions) == 3
+
+
+def test_async_variant_shares_the_cache():
+    """The awaited classifier sees only uncached sentences, like the blocking one"""
+    cache = ClassificationCache("model@none", db_path=None)
+    model = _CountingClassifier()
+    classify_with_cache(["क ख।"], model, cache)
+
+    async def classify(sentences):
+        return model(sentences)
+
+    predictions = asyncio.run(classify_with_cache_async(["क ख।", "ग घ।", "ग घ।"], classify, cache))
+
+    assert model.calls == [["क ख।"], ["ग घ।"]]
+    assert len(predictions) == 3
@@ -0,0 +1,94 @@
+"""
+Test suite for the classifier worker pool
+"""
+
+import os
+import socket
+import threading
+from multiprocessing.context import SpawnProcess
+
+import pytest
+
+from utility.classifier_pool import ClassifierPool, RemoteClassifier, serve
+
+AUTHKEY = b"test-key"
+
+
+def _fake_pipeline(sentences, batch_size=16, truncation=True):
+    return [{"label": "LABEL_0", "score": len(s) / 100, "pid": os.getpid()} for s in sentences]
+
+
+def _crashing_pipeline(sentences, batch_size=16, truncation=True):
+    if "crash" in sentences:
+        os._exit(1)
+    return _fake_pipeline(sentences)
+
+
+def _load_fake():
+    return _fake_pipeline
+
+
+def _load_crashing():
+    # Module-level so a replacement worker can be spawned with it
+    return _crashing_pipeline
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+class TestClassifierPool:
+    """Test cases for ClassifierPool and the remote client"""
+
+    def test_pool_preserves_order_across_workers(self):
+        """Chunks classified by different workers come back in input order"""
+        pool = ClassifierPool(_load_fake, num_workers=2, chunk_size=3)
+        try:
+            sentences = ["x" * n for n in range(1, 11)]
+            predictions = pool(sentences)
+
+            assert [p["score"] for p in predictions] == [n / 100 for n in range(1, 11)]
+            assert all(p["pid"] != os.getpid() for p in predictions)
+        finally:
+            pool.close()
+
+    def test_remote_client_round_trip(self):
+        """A served classifier answers RemoteClassifier calls"""
+        address = f"127.0.0.1:{_free_port()}"
+        threading.Thread(target=serve, args=(_fake_pipeline, address, AUTHKEY), daemon=True).start()
+
+        client = RemoteClassifier(address, AUTHKEY)
+        for _ in range(50):
+            try:
+                predictions = client(["abc", "de"])
+                break
+            except (ConnectionRefusedError, OSError):
+                threading.Event().wait(0.05)
+
+        assert [p["score"] for p in predictions] == [0.03, 0.02]
+
+    def test_dead_worker_fails_its_chunk_and_is_replaced(self):
+        """A worker exiting mid-chunk raises instead of hanging, and a spawned replacement takes over"""
+        pool = ClassifierPool(_load_crashing, num_workers=1, timeout=30)
+        try:
+            with pytest.raises(RuntimeError, match="died"):
+                pool(["crash"])
+
+            assert [p["score"] for p in pool(["abc"])] == [0.03]
+            assert pool.get_worker_stats()["restarts"] == 1
+            assert isinstance(pool._workers[0], SpawnProcess)
+        finally:
+            pool.close()
+
+    def test_server_requires_an_authkey_and_a_loopback_address(self, monkeypatch):
+        """There is no default key, and non-loopback addresses need allow_remote"""
+        monkeypatch.delenv("BIAS_CLASSIFIER_AUTHKEY", raising=False)
+        with pytest.raises(RuntimeError, match="BIAS_CLASSIFIER_AUTHKEY"):
+            serve(_fake_pipeline, "127.0.0.1:0")
+        with pytest.raises(RuntimeError):
+            RemoteClassifier("127.0.0.1:6010")
+
+        with pytest.raises(ValueError, match="non-loopback"):
+            serve(_fake_pipeline, "0.0.0.0:0", AUTHKEY)
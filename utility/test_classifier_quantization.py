@@ -0,0 +1,56 @@
+"""
+Test suite for the quantized classifier drift check
+"""
+
+import json
+
+from utility.classifier_quantization import compare_predictions, load_labelled_sentences
+
+LABELS = {"LABEL_0": "neutral", "LABEL_1": "gender", "LABEL_3": "caste"}
+
+
+def test_load_labelled_sentences_reads_generator_rows(tmp_path):
+    """One-hot rows map to their category, all-zero rows to neutral"""
+    path = tmp_path / "dataset.json"
+    path.write_text(json.dumps([
+        {"text": "क", "gender": 1, "caste": 0},
+        {"text": "ख", "gender": 0, "caste": 0},
+        {"text": "ग", "gender": 0, "caste": 1},
+    ], ensure_ascii=False), encoding="utf-8")
+
+    assert load_labelled_sentences(str(path)) == [("क", "gender"), ("ख", "neutral"), ("ग", "caste")]
+    assert len(load_labelled_sentences(str(path), limit=2)) == 2
+
+
+def test_load_labelled_sentences_reads_split_directories(tmp_path):
+    """Part files of a split are read in order, one JSON row per line"""
+    split = tmp_path / "test"
+    split.mkdir()
+    (split / "part-00001.jsonl").write_text('{"text": "ख", "caste": 1}\n', encoding="utf-8")
+    (split / "part-00000.jsonl").write_text('{"text": "क", "caste": 0}\n', encoding="utf-8")
+
+    assert load_labelled_sentences(str(split)) == [("क", "neutral"), ("ख", "caste")]
+
+
+def test_compare_predictions_reports_drift_and_accuracy():
+    """Label changes count as drift; score differences only compare agreeing labels"""
+    reference = [
+        {"label": "LABEL_1", "score": 0.90},
+        {"label": "LABEL_0", "score": 0.80},
+        {"label": "LABEL_3", "score": 0.70},
+        {"label": "LABEL_0", "score": 0.60},
+    ]
+    candidate = [
+        {"label": "LABEL_1", "score": 0.88},
+        {"label": "LABEL_0", "score": 0.85},
+        {"label": "LABEL_1", "score": 0.55},
+        {"label": "LABEL_0", "score": 0.60},
+    ]
+
+    report = compare_predictions(reference, candidate, LABELS, gold=["gender", "neutral", "caste", "gender"])
+
+    assert report["label_agreement"] == 0.75
+    assert abs(report["max_score_diff"] - 0.05) < 1e-9
+    assert report["reference_accuracy"] == 0.75
+    assert report["candidate_accuracy"] == 0.5
+    assert report["accuracy_delta"] == -0.25
@@ -0,0 +1,141 @@
+"""
+Test suite for the HITL session manager's alternative pool and re-thresholding
+"""
+
+from api.schemas import BiasReviewItem
+from utility.hitl_session_manager import HITLSessionManager, apply_thresholds
+
+LABELS = ["neutral", "gender", "caste"]
+
+
+def _session(manager):
+    item = BiasReviewItem(
+        sentence_id="s1",
+        original_sentence="महिलाहरू कमजोर हुन्छन्।",
+        is_biased=True,
+        category="gender",
+        confidence=0.9,
+        suggestion="first",
+    )
+    return manager.create_session(filename="doc.pdf", sentences=[item], raw_text="")
+
+
+def test_alternatives_are_popped_in_order_without_repeats():
+    """Duplicates and the current suggestion are never pooled"""
+    manager = HITLSessionManager()
+    session = _session(manager)
+
+    assert manager.add_alternatives(session.session_id, "s1", ["second", "first", "second", "third"])
+    assert session.sentences[0].alternatives == ["second", "third"]
+
+    assert manager.pop_alternative(session.session_id, "s1") == "second"
+    assert manager.pop_alternative(session.session_id, "s1") == "third"
+    assert manager.pop_alternative(session.session_id, "s1") is None
+
+
+def test_rejected_suggestions_are_remembered_and_skipped():
+    """Rejecting records the suggestion so the pool never serves it again"""
+    manager = HITLSessionManager()
+    session = _session(manager)
+    manager.add_alternatives(session.session_id, "s1", ["second"])
+
+    manager.update_sentence_status(session.session_id, "s1", "needs_regeneration")
+    manager.update_sentence_suggestion(session.session_id, "s1", "second")
+    manager.update_sentence_status(session.session_id, "s1", "needs_regeneration")
+
+    item = session.sentences[0]
+    assert item.rejected_suggestions == ["first", "second"]
+    assert manager.pop_alternative(session.session_id, "s1") is None
+
+
+def test_apply_thresholds_uses_per_category_thresholds():
+    """A non-neutral category at its threshold flags the sentence; otherwise top-1 is kept"""
+    probabilities = [
+        [0.20, 0.75, 0.05],  # gender above the default
+        [0.50, 0.45, 0.05],  # neutral on top, gender under the default
+        [0.50, 0.10, 0.40],  # caste passes only with its own threshold
+    ]
+
+    assert apply_thresholds(probabilities, LABELS, 0.7) == [
+        ("gender", 0.75, True), ("neutral", 0.5, False), ("neutral", 0.5, False)
+    ]
+
+    decisions = apply_thresholds(probabilities, LABELS, 0.7, {"caste": 0.4})
+    assert [(category, flagged) for category, _, flagged in decisions] == [
+        ("gender", True), ("neutral", False), ("caste", True)
+    ]
+
+
+def test_rethreshold_flags_and_unflags_without_inference():
+    """Stored float16 vectors are re-thresholded in place"""
+    manager = HITLSessionManager()
+    items = [
+        BiasReviewItem(sentence_id=f"s{i}", original_sentence=f"वाक्य {i}", is_biased=biased,
+                       category=category, confidence=0.75, status="pending" if biased else "approved")
+        for i, (biased, category) in enumerate([(True, "gender"), (False, "neutral")])
+    ]
+    session = manager.create_session(
+        filename="doc.pdf", sentences=items, raw_text="",
+        probabilities=[[0.20, 0.75, 0.05], [0.40, 0.55, 0.05]], confidence_threshold=0.7
+    )
+
+    newly_flagged, unflagged = manager.rethreshold(session.session_id, LABELS, 0.5)
+    assert [s.sentence_id for s in newly_flagged] == ["s1"]
+    assert not unflagged
+    assert session.sentences[1].status == "pending" and session.sentences[1].category == "gender"
+
+    newly_flagged, unflagged = manager.rethreshold(session.session_id, LABELS, 0.8)
+    assert [s.sentence_id for s in unflagged] == ["s0", "s1"]
+    assert all(s.status == "approved" for s in session.sentences)
+
+
+def test_verification_score_follows_the_suggestion():
+    """The first suggestion and each regenerated one carry their own score"""
+    manager = HITLSessionManager()
+    item = BiasReviewItem(sentence_id="s1", original_sentence="वाक्य", is_biased=True,
+                          category="gender", confidence=0.9, suggestion_pending=True)
+    session = manager.create_session(filename="doc.pdf", sentences=[item], raw_text="")
+
+    manager.fill_suggestion(session.session_id, "s1", "first", verification_score=0.2)
+    assert session.sentences[0].verification_score == 0.2
+
+    manager.update_sentence_suggestion(session.session_id, "s1", "second", verification_score=0.05)
+    assert session.sentences[0].verification_score == 0.05
+
+
+def test_background_session_is_filled_in_chunks_and_reports_progress():
+    """Appended chunks are reviewable at once; the stage turns ready when suggestions are in"""
+    manager = HITLSessionManager()
+    session = manager.create_session(filename="doc.pdf", sentences=[], raw_text="", processing=True)
+    assert session.status == "processing" and not manager.is_session_ready_for_pdf(session.session_id)
+
+    manager.update_progress(session.session_id, stage="classifying", sentences_total=2)
+    biased = BiasReviewItem(sentence_id="s0", original_sentence="क", is_biased=True, category="gender",
+                            confidence=0.75, suggestion_pending=True)
+    manager.append_sentences(session.session_id, [biased], [[0.20, 0.75, 0.05]])
+    neutral = BiasReviewItem(sentence_id="s1", original_sentence="ख", is_biased=False, category="neutral",
+                             confidence=0.9, status="approved")
+    manager.append_sentences(session.session_id, [neutral], [[0.90, 0.05, 0.05]])
+
+    progress = manager.get_progress(session.session_id)
+    assert progress.stage == "classifying" and progress.sentences_classified == 2
+    assert session.probabilities.shape == (2, 3)
+
+    manager.finish_processing(session.session_id)
+    assert manager.get_progress(session.session_id).stage == "suggesting"
+    manager.fill_suggestion(session.session_id, "s0", "rewrite")
+    progress = manager.get_progress(session.session_id)
+    assert progress.stage == "ready" and progress.suggestions_ready == progress.suggestions_total == 1
+    assert session.status == "pending_review"
+
+
+def test_failed_background_session_is_never_ready_for_pdf():
+    """A failed job keeps its error and blocks PDF generation"""
+    manager = HITLSessionManager()
+    session = manager.create_session(filename="doc.pdf", sentences=[], raw_text="", processing=True)
+
+    manager.finish_processing(session.session_id, error="No text found in PDF")
+
+    assert session.status == "failed"
+    assert manager.get_progress(session.session_id).error == "No text found in PDF"
+    assert not manager.is_session_ready_for_pdf(session.session_id)
@@ -0,0 +1,65 @@
+"""
+Test suite for the lexicon pre-filter
+"""
+
+from utility.lexicon_prefilter import LexiconPrefilter, seed_lexicon, stem
+
+
+def test_seed_lexicon_reads_generator_vocabulary():
+    """Category fillers become terms; neutral and generic words do not"""
+    lexicon, neutral = seed_lexicon()
+
+    assert "दलित" in lexicon["caste"]
+    assert "मुस्लिम" in lexicon["religion"]
+    assert "महिला" in lexicon["gender"]
+    assert "शिक्षा" in neutral
+    assert not any("शिक्षा" in terms for terms in lexicon.values())
+
+
+def test_only_matching_sentences_reach_the_model():
+    """Suffixed forms match their stem; unmatched sentences are skipped without an audit"""
+    prefilter = LexiconPrefilter({"gender": {"महिला"}}, audit_rate=0.0, db_path=None)
+    sentences = ["महिलाहरू नेतृत्व गर्न सक्दैनन्।", "सडक निर्माण कार्य भइरहेको छ।"]
+
+    selected, audited = prefilter.select(sentences)
+
+    assert selected == [0] and not audited
+    assert prefilter.match(sentences[0]) == {"gender"}
+    assert prefilter.get_stats()["skip_rate"] == 0.5
+
+
+def test_audit_sample_reports_disagreement():
+    """Audited sentences the model flags count as misses"""
+    prefilter = LexiconPrefilter({"gender": {"महिला"}}, audit_rate=1.0, db_path=None)
+    selected, audited = prefilter.select(["सडक निर्माण कार्य भइरहेको छ।", "पढाइ राम्रो लाग्छ।"])
+    assert selected == [0, 1] and audited == {0, 1}
+
+    prefilter.record_audit([("सडक निर्माण कार्य भइरहेको छ।", "neutral", False), ("पढाइ राम्रो लाग्छ।", "caste", True)])
+
+    stats = prefilter.get_stats()
+    assert stats["audit_disagreement_rate"] == 0.5
+    assert stats["recent_misses"] == [{"sentence": "पढाइ राम्रो लाग्छ।", "category": "caste"}]
+
+
+def test_terms_match_whole_words_only():
+    """Seeded terms do not fire on longer words or common procedural text"""
+    lexicon, neutral = seed_lexicon()
+    prefilter = LexiconPrefilter(lexicon, stopwords=neutral, audit_rate=0.0, db_path=None)
+
+    assert prefilter.match("यस ऐनमा उल्लेख भएका व्यवस्थाहरू लागू रहेका छन्।") == set()
+    assert prefilter.match("नेपाल सरकारले नयाँ कानून जारी गर्यो।") == set()
+    assert "caste" in prefilter.match("दलितहरूमा नेतृत्व क्षमता हुँदैन।")
+
+
+def test_learned_terms_need_repeated_approvals_and_are_shared(tmp_path):
+    """A removed word becomes a trigger after learn_min_count approvals, visible to other workers"""
+    path = str(tmp_path / "lexicon.sqlite3")
+    prefilter = LexiconPrefilter({}, audit_rate=0.0, db_path=path, learn_min_count=2)
+    original, approved = "बुढाहरू प्रविधि चलाउन सक्दैनन्।", "सबै उमेरका व्यक्तिहरू प्रविधि चलाउन सक्छन्।"
+
+    assert prefilter.learn(original, approved, "Age") == []
+    assert prefilter.match("बुढाहरूलाई") == set()
+
+    other_worker = LexiconPrefilter({}, audit_rate=0.0, db_path=path, learn_min_count=2)
+    assert other_worker.learn(original, approved, "Age") == [stem("बुढाहरू")]
+    assert LexiconPrefilter({}, audit_rate=0.0, db_path=path, learn_min_count=2).match("बुढाहरूलाई") == {"Age"}
@@ -0,0 +1,69 @@
+"""
+Test suite for the micro-batching queue
+"""
+
+import threading
+
+import pytest
+
+from utility.micro_batcher import MicroBatcher
+
+
+class TestMicroBatcher:
+    """Test cases for MicroBatcher"""
+
+    def test_outputs_keep_input_order(self):
+        """Each caller gets its own outputs in order"""
+        batcher = MicroBatcher(lambda items: [x * 2 for x in items], max_batch_size=4)
+        assert batcher([1, 2, 3, 4, 5, 6, 7]) == [2, 4, 6, 8, 10, 12, 14]
+        assert batcher([]) == []
+
+    def test_concurrent_requests_share_batches(self):
+        """Requests arriving together are merged into one batch call"""
+        batch_sizes = []
+        release = threading.Event()
+
+        def batch_fn(items):
+            release.wait(timeout=5)
+            batch_sizes.append(len(items))
+            return [x + 1 for x in items]
+
+        batcher = MicroBatcher(batch_fn, max_batch_size=64, max_wait_ms=200)
+        futures = [batcher.submit([i, i]) for i in range(10)]
+        release.set()
+
+        assert [f.result(timeout=5) for f in futures] == [[i + 1, i + 1] for i in range(10)]
+        assert len(batch_sizes) < 10
+        assert sum(batch_sizes) == 20
+
+    def test_batches_never_exceed_max_batch_size(self):
+        """A queued slice that does not fit in the batch is split across batches"""
+        batch_sizes = []
+        release = threading.Event()
+
+        def batch_fn(items):
+            release.wait(timeout=5)
+            batch_sizes.append(len(items))
+            return [x * 10 for x in items]
+
+        batcher = MicroBatcher(batch_fn, max_batch_size=4, max_wait_ms=200)
+        first = batcher.submit([0, 0, 0, 0])  # A full batch occupies the worker while the others queue
+        futures = [batcher.submit([1, 2, 3]), batcher.submit([4, 5, 6, 7])]
+        release.set()
+
+        assert first.result(timeout=5) == [0, 0, 0, 0]
+        assert [f.result(timeout=5) for f in futures] == [[10, 20, 30], [40, 50, 60, 70]]
+        assert batch_sizes == [4, 4, 3]
+
+    def test_errors_reach_every_caller_in_the_batch(self):
+        """A failing batch fails its callers, and the worker keeps running"""
+        def batch_fn(items):
+            if "bad" in items:
+                raise ValueError("boom")
+            return items
+
+        batcher = MicroBatcher(batch_fn, max_wait_ms=1)
+        with pytest.raises(ValueError):
+            batcher(["bad"])
+        assert batcher(["ok"]) == ["ok"]
+        assert batcher.get_stats()["errors"] == 1
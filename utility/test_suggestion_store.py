@@ -0,0 +1,53 @@
+"""
+Test suite for the debias suggestion store
+"""
+
+from utility.suggestion_store import SuggestionStore
+
+
+def _store(tmp_path, **kwargs):
+    return SuggestionStore(tmp_path / "suggestions.sqlite3", **kwargs)
+
+
+def test_key_ignores_whitespace_but_not_model_or_prompt():
+    """Keys normalize the sentence; a new model or prompt version is a new key"""
+    key = SuggestionStore.make_key("क  ख।", "gender", "small", "v1")
+    assert key == SuggestionStore.make_key("क ख।", "Gender", "small", "v1")
+    assert key != SuggestionStore.make_key("क ख।", "gender", "large", "v1")
+    assert key != SuggestionStore.make_key("क ख।", "gender", "small", "v2")
+
+
+def test_most_approved_candidate_is_served_first_and_exclusions_skip_it(tmp_path):
+    """Approvals reorder candidates; regenerate gets the next unseen one"""
+    store = _store(tmp_path)
+    store.add("k", "first")
+    store.add("k", "second")
+    store.record_feedback("k", "first", approved=True)
+
+    assert store.best("k") == "first"
+    assert store.best("k", exclude=["first"]) == "second"
+    assert store.best("k", exclude=["first", "second"]) is None
+    assert store.best("other") is None
+
+    stats = store.get_stats()
+    assert stats["hits"] == 2 and stats["misses"] == 2
+
+
+def test_rejected_candidates_stop_being_served_and_store_is_shared(tmp_path):
+    """Repeatedly rejected rewrites drop out; a second instance sees the same data"""
+    store = _store(tmp_path)
+    store.add("k", "bad")
+    store.record_feedback("k", "bad", approved=False)
+    store.record_feedback("k", "bad", approved=False)
+
+    assert _store(tmp_path).best("k") is None
+
+
+def test_candidates_are_capped_per_key(tmp_path):
+    """Only the best max_candidates rewrites are kept"""
+    store = _store(tmp_path, max_candidates=2)
+    store.add("k", "approved", approvals=1)
+    store.add("k", "a")
+    store.add("k", "b")
+
+    assert store.candidates("k") == ["approved", "b"]